@@ -0,0 +1,106 @@
+"""
+Compares the image decode paths: the old `decode_image()` (full decode, `cvtColor` into a new array, then
+
+`np.ascontiguousarray`) against full BGRA decoding, reduced-size decoding for thumbnails and `THUMBNAILS` disk cache hits.
+
+Throughput is in MB of source file per second and megapixels of source image per second, peak memory is the largest
+
+traced allocation total during one decode (numpy / OpenCV output arrays).
+
+Usage: `python benchmarks/bench_decode.py [--runs N] [--no-baseline]`
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.textures import ThumbnailCache, TextureCache, decode_image, decode_thumbnail  # noqa: E402
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+THUMBNAIL_SIZE = 256
+
+
+def old_decode(path):
+    img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGBA)
+    return np.ascontiguousarray(img, dtype=np.uint8)
+
+
+def make_images(directory):
+    """
+    Writes a photo-like JPEG and PNG (smooth gradients plus noise, so they compress like real images).
+    """
+
+    rng = np.random.default_rng(1)
+    h, w = 3000, 4000
+    y, x = np.mgrid[0:h, 0:w].astype(np.float32)
+    base = np.stack([x / w * 255, y / h * 255, (x + y) / (w + h) * 255], axis=-1)
+    photo = np.clip(base + rng.normal(0, 12, base.shape), 0, 255).astype(np.uint8)
+
+    jpeg = os.path.join(directory, "photo.jpg")
+    cv2.imwrite(jpeg, photo, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    png = os.path.join(directory, "photo.png")
+    cv2.imwrite(png, photo[:2000, :2000])
+    return jpeg, png
+
+
+def measure(fn, path, runs):
+    fn(path)
+    times = []
+    for _ in range(runs):
+        start = perf_counter()
+        fn(path)
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--baseline", action=argparse.BooleanOptionalAction, default=True, help="also time the old decode path"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        disk_cache = ThumbnailCache(os.path.join(directory, "thumbnails"))
+        cases = {
+            "decode_image RGBA": decode_image,
+            "decode_image BGRA": lambda path: decode_image(path, bgra=True),
+            f"thumbnail {THUMBNAIL_SIZE}": lambda path: decode_image(path, THUMBNAIL_SIZE, bgra=True),
+            f"thumbnail {THUMBNAIL_SIZE} (disk hit)": lambda path: decode_thumbnail(
+                path, THUMBNAIL_SIZE, TextureCache.make_key(path), disk_cache
+            ),
+        }
+        if args.baseline:
+            cases = {"old (RGBA copy)": old_decode, **cases}
+
+        for path in make_images(directory):
+            file_mb = os.path.getsize(path) / 2**20
+            h, w = cv2.imread(path, cv2.IMREAD_UNCHANGED).shape[:2]
+            print(f"{os.path.basename(path)}: {w}x{h}, {file_mb:.1f} MiB")
+            for label, fn in cases.items():
+                seconds, peak = measure(fn, path, args.runs)
+                print(
+                    f"  {label:<28} {seconds * 1000:8.1f} ms  {file_mb / seconds:8.1f} MB/s"
+                    f"  {w * h / 1e6 / seconds:8.1f} Mpx/s  peak {peak / 2**20:7.1f} MiB"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
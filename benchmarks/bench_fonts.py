@@ -0,0 +1,91 @@
+"""
+Compares the startup cost of the example app's fonts: the old path (default font atlas built by the renderer, then cleared
+
+and rebuilt) against `FontAtlas.build()` with ImGui's default oversampling and with the opt-in 1x oversampling.
+
+The GL upload isn't timed (there's no GL context here), the atlas size in MiB is what it would upload.
+
+Usage: `python benchmarks/bench_fonts.py [--runs N] [--no-baseline]`
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.headless import FONT_PATH  # noqa: E402
+from src.fonts import FontAtlas, FontSpec  # noqa: E402
+
+import imgui  # noqa: E402
+
+ROKKITT = os.path.join(FONT_PATH, "Rokkitt-Regular.ttf")
+FONTAWESOME = os.path.join(FONT_PATH, "fontawesome-webfont.ttf")
+ICONS_RANGE = (0xF00C, 0xF00D, 0xF01A, 0xF01B, 0xF019, 0xF021, 0xF055, 0xF056, 0xF09B, 0xF09C, 0xF250, 0xF254)
+
+
+def old_startup(io, scale):
+    io.fonts.get_tex_data_as_rgba32()  # GlfwRenderer() building the default font
+    io.fonts.clear()
+    io.font_global_scale = 1.0 / scale
+    for size in (25, 16, 20):
+        io.fonts.add_font_from_file_ttf(ROKKITT, size * scale)
+    icons_range = imgui.core.GlyphRanges([*ICONS_RANGE, 0])
+    io.fonts.add_font_from_file_ttf(FONTAWESOME, 16 * scale, imgui.core.FontConfig(merge_mode=True), icons_range)
+    return io.fonts.get_tex_data_as_rgba32()[:2]
+
+
+def new_startup(io, scale, **atlas_options):
+    atlas = FontAtlas(
+        {
+            "title": FontSpec(ROKKITT, 25),
+            "small": FontSpec(ROKKITT, 16),
+            "main": [FontSpec(ROKKITT, 20), FontSpec(FONTAWESOME, 16, ICONS_RANGE, merge=True)],
+        },
+        **atlas_options,
+    )
+    report = atlas.build(io, scale)
+    return report.width, report.height
+
+
+def low_oversampling_startup(io, scale):
+    return new_startup(io, scale, oversample_h=1, pixel_snap=True)
+
+
+def measure(fn, scale, runs):
+    times = []
+    for _ in range(runs):
+        context = imgui.create_context()
+        start = perf_counter()
+        width, height = fn(imgui.get_io(), scale)
+        times.append((perf_counter() - start) * 1000)
+        imgui.destroy_context(context)
+    return statistics.median(times), width, height
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--baseline", action=argparse.BooleanOptionalAction, default=True, help="also time the old startup path"
+    )
+    args = parser.parse_args(argv)
+
+    cases = (("FontAtlas", new_startup), ("FontAtlas 1x", low_oversampling_startup))
+    if args.baseline:
+        cases = (("old", old_startup), *cases)
+    for scale in (1.0, 1.5, 2.0):
+        for label, fn in cases:
+            ms, width, height = measure(fn, scale, args.runs)
+            print(
+                f"scale {scale:<4g} {label:<12} {ms:7.2f} ms  atlas {width}x{height}"
+                f" ({width * height * 4 / 2**20:.2f} MiB RGBA)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Measures the cost of a `LOGGER` call on the calling thread (i.e. what the render loop pays per log call).
+
+Usage: `python benchmarks/bench_logger.py [--count N] [--no-baseline]`
+"""
+
+import argparse
+import ctypes
+import os
+import sys
+import tempfile
+
+from time import perf_counter
+
+if not hasattr(ctypes, "windll"):
+    ctypes.windll = None  # src.logger only needs it for the debug console.
+
+os.chdir(tempfile.mkdtemp())
+os.makedirs("ExampleApp", exist_ok=True)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inspect  # noqa: E402
+
+from src.logger import LOGGER  # noqa: E402
+
+
+class InspectStackFilter:
+    """
+    The original caller lookup, for comparison.
+    """
+
+    def filter(self, record):
+        record.caller_name = inspect.stack()[6].function
+        return True
+
+
+def bench(label, count, legacy_filter=False, **kwargs):
+    log = LOGGER("Bench", "1.0", **kwargs)
+    if legacy_filter:
+        log.logger.filters.clear()
+        log.logger.addFilter(InspectStackFilter())
+    start = perf_counter()
+    for i in range(count):
+        log.info(f"Benchmark message {i}")
+    caller_cost = perf_counter() - start
+    log.stop()
+    total = perf_counter() - start
+    print(
+        f"{label:<32} {caller_cost / count * 1e6:8.2f} µs/call on caller"
+        f"  {count / total:10.0f} records/s end-to-end"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="log calls per case")
+    parser.add_argument(
+        "--baseline", action=argparse.BooleanOptionalAction, default=True, help="also time the old inspect.stack() lookup"
+    )
+    args = parser.parse_args(argv)
+
+    if args.baseline:
+        bench("sync, inspect.stack() (old)", args.count, legacy_filter=True, async_mode=False)
+    bench("sync, caller lookup", args.count, async_mode=False)
+    bench("async, caller lookup", args.count, async_mode=True)
+    bench("async, no caller lookup", args.count, async_mode=True, caller_depth=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Frame times of a paced UI thread while CPU-bound Python work runs on the `TaskManager` thread pool compared to its
+
+process mode (`submit(..., process=True)`), plus the cost of moving an image buffer to a worker process and back
+
+pickled against `SharedArray`.
+
+Frame time is measured from when the frame was due (60 fps) to when it was built, so time spent waiting for the GIL
+
+after waking up counts.
+
+Usage: `python benchmarks/bench_processes.py [--seconds S] [--workers N] [--no-baseline]`
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.headless import HeadlessContext  # noqa: E402
+from src import gui  # noqa: E402
+from src.tasks import SharedArray, TaskManager  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+imgui = gui.imgui
+FRAME_TIME = 1 / 60
+IMAGE_SHAPE = (3000, 4000, 4)
+
+
+def checksum_rows(task, src: SharedArray, dst: SharedArray):
+    """
+    Stand-in for parsing / hashing in pure Python: holds the GIL for most of its run time.
+    """
+
+    rows = src.array.shape[0]
+    while not task.cancelled:
+        for y in range(rows):
+            dst.array[y] = src.array[y] ^ (sum(src.array[y].tobytes()) & 0xFF)
+            task.set_progress(y / rows)
+            if task.cancelled:
+                break
+
+
+def warm_up(task):
+    return os.getpid()
+
+
+def echo(task, img):
+    return img
+
+
+def invert(task, src: SharedArray, dst: SharedArray):
+    np.subtract(255, src.array, out=dst.array)
+
+
+def panel():
+    for i in range(50):
+        gui.separator_text(f"Section {i}")
+        imgui.button(f"Button {i}")
+
+
+def frame_times(seconds):
+    times = []
+    with HeadlessContext(800, 4000) as ctx:
+        due = perf_counter()
+        end = due + seconds
+        while due < end:
+            delay = due - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            with ctx.frame():
+                panel()
+            times.append(perf_counter() - due)
+            due = max(due + FRAME_TIME, perf_counter())
+    return times
+
+
+def run_under_load(manager, process, seconds, workers):
+    rng = np.random.default_rng(1)
+    img = rng.integers(0, 256, (256, 1024, 4), dtype=np.uint8)
+    with SharedArray.from_array(img) as src, SharedArray(img.shape, img.dtype) as dst:
+        tasks = [manager.submit(f"load {i}", checksum_rows, src, dst, process=process) for i in range(workers)]
+        times = frame_times(seconds)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            task.wait()
+    return times
+
+
+def summary(label, times):
+    ms = sorted(t * 1000 for t in times)
+    last = len(ms) - 1
+    late = sum(t > FRAME_TIME * 1000 for t in ms)
+    print(
+        f"{label:<14} p50 {statistics.median(ms):6.2f}  p95 {ms[round(last * 0.95)]:6.2f}"
+        f"  p99 {ms[round(last * 0.99)]:6.2f}  max {ms[-1]:7.2f} ms  {late}/{len(ms)} frames over budget"
+    )
+
+
+def transfer(manager, runs=5):
+    img = np.random.default_rng(2).integers(0, 256, IMAGE_SHAPE, dtype=np.uint8)
+    mb = img.nbytes / 2**20
+
+    pickled = []
+    for _ in range(runs):
+        start = perf_counter()
+        manager.submit("echo", echo, img, process=True).wait()
+        pickled.append(perf_counter() - start)
+
+    shared = []
+    with SharedArray(img.shape, img.dtype) as src, SharedArray(img.shape, img.dtype) as dst:
+        for _ in range(runs):
+            start = perf_counter()
+            src.array[...] = img
+            manager.submit("invert", invert, src, dst, process=True).wait()
+            shared.append(perf_counter() - start)
+
+    print(f"{mb:.0f} MiB image round trip (median of {runs}):")
+    print(f"  pickled        {statistics.median(pickled) * 1000:8.1f} ms")
+    print(f"  SharedArray    {statistics.median(shared) * 1000:8.1f} ms (including the copy into shared memory)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0, help="how long frames are measured per case")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument(
+        "--baseline", action=argparse.BooleanOptionalAction, default=True, help="also measure the thread pool"
+    )
+    args = parser.parse_args(argv)
+
+    manager = TaskManager(max_workers=args.workers, process_workers=args.workers)
+    # Spawn the workers up front so process start-up isn't part of the measurement.
+    for task in [manager.submit(f"warm up {i}", warm_up, process=True) for i in range(args.workers)]:
+        task.wait()
+
+    summary("idle", frame_times(args.seconds))
+    if args.baseline:
+        summary("thread pool", run_under_load(manager, False, args.seconds, args.workers))
+    summary("process pool", run_under_load(manager, True, args.seconds, args.workers))
+    transfer(manager)
+    manager.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Frame build cost of panels with hundreds of labels: separator labels and wrapped status lines drawn with plain ImGui
+
+calls (measured and wrapped every frame) against the `src.gui` helpers backed by `TEXT_METRICS`.
+
+Usage: `python benchmarks/bench_text.py [--frames N] [--no-baseline]`
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.headless import HeadlessContext  # noqa: E402
+from src import gui  # noqa: E402
+from src.text_metrics import TEXT_METRICS  # noqa: E402
+
+imgui = gui.imgui
+SEPARATORS = [f"Section {i}" for i in range(200)]
+MESSAGES = [
+    f"Task {i} finished downloading its files and is now verifying checksums before installing them. "
+    "Installing can take a few minutes, the app stays usable in the meantime and shows a notification when it's done."
+    for i in range(100)
+]
+WRAP_WIDTH = 260
+
+
+def uncached_separator(text, padding=10):
+    # `gui.separator_text()` before the cache.
+    cursor_x, cursor_y = imgui.get_cursor_screen_pos()
+    text_width, _ = imgui.calc_text_size(text)
+    region_width = imgui.get_content_region_available()[0]
+    line_width = (region_width - text_width) / 2 - padding
+
+    draw_list = imgui.get_window_draw_list()
+    color = 0xFFFFFFEE
+
+    if line_width > 0:
+        draw_list.add_line(
+            cursor_x,
+            (cursor_y + imgui.get_text_line_height() / 2),
+            (cursor_x + padding),
+            (cursor_y + imgui.get_text_line_height() / 2),
+            color,
+            1.6,
+        )
+        draw_list.add_line(
+            (cursor_x + text_width + padding * 2.5),
+            (cursor_y + imgui.get_text_line_height() / 2),
+            (cursor_x + region_width),
+            (cursor_y + imgui.get_text_line_height() / 2),
+            color,
+            1.6,
+        )
+
+    imgui.set_cursor_pos_x(cursor_x + padding)
+    imgui.text(text)
+    imgui.set_cursor_pos_y(cursor_y - (imgui.get_text_line_height() / 3))
+
+
+def uncached_separators():
+    for text in SEPARATORS:
+        uncached_separator(text)
+
+
+def uncached_messages():
+    for text in MESSAGES:
+        imgui.push_text_wrap_pos(imgui.get_cursor_pos_x() + WRAP_WIDTH)
+        gui.status_text(text)
+        imgui.pop_text_wrap_pos()
+
+
+def cached_separators():
+    for text in SEPARATORS:
+        gui.separator_text(text)
+
+
+def cached_messages():
+    for text in MESSAGES:
+        gui.status_text(text, wrap_width=WRAP_WIDTH)
+
+
+def frame_cost(panel, frames):
+    times = []
+    with HeadlessContext(800, 20000) as ctx:
+        for i in range(frames + 5):
+            with ctx.frame():
+                start = perf_counter()
+                panel()
+                if i >= 5:
+                    times.append(perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument(
+        "--baseline", action=argparse.BooleanOptionalAction, default=True, help="also time the uncached ImGui calls"
+    )
+    args = parser.parse_args(argv)
+
+    cases = (
+        (f"{len(SEPARATORS)} separator labels", uncached_separators, cached_separators),
+        (f"{len(MESSAGES)} wrapped messages", uncached_messages, cached_messages),
+    )
+    for label, uncached_panel, cached_panel in cases:
+        cached = frame_cost(cached_panel, args.frames)
+        if not args.baseline:
+            print(f"{label}: cached {cached:7.3f} ms/frame")
+            continue
+        uncached = frame_cost(uncached_panel, args.frames)
+        print(f"{label}: uncached {uncached:7.3f} ms/frame, cached {cached:7.3f} ms/frame ({uncached / cached:.2f}x)")
+    print(TEXT_METRICS.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
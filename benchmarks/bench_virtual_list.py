@@ -0,0 +1,129 @@
+"""
+Shows that the frame cost of `VirtualList` / `VirtualTable` depends on the number of visible rows, not the number of rows,
+
+compared to a plain `imgui.text` loop. Also times sorting and building a variable height index.
+
+Usage: `python benchmarks/bench_virtual_list.py [--frames N] [--no-baseline]`
+"""
+
+import argparse
+import os
+import random
+import sys
+
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.headless import HeadlessContext  # noqa: E402
+from src.virtual_list import Column, HeightIndex, VirtualList, VirtualTable  # noqa: E402
+
+import imgui  # noqa: E402
+
+ROW_COUNTS = (1_000, 100_000, 1_000_000)
+NAIVE_ROW_COUNTS = (1_000, 10_000, 100_000)
+
+
+def frame_cost(draw, frames, scroll=None):
+    """
+    Returns the average µs per frame of `draw()`, scrolling to the middle first if `scroll` is given.
+    """
+
+    with HeadlessContext() as ctx:
+        if scroll:
+            scroll()
+        for _ in range(3):
+            with ctx.frame():
+                draw()
+        start = perf_counter()
+        for _ in range(frames):
+            with ctx.frame():
+                draw()
+        return (perf_counter() - start) / frames * 1e6
+
+
+def naive_list(items):
+    def draw():
+        with imgui.begin_child("##naive", 0, 300, True):
+            for item in items:
+                imgui.text(str(item))
+
+    return draw
+
+
+def make_rows(count):
+    rng = random.Random(count)
+    return [(i, rng.random(), f"item {rng.randrange(10_000):05d}") for i in range(count)]
+
+
+def report(label, count, us):
+    print(f"{label:<36} {count:>10,} rows {us:10.1f} µs/frame")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument(
+        "--baseline", action=argparse.BooleanOptionalAction, default=True, help="also time a plain imgui.text loop"
+    )
+    args = parser.parse_args(argv)
+    frames = args.frames
+
+    if args.baseline:
+        for count in NAIVE_ROW_COUNTS:
+            report("imgui.text loop", count, frame_cost(naive_list(range(count)), max(1, frames // 10)))
+
+    for count in ROW_COUNTS:
+        items = range(count)
+        fixed = VirtualList(items)
+        report("VirtualList, fixed height", count, frame_cost(lambda: fixed.draw("##list", height=300), frames))
+
+        start = perf_counter()
+        heights = [18.0 + (i % 3) * 6 for i in range(count)]
+        variable = VirtualList(items, heights=heights)
+        build = perf_counter() - start
+        report(
+            "VirtualList, variable height",
+            count,
+            frame_cost(
+                lambda: variable.draw("##list", height=300),
+                frames,
+                scroll=lambda: variable.scroll_to(count // 2),
+            ),
+        )
+        print(f"{'':<36} height index built in {build * 1000:.1f} ms")
+
+        rows = make_rows(count)
+        table = VirtualTable(
+            [
+                Column("Id", lambda row: row[0]),
+                Column("Value", lambda row: row[1], format=lambda value: f"{value:.4f}"),
+                Column("Name", lambda row: row[2]),
+            ],
+            rows,
+        )
+        report(
+            "VirtualTable",
+            count,
+            frame_cost(lambda: table.draw("##table", height=300), frames, scroll=lambda: table.scroll_to(count // 2)),
+        )
+
+        start = perf_counter()
+        table.sort([(2, False), (1, True)])
+        first_sort = perf_counter() - start
+        start = perf_counter()
+        table.sort([(1, False)])
+        table.sort([(2, True), (1, True)])
+        resort = (perf_counter() - start) / 2
+        print(f"{'':<36} first sort {first_sort * 1000:.1f} ms (computes keys), re-sort {resort * 1000:.1f} ms")
+
+    index = HeightIndex(heights=[20.0] * ROW_COUNTS[-1])
+    start = perf_counter()
+    for y in range(0, 10_000):
+        index.row_at(y * 1000.0)
+    print(f"\nHeightIndex.row_at over {ROW_COUNTS[-1]:,} rows: {(perf_counter() - start) / 10_000 * 1e6:.2f} µs/lookup")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
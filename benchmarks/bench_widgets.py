@@ -0,0 +1,178 @@
+"""
+Measures the CPU cost of the `src.gui` widget wrappers in a headless ImGui context.
+
+For every widget it reports µs/call and the bytes allocated per call (peak, traced with `tracemalloc`), compares them
+
+against `benchmarks/baselines.json` and exits with status 1 if a widget is slower than its baseline by more than `--threshold`
+
+or produces more draw commands than it did when the baseline was recorded.
+
+Baselines are machine-specific: regenerate them with `--update` on the machine that runs the comparison.
+
+Usage: `python benchmarks/bench_widgets.py [--frames N] [--threshold 1.5] [--update] [--only name ...]`
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tracemalloc
+
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.headless import HeadlessContext  # noqa: E402
+from src import gui  # noqa: E402
+from src.draw_stats import measure  # noqa: E402
+
+imgui = gui.imgui
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+GREY = [0.501, 0.501, 0.501]
+
+
+def _open_message_box():
+    imgui.open_popup("Bench Message")
+
+
+def _hover_first_item(ctx):
+    ctx.set_mouse(20, 15)
+
+
+def _begin_disabled():
+    with gui.begin_disabled(True):
+        imgui.text("Disabled")
+
+
+# name: (widget callable, calls per frame, per-frame setup, context setup)
+CASES = {
+    "imgui.button (reference)": (lambda: imgui.button("Button"), 20, None, None),
+    "colored_button": (lambda: gui.colored_button("Colored", GREY, GREY, GREY), 20, None, None),
+    "busy_button": (lambda: gui.busy_button(gui.Icons.hourglass_1, "Busy"), 20, None, None),
+    "status_text": (lambda: gui.status_text("Ready", (0.0, 1.0, 0.0)), 20, None, None),
+    "separator_text": (lambda: gui.separator_text("Separator"), 20, None, None),
+    "tooltip (not hovered)": (lambda: gui.tooltip("Tooltip text"), 20, None, None),
+    "tooltip (hovered)": (
+        lambda: (imgui.button("Hover Me"), gui.tooltip("Wow! Such button!")),
+        1,
+        None,
+        _hover_first_item,
+    ),
+    "help_marker": (lambda: gui.help_marker("Help text"), 20, None, None),
+    "message_box": (lambda: gui.message_box("Bench Message", "Some message text."), 1, _open_message_box, None),
+    "image_rounded": (lambda: gui.image_rounded(1, 32), 20, None, None),
+    "disabled_widget (disabled)": (lambda: gui.disabled_widget(True, imgui.checkbox, "Check", True), 20, None, None),
+    "disabled_widget (enabled)": (lambda: gui.disabled_widget(False, imgui.checkbox, "Check", True), 20, None, None),
+    "begin_disabled": (_begin_disabled, 20, None, None),
+    "spinner": (lambda: gui.spinner(), 20, None, None),
+}
+
+
+def run_case(widget, calls, setup, ctx_setup, frames, warmup=10):
+    """
+    Returns `(us_per_call, bytes_per_call, draw_commands)` for one widget.
+
+    The time is the median over `frames` frames, which keeps GC pauses and scheduler noise out of the comparison.
+    """
+
+    with HeadlessContext() as ctx:
+        if ctx_setup:
+            ctx_setup(ctx)
+
+        for _ in range(warmup):
+            with ctx.frame():
+                if setup:
+                    setup()
+                for _ in range(calls):
+                    widget()
+
+        timings = []
+        for _ in range(frames):
+            with ctx.frame():
+                if setup:
+                    setup()
+                start = perf_counter()
+                for _ in range(calls):
+                    widget()
+                timings.append(perf_counter() - start)
+        draw_commands = measure(ctx.draw_data).commands
+
+        alloc_frames = max(1, frames // 10)
+        peak_total = 0
+        tracemalloc.start()
+        for _ in range(alloc_frames):
+            with ctx.frame():
+                if setup:
+                    setup()
+                for _ in range(calls):
+                    before = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                    widget()
+                    peak_total += tracemalloc.get_traced_memory()[1] - before
+        tracemalloc.stop()
+
+    return statistics.median(timings) / calls * 1e6, peak_total / (alloc_frames * calls), draw_commands
+
+
+def load_baselines() -> dict:
+    if not os.path.isfile(BASELINES_PATH):
+        return {}
+    with open(BASELINES_PATH, "r") as f:
+        return json.load(f)
+
+
+def save_baselines(results: dict):
+    with open(BASELINES_PATH, "w") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=None, help="allowed slowdown factor (default: from baselines, else 1.5)")
+    parser.add_argument("--update", action="store_true", help="write the results to baselines.json")
+    parser.add_argument("--only", nargs="*", default=None, help="only run these widgets")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    threshold = args.threshold or baselines.get("threshold", 1.5)
+    stored = baselines.get("widgets", {})
+    results = {}
+    regressions = []
+
+    print(f"{'widget':<28} {'µs/call':>9} {'baseline':>9} {'ratio':>6} {'B/call':>9} {'cmds':>5}")
+    for name, (widget, calls, setup, ctx_setup) in CASES.items():
+        if args.only and name not in args.only:
+            continue
+        us, alloc, cmds = run_case(widget, calls, setup, ctx_setup, args.frames)
+        results[name] = {"us_per_call": round(us, 3), "bytes_per_call": round(alloc, 1), "draw_commands": cmds}
+
+        base = stored.get(name)
+        ratio = us / base["us_per_call"] if base and base["us_per_call"] else None
+        flag = ""
+        if ratio is not None and ratio > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        elif base and cmds > base.get("draw_commands", cmds):
+            regressions.append(name)
+            flag = "  MORE DRAW COMMANDS"
+        print(
+            f"{name:<28} {us:9.2f} {base['us_per_call'] if base else float('nan'):9.2f} "
+            f"{ratio if ratio is not None else float('nan'):6.2f} {alloc:9.0f} {cmds:5d}{flag}"
+        )
+
+    if args.update:
+        save_baselines({"threshold": threshold, "widgets": {**stored, **results}})
+        print(f"Baselines written to {BASELINES_PATH}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} widget(s) slower than {threshold:.2f}x baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
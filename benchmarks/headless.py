@@ -0,0 +1,136 @@
+"""
+Headless ImGui harness: runs frames with a real ImGui context and font atlas but without a GLFW window or GL.
+
+Frames only go as far as `imgui.render()`, so the draw data is built but never submitted.
+
+The Windows-only modules `src.gui` imports are replaced by stubs, so this also runs on Linux CI.
+
+- Example:
+    ```
+    from benchmarks.headless import HeadlessContext
+
+    with HeadlessContext() as ctx:
+        with ctx.frame():
+            gui.separator_text("Hello")
+        print(ctx.draw_data.cmd_count)
+    ```
+"""
+
+import ctypes
+import os
+import sys
+import types
+
+from contextlib import contextmanager
+
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_PATH = os.path.join(REPO_PATH, "src", "assets", "fonts")
+
+
+def _stub(name, **attrs):
+    if name in sys.modules:
+        return sys.modules[name]
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def _no_op(*_, **__):
+    return None
+
+
+def install_stubs():
+    """
+    Registers stand-ins for `win32gui`, `win32con`, `pywintypes`, `win11toast` and `ctypes.windll` if they can't be imported.
+    """
+
+    for name, attrs in (
+        ("win32gui", {"GetOpenFileNameW": _no_op, "FindWindow": lambda *_: 0, "SetForegroundWindow": _no_op}),
+        ("win32con", {"OFN_EXPLORER": 0x80000, "OFN_ALLOWMULTISELECT": 0x200}),
+        ("pywintypes", {"error": type("error", (Exception,), {})}),
+        ("win11toast", {"notify": _no_op}),
+    ):
+        try:
+            __import__(name)
+        except ImportError:
+            _stub(name, **attrs)
+
+    if not hasattr(ctypes, "windll"):
+        ctypes.windll = None
+
+    if REPO_PATH not in sys.path:
+        sys.path.insert(0, REPO_PATH)
+
+
+install_stubs()
+
+import imgui  # noqa: E402
+
+
+class HeadlessContext:
+    """
+    Owns an ImGui context with a fixed `display_size` and a built font atlas.
+
+    Fonts from `src/assets/fonts` can be loaded by file name through `fonts={"name": ("file.ttf", size)}`
+
+    and are available as `ctx.fonts["name"]`.
+    """
+
+    def __init__(self, width=800, height=600, fonts: dict = None, delta_time=1 / 60):
+        self.width = width
+        self.height = height
+        self.delta_time = delta_time
+        self.font_specs = fonts or {}
+        self.fonts = {}
+        self.context = None
+        self.draw_data = None
+        self.frame_count = 0
+
+    def __enter__(self):
+        self.context = imgui.create_context()
+        io = imgui.get_io()
+        io.display_size = (self.width, self.height)
+        io.delta_time = self.delta_time
+        io.ini_file_name = None
+
+        for name, (file, size) in self.font_specs.items():
+            self.fonts[name] = io.fonts.add_font_from_file_ttf(os.path.join(FONT_PATH, file), size)
+        io.fonts.get_tex_data_as_rgba32()
+        io.fonts.texture_id = 1
+        return self
+
+    def __exit__(self, *_):
+        imgui.destroy_context(self.context)
+        self.context = None
+        return False
+
+    def set_mouse(self, x, y, down=False):
+        io = imgui.get_io()
+        io.mouse_pos = (x, y)
+        io.mouse_down[0] = down
+
+    @contextmanager
+    def frame(self, window=True):
+        """
+        Runs one frame. With `window=True` the body is wrapped in a full-screen window, like the example app.
+        """
+
+        imgui.get_io().delta_time = self.delta_time
+        imgui.new_frame()
+        if window:
+            imgui.set_next_window_size(self.width, self.height)
+            imgui.set_next_window_position(0, 0)
+            imgui.begin(
+                "Headless",
+                flags=imgui.WINDOW_NO_TITLE_BAR | imgui.WINDOW_NO_RESIZE | imgui.WINDOW_NO_MOVE,
+            )
+        try:
+            yield self
+        finally:
+            if window:
+                imgui.end()
+            imgui.render()
+            self.draw_data = imgui.get_draw_data()
+            self.frame_count += 1
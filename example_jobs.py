@@ -0,0 +1,24 @@
+"""
+Work the demo app runs in `TaskManager` worker processes.
+
+Process workers import the module a task function lives in, so keep this one free of side effects: no windows,
+
+loggers, config stores or thread pools at import time.
+"""
+
+
+def count_primes(task, limit):
+    """
+    CPU-bound dummy work. Runs in a worker process so it doesn't hold the GIL the render thread needs.
+    """
+
+    count = 0
+    for n in range(2, limit):
+        if all(n % d for d in range(2, int(n**0.5) + 1)):
+            count += 1
+        if n % 10000 == 0:
+            task.set_progress(n / limit)
+            if task.cancelled:
+                break
+    task.set_progress(0)
+    return count
@@ -1,149 +1,202 @@
+import asyncio
+import multiprocessing
 import os, sys
 
+from src.startup import STARTUP
+
+# Process tasks start this executable again when frozen, this runs the worker and exits.
+multiprocessing.freeze_support()
+
 if getattr(sys, "frozen", False):
     import pyi_splash  # type: ignore
 
 
 from pathlib import Path
+from typing import NamedTuple
 from win32gui import FindWindow, SetForegroundWindow
 from src import utils, gui
+from example_jobs import count_primes
+from src.animation import ANIMATOR, IconCycle
+from src.async_loop import ASYNC_LOOP, run_command
+from src.config import ConfigStore
+from src.draw_stats import DRAW_STATS, DrawBudget
+from src.fonts import FontAtlas, FontSpec
+from src.frame_pacing import FramePacer, LatencyMonitor
 from src.logger import LOGGER
+from src.notifications import ERROR, NOTIFICATIONS, SUCCESS, OSNotifier
+from src.profiler import PROFILER
+from src.render_loop import RenderLoop
+from src.state import StateStore
+from src.tasks import TaskManager
+from src.text_metrics import TEXT_METRICS
+from src.theme import THEME, Theme
+
+# Process task workers import this module as "__mp_main__" and only need the job functions, so what pulls in PyOpenGL
+# and numpy is only imported in the app's own process.
+if __name__ == "__main__":
+    from imgui.integrations.glfw import GlfwRenderer
+    from src.content_scale import ContentScaleManager
+    from src.file_browser import FileBrowser
 
 APP_NAME = "ExampleApp"
 APP_VERSION = "1.0"
 WORK_PATH = os.path.join(os.getcwd(), APP_NAME)
 PARENT_PATH = Path(__file__).parent
 ASSETS_PATH = PARENT_PATH / Path(r"src/assets")
-LOG = LOGGER(APP_NAME, APP_VERSION)
 
 
-this_window = FindWindow(None, APP_NAME)
-if this_window != 0:
-    LOG.warning(
-        f"{APP_NAME} is aleady running! Only one instance can be launched at once.\n"
-    )
-    SetForegroundWindow(this_window)
-    sys.exit(0)
-if not os.path.exists(WORK_PATH):
-    os.mkdir(WORK_PATH)
-LOG.on_init()
+# Process task workers import this module as "__mp_main__". Everything with side effects (the log file, the config
+# writer, thread pools, the single instance check) is only set up in the app's own process.
+if __name__ == "__main__":
+    LOG = LOGGER(APP_NAME, APP_VERSION)
+    this_window = FindWindow(None, APP_NAME)
+    if this_window != 0:
+        LOG.warning(
+            f"{APP_NAME} is aleady running! Only one instance can be launched at once.\n"
+        )
+        SetForegroundWindow(this_window)
+        sys.exit(0)
+    if not os.path.exists(WORK_PATH):
+        os.mkdir(WORK_PATH)
+    LOG.on_init()
+STARTUP.mark("imports")
 
 
 import atexit
 
-from concurrent.futures import ThreadPoolExecutor
-from imgui.integrations.glfw import GlfwRenderer
-from threading import Thread
-from time import sleep
-
 
 Icons = gui.Icons
 ImGui = gui.imgui
-threadpool = ThreadPoolExecutor(max_workers=3)
-progress_value = 0
-should_exit = False
+
+
+def on_task_error(task, e):
+    LOG.error(f"Task {task.name} failed: {e}")
+    NOTIFICATIONS.notify(f"Task {task.name} failed: {e}", ERROR)
+
+
+if __name__ == "__main__":
+    TASKS = TaskManager(max_workers=3, on_error=on_task_error)
 window = None
-status_update_thread = None
-dummy_progress_thread = None
-dummy_exit_thread = None
-app_init_thread = None
-task_status_col = None
-task_status = ""
-busy_icon = ""
 CONFIG_PATH = os.path.join(WORK_PATH, "settings.json")
-debug_console = utils.read_cfg_item(CONFIG_PATH, "debug_console")
 ImRed = [1.0, 0.0, 0.0]
 ImGreen = [0.0, 1.0, 0.0]
 ImBlue = [0.0, 0.0, 1.0]
 ImYellow = [1.0, 1.0, 0.0]
 
+ICONS_RANGE = (
+    0xF00C, 0xF00D,
+    0xF01A, 0xF01B,
+    0xF019, 0xF021,
+    0xF055, 0xF056,
+    0xF09B, 0xF09C,
+    0xF250, 0xF254,
+)
+ROKKITT = str(ASSETS_PATH / "fonts/Rokkitt-Regular.ttf")
+FONTS = FontAtlas(
+    {
+        "title": FontSpec(ROKKITT, 25),
+        "small": FontSpec(ROKKITT, 16),
+        "main": [
+            FontSpec(ROKKITT, 20),
+            FontSpec(str(ASSETS_PATH / "fonts/fontawesome-webfont.ttf"), 16, ICONS_RANGE, merge=True),
+        ],
+    }
+)
+
+APP_THEME = Theme(
+    name="Dark",
+    colors={
+        ImGui.COLOR_FRAME_BACKGROUND: (0.1, 0.1, 0.1),
+        ImGui.COLOR_FRAME_BACKGROUND_ACTIVE: (0.3, 0.3, 0.3),
+        ImGui.COLOR_FRAME_BACKGROUND_HOVERED: (0.5, 0.5, 0.5),
+        ImGui.COLOR_TAB: (0.097, 0.097, 0.097),
+        ImGui.COLOR_TAB_ACTIVE: (0.075, 0.075, 0.075),
+        ImGui.COLOR_TAB_HOVERED: (0.085, 0.085, 0.085),
+        ImGui.COLOR_HEADER: (0.1, 0.1, 0.1),
+        ImGui.COLOR_HEADER_ACTIVE: (0.3, 0.3, 0.3),
+        ImGui.COLOR_HEADER_HOVERED: (0.5, 0.5, 0.5),
+        ImGui.COLOR_BUTTON: (0.075, 0.075, 0.075),
+        ImGui.COLOR_BUTTON_ACTIVE: (0.085, 0.085, 0.085),
+        ImGui.COLOR_BUTTON_HOVERED: (0.1, 0.1, 0.1),
+    },
+    style_vars={
+        ImGui.STYLE_CHILD_ROUNDING: 5,
+        ImGui.STYLE_FRAME_ROUNDING: 5,
+        ImGui.STYLE_ITEM_SPACING: (5, 5),
+        ImGui.STYLE_ITEM_INNER_SPACING: (5, 5),
+        ImGui.STYLE_FRAME_PADDING: (5, 5),
+    },
+)
+
 default_cfg = {
     "debug_console": False,
+    "frame_pacing": FramePacer.VSYNC,
 }
 
 
-def res_path(path: str) -> Path:
-    return ASSETS_PATH / Path(path)
+class AppState(NamedTuple):
+    should_exit: bool = False
+    debug_console: bool = False
 
 
-def set_task_status(msg="", color=None, timeout=2):
-    global task_status, task_status_col
-    task_status = msg
-    task_status_col = color
-    sleep(timeout)
-    task_status = ""
-    task_status_col = None
+if __name__ == "__main__":
+    CONFIG = ConfigStore(CONFIG_PATH, default_cfg)
+    APP_STATE = StateStore(AppState(debug_console=CONFIG.get("debug_console")))
 
 
-def dummy_progress():
-    global progress_value
+def res_path(path: str) -> Path:
+    return ASSETS_PATH / Path(path)
 
-    progress_value = 0
 
-    for i in range(101):
-        progress_value = i / 100
-        sleep(0.01)
-    sleep(1)
-    progress_value = 0
+async def set_task_status(msg="", color=None, timeout=2):
+    # A timer on the asyncio loop instead of a worker thread sleeping through the timeout.
+    TASKS.set_status(msg, color)
+    try:
+        await asyncio.sleep(timeout)
+    finally:
+        TASKS.set_status()
 
 
-def dummy_quit_func():
-    global task_status, should_exit
+async def get_python_version():
+    _, stdout, stderr = await run_command(sys.executable, "--version", timeout=10)
+    return (stdout or stderr).decode().strip()
 
-    task_status = "Pretending to be doing something important..."
-    dummy_progress()
-    for i in range(4):
-        task_status = f"{APP_NAME} will automatically exit in {i - 3}"
-    should_exit = True
 
+def dummy_progress(task):
+    task.set_progress(0)
 
-def is_any_thread_alive():
-    global status_update_thread
-    global app_init_thread
-    global dummy_progress_thread
+    for i in range(101):
+        task.set_progress(i / 100)
+        if task.token.wait(0.01):
+            break
+    task.token.wait(1)
+    task.set_progress(0)
 
-    for thread in (
-        status_update_thread,
-        dummy_progress_thread,
-        app_init_thread
-        ):
-            return utils.is_thread_active(thread)
-    return False
 
+def dummy_quit_func(task):
+    task.set_status("Pretending to be doing something important...")
+    dummy_progress(task)
+    for i in range(4):
+        task.set_status(f"{APP_NAME} will automatically exit in {i - 3}")
+    APP_STATE.update(should_exit=True)
 
-def get_status_widget_color():
-    global task_status
-    global status_update_thread
-    global app_init_thread
 
-    if task_status != "":
-        if utils.stringFind(task_status, "error") or utils.stringFind(
-            task_status, "failed"
+def get_status_widget_color(tasks, busy):
+    if tasks.status != "":
+        if utils.stringFind(tasks.status, "error") or utils.stringFind(
+            tasks.status, "failed"
         ):
             return ImRed, "Error"
         else:
-            if is_any_thread_alive():
+            if busy:
                 return ImYellow, "Busy"
     return ImGreen, "Ready"
 
 
-def animate_icon():
-    global busy_icon
-
-    while True:
-        sleep(0.1)
-        if is_any_thread_alive():
-            busy_icon = Icons.hourglass_1
-            sleep(0.1)
-            busy_icon = Icons.hourglass_2
-            sleep(0.1)
-            busy_icon = Icons.hourglass_3
-            sleep(0.1)
-            busy_icon = Icons.hourglass_4
-            sleep(0.1)
-            busy_icon = Icons.hourglass_5
-
-Thread(target=animate_icon, daemon=True).start()
+BUSY_ICON = IconCycle(
+    [Icons.hourglass_1, Icons.hourglass_2, Icons.hourglass_3, Icons.hourglass_4, Icons.hourglass_5],
+    interval=0.1,
+)
 
 
 def check_saved_config():
@@ -151,157 +204,142 @@ def check_saved_config():
     Fixes missing config entries.
     """
 
-    saved_config: dict = utils.read_cfg(CONFIG_PATH)
-    if len(saved_config) != len(default_cfg):
-        try:
-            if len(saved_config) < len(default_cfg):
-                for key in default_cfg:
-                    if key not in saved_config:
-                        saved_config.update({key: default_cfg[key]})
-                        LOG.debug(f'Added missing config key: "{key}".')
-            elif len(saved_config) > len(default_cfg):
-                for key in saved_config.copy():
-                    if key not in default_cfg:
-                        del saved_config[key]
-                        LOG.debug(f'Removed stale config key: "{key}".')
-            utils.save_cfg(CONFIG_PATH, saved_config)
-        except Exception as e:
-            LOG.error(e)
-    dummy_progress()
-
-
-def app_init():
-    global task_status
-    global task_status_col
-    global default_cfg
-
-    task_status = f"Initializing {APP_NAME}, please wait..."
-    if not os.path.exists(CONFIG_PATH):
-        utils.save_cfg(CONFIG_PATH, default_cfg)
-
-    task_status = f"Verifying config..."
+    added, removed = CONFIG.apply_defaults()
+    for key in added:
+        LOG.debug(f'Added missing config key: "{key}".')
+    for key in removed:
+        LOG.debug(f'Removed stale config key: "{key}".')
+
+
+def app_init(task):
+    task.set_status(f"Initializing {APP_NAME}, please wait...")
+
+    task.set_status("Verifying config...")
     LOG.info("Verifying config...")
     check_saved_config()
-    task_status_col = None
-    task_status = ""
+    dummy_progress(task)
+    task.set_status()
     LOG.info("Initialization complete.")
+    NOTIFICATIONS.notify("Initialization complete.", SUCCESS)
 
 
-app_init_thread = threadpool.submit(app_init)
+if __name__ == "__main__":
+    app_init_task = TASKS.submit("app_init", app_init, priority=10)
 
 
 def run_dummy_progress():
-    global dummy_progress_thread
-
-    if dummy_progress_thread and not dummy_progress_thread.done():
-        pass
-    else:
-        dummy_progress_thread = threadpool.submit(dummy_progress)
+    TASKS.submit("dummy_progress", dummy_progress)
 
 
 def run_task_status_update(msg="", color=None, timeout=2):
-    global status_update_thread
+    ASYNC_LOOP.submit("status_update", set_task_status, msg, color, timeout)
 
-    if status_update_thread and not status_update_thread.done():
-        pass
-    else:
-        status_update_thread = threadpool.submit(set_task_status, msg, color, timeout)
 
+def run_version_check():
+    ASYNC_LOOP.submit(
+        "version_check",
+        get_python_version,
+        on_done=lambda version: NOTIFICATIONS.notify(f"Running on {version}", SUCCESS),
+        on_error=lambda e: NOTIFICATIONS.notify(f"Version check failed: {e!r}", ERROR),
+    )
 
-def run_dummy_exit_func():
-    global dummy_exit_thread
 
-    if dummy_exit_thread and not dummy_exit_thread.done():
-        pass
-    else:
-        dummy_exit_thread = threadpool.submit(dummy_quit_func)
+def run_process_task():
+    TASKS.submit("count_primes", count_primes, 2_000_000, process=True)
+    run_task_status_update("Counting primes in a worker process...", None, 2)
+
+
+def run_dummy_exit_func():
+    TASKS.submit("dummy_exit", dummy_quit_func)
 
 
 def OnDraw():
     global window
-    global task_status
-    global debug_console
 
     ImGui.create_context()
+    STARTUP.mark("app_init")
     window = gui.new_window(APP_NAME, 400, 400, False)
+    STARTUP.mark("window")
+    content_scale = ContentScaleManager(window, FONTS, theme=THEME)
+    font_report = FONTS.build(ImGui.get_io(), content_scale.raster_scale, content_scale.ui_scale)
+    TEXT_METRICS.bind(FONTS)
+    LOG.debug(str(font_report))
+    STARTUP.mark("fonts")
     impl = GlfwRenderer(window)
-    font_scaling_factor = gui.fb_to_window_factor(window)
-    io = ImGui.get_io()
-    io.fonts.clear()
-    io.font_global_scale = 1.0 / font_scaling_factor
-    font_config = ImGui.core.FontConfig(merge_mode=True)
-    icons_range = ImGui.core.GlyphRanges(
-        [
-            0xF00C,
-            0xF00D,
-            0xF01A,
-            0xF01B,
-            0xF019,
-            0xF021,
-            0xF055,
-            0xF056,
-            0xF09B,
-            0xF09C,
-            0xF250,
-            0xF254,
-            0,
-        ]
-    )
-
-    title_font = io.fonts.add_font_from_file_ttf(
-        str(res_path("fonts/Rokkitt-Regular.ttf")),
-        25 * font_scaling_factor,
-    )
-
-    small_font = io.fonts.add_font_from_file_ttf(
-        str(res_path("fonts/Rokkitt-Regular.ttf")),
-        16.0 * font_scaling_factor,
-    )
-
-    main_font = io.fonts.add_font_from_file_ttf(
-        str(res_path("fonts/Rokkitt-Regular.ttf")),
-        20 * font_scaling_factor,
-    )
-
-    io.fonts.add_font_from_file_ttf(
-        str(res_path("fonts/fontawesome-webfont.ttf")),
-        16 * font_scaling_factor,
-        font_config,
-        icons_range,
-    )
-
-    impl.refresh_font_texture()
-
-    if debug_console:
+    STARTUP.mark("renderer")
+    THEME.set_theme(APP_THEME)
+    THEME.set_scale(content_scale.ui_scale)
+    title_font = FONTS["title"]
+    small_font = FONTS["small"]
+    main_font = FONTS["main"]
+
+    PROFILER.add_overlay_section(DRAW_STATS.draw_overlay_section)
+    DRAW_STATS.set_budget(DrawBudget(commands=32, vertices=10000), window="Main Window")
+
+    # The pacer limits the frame rate while the app is active, the render loop only handles idling.
+    render_loop = RenderLoop(window, active_fps=0, idle_fps=0)
+    pacer = FramePacer(window, CONFIG.get("frame_pacing"))
+    render_loop.reference_fps = pacer.target_fps
+    latency = LatencyMonitor(window)
+    PROFILER.add_overlay_section(latency.draw_overlay_section)
+    render_loop.add_activity_source(ANIMATOR.needs_frame)
+    render_loop.add_deadline_source(ANIMATOR.next_deadline)
+    render_loop.add_deadline_source(content_scale.next_deadline)
+    content_scale.on_change = render_loop.wake
+    NOTIFICATIONS.on_change = render_loop.wake
+    NOTIFICATIONS.os_backend = OSNotifier(APP_NAME, icon=res_path("img/icon.ico"))
+    render_loop.watch(TASKS.store)
+    render_loop.watch(APP_STATE)
+    ASYNC_LOOP.on_change = render_loop.wake
+    render_loop.add_activity_source(lambda: gui.IMAGE_LOADER.pending > 0)
+    gui.IMAGE_LOADER.on_decoded = render_loop.wake
+    gui.THUMBNAILS.directory = os.path.join(WORK_PATH, "thumbnails")
+
+    file_browser = None
+    show_file_browser = False
+
+    if APP_STATE.snapshot.debug_console:
         LOG.show_console()
 
     while (
         not gui.glfw.window_should_close(window)
-        and not should_exit
+        and not APP_STATE.snapshot.should_exit
     ):
-        gui.glfw.poll_events()
-        impl.process_inputs()
-        ImGui.new_frame()
+        # Idle waits are left out of the frame time, they're counted in `render_loop.idle_time` instead.
+        if not render_loop.wait(poll_events=False):
+            continue
+        PROFILER.begin_frame()
+        with PROFILER.scope("poll_events"):
+            gui.glfw.poll_events()
+        with PROFILER.scope("pacing"):
+            pacer.begin_frame()
+        latency.begin_frame()
+        with PROFILER.scope("process_inputs"):
+            impl.process_inputs()
+        with PROFILER.scope("image_uploads"):
+            gui.IMAGE_LOADER.pump()
+        with PROFILER.scope("async_results"):
+            ASYNC_LOOP.pump()
+        if content_scale.update():
+            LOG.debug(str(FONTS.last_report))
+            title_font = FONTS["title"]
+            small_font = FONTS["small"]
+            main_font = FONTS["main"]
+        with PROFILER.scope("new_frame"):
+            ImGui.new_frame()
+        ANIMATOR.tick()
+        PROFILER.begin_scope("widgets")
+        if ImGui.is_key_pressed(gui.glfw.KEY_F3):
+            PROFILER.show_overlay = not PROFILER.show_overlay
+        if ImGui.is_key_pressed(gui.glfw.KEY_F4):
+            PROFILER.export_chrome_trace(os.path.join(WORK_PATH, "frame_trace.json"))
+        tasks = TASKS.snapshot
+        # The status message timer runs on the asyncio loop, it counts as busy like the other tasks.
+        busy = tasks.busy or ASYNC_LOOP.is_active("status_update")
+        busy_icon = BUSY_ICON.current if busy else ""
         win_w, win_h = gui.glfw.get_window_size(window)
         ImGui.set_next_window_size(win_w, win_h)
         ImGui.set_next_window_position(0, 0)
-        ImGui.push_style_color(ImGui.COLOR_FRAME_BACKGROUND, 0.1, 0.1, 0.1)
-        ImGui.push_style_color(ImGui.COLOR_FRAME_BACKGROUND_ACTIVE, 0.3, 0.3, 0.3)
-        ImGui.push_style_color(ImGui.COLOR_FRAME_BACKGROUND_HOVERED, 0.5, 0.5, 0.5)
-        ImGui.push_style_color(ImGui.COLOR_TAB, 0.097, 0.097, 0.097)
-        ImGui.push_style_color(ImGui.COLOR_TAB_ACTIVE, 0.075, 0.075, 0.075)
-        ImGui.push_style_color(ImGui.COLOR_TAB_HOVERED, 0.085, 0.085, 0.085)
-        ImGui.push_style_color(ImGui.COLOR_HEADER, 0.1, 0.1, 0.1)
-        ImGui.push_style_color(ImGui.COLOR_HEADER_ACTIVE, 0.3, 0.3, 0.3)
-        ImGui.push_style_color(ImGui.COLOR_HEADER_HOVERED, 0.5, 0.5, 0.5)
-        ImGui.push_style_color(ImGui.COLOR_BUTTON, 0.075, 0.075, 0.075)
-        ImGui.push_style_color(ImGui.COLOR_BUTTON_ACTIVE, 0.085, 0.085, 0.085)
-        ImGui.push_style_color(ImGui.COLOR_BUTTON_HOVERED, 0.1, 0.1, 0.1)
-        ImGui.push_style_var(ImGui.STYLE_CHILD_ROUNDING, 5)
-        ImGui.push_style_var(ImGui.STYLE_FRAME_ROUNDING, 5)
-        ImGui.push_style_var(ImGui.STYLE_ITEM_SPACING, (5, 5))
-        ImGui.push_style_var(ImGui.STYLE_ITEM_INNER_SPACING, (5, 5))
-        ImGui.push_style_var(ImGui.STYLE_FRAME_PADDING, (5, 5))
         ImGui.push_font(main_font)
         ImGui.begin(
             "Main Window",
@@ -310,7 +348,7 @@ def OnDraw():
             | ImGui.WINDOW_NO_MOVE,
         )
         with ImGui.begin_child("##YLP", 0, 300):
-            if app_init_thread and app_init_thread.done():
+            if app_init_task.done():
                 ImGui.dummy(1, 10)
                 with ImGui.font(title_font):
                     ImGui.text("Example Title Text")
@@ -325,37 +363,66 @@ def OnDraw():
                 
                 ImGui.text("Example Busy Button:")
                 ImGui.same_line(spacing=10)
-                if not is_any_thread_alive():
+                if not busy:
                     if ImGui.button("Click Me!"):
                         run_dummy_progress()
                         run_task_status_update("Please Wait...", None, 2)
                 else:
                     gui.busy_button(busy_icon)
 
+                debug_console = APP_STATE.snapshot.debug_console
                 console_clicked, debug_console = ImGui.checkbox(f"{debug_console and "Disable" or "Enable"} Debug Console", debug_console)
                 if console_clicked:
-                    utils.save_cfg_item(CONFIG_PATH, "debug_console", debug_console)
+                    APP_STATE.update(debug_console=debug_console)
+                    CONFIG.set("debug_console", debug_console)
                     if debug_console:
                         LOG.show_console()
                     else:
                         LOG.hide_console()
                 
+                ImGui.push_item_width(120)
+                pacing_changed, pacing_index = ImGui.combo(
+                    "Frame Pacing", FramePacer.MODES.index(pacer.mode), list(FramePacer.MODES)
+                )
+                ImGui.pop_item_width()
+                if pacing_changed:
+                    pacer.set_mode(FramePacer.MODES[pacing_index])
+                    render_loop.reference_fps = pacer.target_fps
+                    CONFIG.set("frame_pacing", pacer.mode)
+                    latency.clear()
+
+                if ImGui.button("Run CPU-Heavy Task"):
+                    run_process_task()
+
                 if ImGui.button("Run a dummy task and quit"):
                     run_dummy_exit_func()
 
+                if ImGui.button("Show Notification"):
+                    gui.toast(f"Hello from {APP_NAME}!")
+
+                if ImGui.button("Check Python Version"):
+                    run_version_check()
+
+                if ImGui.button("Browse Files"):
+                    if file_browser is None:
+                        file_browser = FileBrowser(
+                            WORK_PATH if os.path.isdir(WORK_PATH) else None,
+                            on_open=lambda paths: LOG.info(f"Selected {', '.join(paths)}"),
+                            on_change=render_loop.wake,
+                        )
+                    show_file_browser = True
+
         ImGui.spacing()
         with ImGui.begin_child("##feedback", 0, 40):
-            status_col, _ = get_status_widget_color()
+            status_col, _ = get_status_widget_color(tasks, busy)
             ImGui.text_colored(
                 f"{status_col == ImGreen and "-" or busy_icon}", status_col[0], status_col[1], status_col[2], 0.8
             )
-            ImGui.push_text_wrap_pos(win_w - 15)
             with ImGui.font(small_font):
                 ImGui.same_line()
-                gui.status_text(task_status, task_status_col)
-            ImGui.pop_text_wrap_pos()
-            if progress_value > 0:
-                ImGui.progress_bar(progress_value, (380, 5))
+                gui.status_text(tasks.status, tasks.status_color, win_w - 15 - ImGui.get_cursor_pos_x(), small_font)
+            if tasks.progress > 0:
+                ImGui.progress_bar(tasks.progress, (380, 5))
 
         gui.clickable_icon(
             Icons.GitHub,
@@ -366,28 +433,57 @@ def OnDraw():
         )
 
         ImGui.pop_font()
-        ImGui.pop_style_var(5)
-        ImGui.pop_style_color(12)
+        DRAW_STATS.mark_window("Main Window")
         ImGui.end()
 
+        if show_file_browser:
+            ImGui.set_next_window_size(440, 320, ImGui.FIRST_USE_EVER)
+            expanded, show_file_browser = ImGui.begin("Files", closable=True)
+            if expanded:
+                with ImGui.font(small_font):
+                    file_browser.draw()
+            ImGui.end()
+        NOTIFICATIONS.draw(small_font)
+        PROFILER.draw_overlay(small_font)
+        PROFILER.end_scope()
+
         gui.gl.glClearColor(1.0, 1.0, 1.0, 1)
         gui.gl.glClear(gui.gl.GL_COLOR_BUFFER_BIT)
-        ImGui.render()
-        impl.render(ImGui.get_draw_data())
-        gui.glfw.swap_buffers(window)
-
-    if status_col != ImGreen:
-        threadpool.shutdown()
+        with PROFILER.scope("imgui_render"):
+            ImGui.render()
+        DRAW_STATS.collect()
+        with PROFILER.scope("impl_render"):
+            impl.render(ImGui.get_draw_data())
+        with PROFILER.scope("pacing"):
+            pacer.before_swap()
+        with PROFILER.scope("swap_buffers"):
+            gui.glfw.swap_buffers(window)
+        latency.frame_presented()
+        gui.TEXTURE_CACHE.next_frame()
+        PROFILER.end_frame()
+        if not STARTUP.finished:
+            startup_report = STARTUP.finish()
+            if startup_report:
+                LOG.info(startup_report)
+
+    LOG.debug(f"Render loop stats: {render_loop.stats()}")
+    LOG.debug(f"Frame pacing: {pacer.stats()}\n{latency.report()}")
+    TASKS.shutdown()
+    ASYNC_LOOP.stop()
+    NOTIFICATIONS.os_backend.close()
+    if file_browser is not None:
+        file_browser.close()
     impl.shutdown()
     gui.glfw.terminate()
 
 
-@atexit.register
 def OnExit():
+    CONFIG.close()
     LOG.info(f"Closing {APP_NAME}...\n\nFarewell!")
 
 
 if __name__ == "__main__":
+    atexit.register(OnExit)
     if getattr(sys, "frozen", False):
         pyi_splash.close()
     OnDraw()
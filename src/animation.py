@@ -0,0 +1,188 @@
+import glfw
+import math
+
+
+def linear(t):
+    return t
+
+
+def ease_in_quad(t):
+    return t * t
+
+
+def ease_out_quad(t):
+    return t * (2 - t)
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_sine(t):
+    return -(math.cos(math.pi * t) - 1) / 2
+
+
+class Animator:
+    """
+    Frame clock shared by all animations. Call `tick()` once per frame before building the UI.
+
+    Animations read `now` instead of querying the time themselves and tell the animator what they need:
+
+    - `request_frame()`: something is moving continuously and the next frame should be rendered ASAP.
+
+    - `request_at(t)`: nothing changes until `t` (e.g. the next frame of an icon cycle).
+
+    Requests only live for one frame, so an animation that isn't drawn costs nothing.
+
+    Plug `needs_frame` and `next_deadline` into `RenderLoop.add_activity_source()` / `add_deadline_source()`.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.delta = 0.0
+        self._wants_frame = False
+        self._deadline = None
+
+    def tick(self, now=None):
+        if now is None:
+            now = glfw.get_time()
+        self.delta = now - self.now if self.now else 0.0
+        self.now = now
+        self._wants_frame = False
+        self._deadline = None
+
+    def request_frame(self):
+        self._wants_frame = True
+
+    def request_at(self, t):
+        if self._deadline is None or t < self._deadline:
+            self._deadline = t
+
+    def needs_frame(self) -> bool:
+        return self._wants_frame
+
+    def next_deadline(self):
+        return self._deadline
+
+
+ANIMATOR = Animator()
+
+
+class Tween:
+    """
+    Interpolates from `start` to `end` over `duration` seconds.
+
+    - Example:
+        ```
+        slide = Tween(0, 200, 0.3, ease_out_cubic)
+        slide.play()
+        ...
+        imgui.set_cursor_pos_x(slide.value)
+        ```
+    """
+
+    def __init__(self, start=0.0, end=1.0, duration=0.25, easing=ease_in_out_quad, animator=ANIMATOR):
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+        self.animator = animator
+        self._started_at = None
+
+    @property
+    def running(self) -> bool:
+        return self._started_at is not None and self.animator.now - self._started_at < self.duration
+
+    def play(self, start=None, end=None):
+        if start is not None:
+            self.start = start
+        if end is not None:
+            self.end = end
+        self._started_at = self.animator.now
+        self.animator.request_frame()
+
+    def finish(self):
+        """
+        Jumps to the end: `value` is `end` from now on.
+        """
+
+        self._started_at = None
+        self.start = self.end
+
+    @property
+    def value(self):
+        if self._started_at is None:
+            return self.end if self.duration <= 0 else self.start
+
+        t = (self.animator.now - self._started_at) / self.duration if self.duration > 0 else 1.0
+        if t >= 1.0:
+            self._started_at = None
+            self.start = self.end
+            return self.end
+
+        self.animator.request_frame()
+        return self.start + (self.end - self.start) * self.easing(t)
+
+
+class Fade(Tween):
+    """
+    Alpha tween between 0 and 1 that can be reversed halfway without jumping.
+    """
+
+    def __init__(self, duration=0.2, easing=ease_in_out_sine, visible=False, animator=ANIMATOR):
+        alpha = 1.0 if visible else 0.0
+        super().__init__(alpha, alpha, duration, easing, animator)
+
+    def fade_in(self):
+        if self.end != 1.0:
+            self.play(self.value, 1.0)
+
+    def fade_out(self):
+        if self.end != 0.0:
+            self.play(self.value, 0.0)
+
+    @property
+    def alpha(self) -> float:
+        return self.value
+
+    @property
+    def visible(self) -> bool:
+        return self.value > 0.0
+
+
+class IconCycle:
+    """
+    Cycles through `frames` every `interval` seconds, e.g. the hourglass icons of a busy indicator.
+
+    Reading `current` only schedules a frame for the next icon change, not every frame.
+    """
+
+    def __init__(self, frames, interval=0.1, animator=ANIMATOR):
+        self.frames = tuple(frames)
+        self.interval = interval
+        self.animator = animator
+
+    @property
+    def current(self):
+        step = int(self.animator.now / self.interval)
+        self.animator.request_at((step + 1) * self.interval)
+        return self.frames[step % len(self.frames)]
+
+
+class Spinner:
+    """
+    Continuous rotation angle (radians) at `speed` turns per second for drawn spinners.
+    """
+
+    def __init__(self, speed=1.0, animator=ANIMATOR):
+        self.speed = speed
+        self.animator = animator
+
+    @property
+    def angle(self) -> float:
+        self.animator.request_frame()
+        return (self.animator.now * self.speed % 1.0) * math.tau
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+
+from collections import deque
+
+
+class AsyncLoop:
+    """
+    Runs an asyncio event loop on a background thread, next to the GLFW render loop.
+
+    - Coroutines can await timers, file I/O (`read_file()`, `asyncio.to_thread()`) and subprocesses (`run_command()`).
+
+        A waiting coroutine doesn't hold a thread, so thousands of concurrent waits cost next to nothing.
+
+    - `run(coro)` and `submit(name, fn, *args)` are safe to call from any thread. `submit` works like
+
+        `TaskManager.submit`: while a job with the same name is running it returns that job's future, or cancels it and
+
+        starts over with `replace=True`.
+
+    - Results are delivered on the render thread: `on_done(result)` / `on_error(exception)` callbacks and functions
+
+        queued with `call_soon_ui()` run in `pump()`, so they can touch UI state directly. Call `pump()` once per frame.
+
+    - The loop thread sleeps until its nearest timer or I/O event, and the render thread is only woken (`on_change`)
+
+        when something was delivered, so pending timers never cost idle frames.
+
+    - Example:
+        ```
+        async def fetch_version():
+            code, out, _ = await run_command(sys.executable, "--version")
+            return out.decode().strip()
+
+        ASYNC_LOOP.on_change = render_loop.wake
+        ASYNC_LOOP.run(fetch_version(), on_done=lambda version: LOG.info(version))
+        while ...:
+            render_loop.wait()
+            ASYNC_LOOP.pump()
+        ```
+    """
+
+    def __init__(self, on_change=None, on_error=None):
+        self.on_change = on_change
+        self.on_error = on_error
+        self.loop = None
+        self._thread = None
+        self._started = threading.Event()
+        # Reentrant: cancelling a job runs its done callbacks (`_forget`) right away, on the cancelling thread.
+        self._lock = threading.RLock()
+        self._jobs = {}
+        self._ui_lock = threading.Lock()
+        self._ui_calls = deque()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="AsyncLoop", daemon=True)
+            self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        # `new_event_loop()` uses the Proactor loop on Windows, which is the one that supports subprocesses.
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._started.set()
+        try:
+            self.loop.run_forever()
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        finally:
+            self.loop.close()
+
+    def run(self, coro, on_done=None, on_error=None):
+        """
+        Schedules `coro` on the loop. Returns a `concurrent.futures.Future`.
+
+        Errors go to `on_error`, or the loop's `on_error(exception)`, or get printed. Cancelled coroutines report nothing.
+        """
+
+        if self._thread is None:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(lambda f: self._deliver(f, on_done, on_error))
+        return future
+
+    def submit(self, name: str, fn, *args, replace=False, on_done=None, on_error=None, **kwargs):
+        """
+        Runs `fn(*args, **kwargs)` (a coroutine function) as the job `name`.
+        """
+
+        with self._lock:
+            existing = self._jobs.get(name)
+            if existing is not None and not existing.done():
+                if not replace:
+                    return existing
+                existing.cancel()
+            future = self.run(fn(*args, **kwargs), on_done, on_error)
+            self._jobs[name] = future
+        future.add_done_callback(lambda f: self._forget(name, f))
+        return future
+
+    def _forget(self, name, future):
+        with self._lock:
+            if self._jobs.get(name) is future:
+                del self._jobs[name]
+
+    def is_active(self, name: str) -> bool:
+        future = self._jobs.get(name)
+        return future is not None and not future.done()
+
+    def cancel(self, name: str):
+        future = self._jobs.get(name)
+        if future is not None:
+            future.cancel()
+
+    def _deliver(self, future, on_done, on_error):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_done:
+                self.call_soon_ui(on_done, future.result())
+        elif on_error or self.on_error:
+            self.call_soon_ui(on_error or self.on_error, error)
+        else:
+            print(f"[AsyncLoop] Unhandled error: {error!r}")
+
+    def call_soon_ui(self, fn, *args):
+        """
+        Queues `fn(*args)` for the next `pump()` and wakes the render loop. Safe from any thread.
+        """
+
+        # One wake per batch: if the queue isn't empty, the next `pump()` is already due. The lock keeps `pump()` from
+        # taking the queue between the check and the append.
+        with self._ui_lock:
+            wake = not self._ui_calls
+            self._ui_calls.append((fn, args))
+        if wake and self.on_change:
+            self.on_change()
+
+    def pump(self) -> int:
+        """
+        Runs the queued UI callbacks on the calling (render) thread. Returns how many ran.
+        """
+
+        with self._ui_lock:
+            calls, self._ui_calls = self._ui_calls, deque()
+        for fn, args in calls:
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"[AsyncLoop] UI callback failed: {e!r}")
+        return len(calls)
+
+    def stop(self, timeout=2.0):
+        """
+        Cancels everything still running and stops the loop thread.
+        """
+
+        if self.running:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+
+
+async def read_file(path: str, mode="rb"):
+    """
+    Reads a whole file without blocking the loop (on the loop's default executor).
+    """
+
+    def read():
+        with open(path, mode) as f:
+            return f.read()
+
+    return await asyncio.to_thread(read)
+
+
+async def run_command(*cmd, timeout=None) -> tuple:
+    """
+    Runs a subprocess and returns `(returncode, stdout, stderr)`. The process is killed if it takes longer than
+
+    `timeout` seconds (raising `TimeoutError`) or the coroutine is cancelled.
+    """
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.CancelledError, TimeoutError):
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    return process.returncode, stdout, stderr
+
+
+ASYNC_LOOP = AsyncLoop()
@@ -0,0 +1,256 @@
+import numpy as np
+import OpenGL.GL as gl
+
+from src.textures import decode_image
+
+
+class AtlasRegion:
+    """
+    A packed image inside a `TextureAtlas` page.
+
+    The fields are updated in place when the atlas gets repacked, so it's safe to keep a reference.
+
+    - Example:
+        ```
+        region = atlas.add("avatar", "avatar.png")
+        image_rounded(region.texture_id, 64, region.uv_a, region.uv_b)
+        ```
+    """
+
+    __slots__ = ("key", "texture_id", "x", "y", "width", "height", "uv_a", "uv_b", "_img")
+
+    def __init__(self, key, img):
+        self.key = key
+        self.width = img.shape[1]
+        self.height = img.shape[0]
+        self.texture_id = 0
+        self.x = 0
+        self.y = 0
+        self.uv_a = (0.0, 0.0)
+        self.uv_b = (0.0, 0.0)
+        self._img = img
+
+
+class _SkylinePacker:
+    """
+    Bottom-left skyline rectangle packer. Each node is `[x, y, width]` of a horizontal segment.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.reset()
+
+    def reset(self):
+        self.skyline = [[0, 0, self.width]]
+        self.used_area = 0
+
+    def _fit(self, index, w, h):
+        x = self.skyline[index][0]
+        if x + w > self.width:
+            return -1
+
+        y = 0
+        remaining = w
+        i = index
+        while remaining > 0:
+            y = max(y, self.skyline[i][1])
+            if y + h > self.height:
+                return -1
+            remaining -= self.skyline[i][2]
+            i += 1
+        return y
+
+    def insert(self, w, h):
+        best_index = -1
+        best_top = self.height + 1
+        best_width = self.width + 1
+        best_x = best_y = 0
+
+        for i, (x, _, node_w) in enumerate(self.skyline):
+            y = self._fit(i, w, h)
+            if y < 0:
+                continue
+            if y + h < best_top or (y + h == best_top and node_w < best_width):
+                best_index, best_top, best_width = i, y + h, node_w
+                best_x, best_y = x, y
+
+        if best_index < 0:
+            return None
+
+        self.skyline.insert(best_index, [best_x, best_y + h, w])
+        i = best_index + 1
+        while i < len(self.skyline):
+            node = self.skyline[i]
+            prev = self.skyline[i - 1]
+            overlap = prev[0] + prev[2] - node[0]
+            if overlap <= 0:
+                break
+            node[0] += overlap
+            node[2] -= overlap
+            if node[2] > 0:
+                break
+            del self.skyline[i]
+
+        i = 0
+        while i < len(self.skyline) - 1:
+            if self.skyline[i][1] == self.skyline[i + 1][1]:
+                self.skyline[i][2] += self.skyline[i + 1][2]
+                del self.skyline[i + 1]
+            else:
+                i += 1
+
+        self.used_area += w * h
+        return best_x, best_y
+
+
+class _AtlasPage:
+    def __init__(self, size):
+        self.size = size
+        self.packer = _SkylinePacker(size, size)
+        self.texture = gl.glGenTextures(1)
+        self.clear()
+
+    def clear(self):
+        self.packer.reset()
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        gl.glTexImage2D(
+            gl.GL_TEXTURE_2D,
+            0,
+            gl.GL_RGBA,
+            self.size,
+            self.size,
+            0,
+            gl.GL_RGBA,
+            gl.GL_UNSIGNED_BYTE,
+            np.zeros((self.size, self.size, 4), dtype=np.uint8),
+        )
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+
+    def place(self, region: AtlasRegion, padding):
+        pos = self.packer.insert(region.width + padding * 2, region.height + padding * 2)
+        if pos is None:
+            return False
+
+        x, y = pos[0] + padding, pos[1] + padding
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        gl.glTexSubImage2D(
+            gl.GL_TEXTURE_2D,
+            0,
+            x,
+            y,
+            region.width,
+            region.height,
+            gl.GL_RGBA,
+            gl.GL_UNSIGNED_BYTE,
+            region._img,
+        )
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+
+        region.texture_id = self.texture
+        region.x, region.y = x, y
+        region.uv_a = (x / self.size, y / self.size)
+        region.uv_b = ((x + region.width) / self.size, (y + region.height) / self.size)
+        return True
+
+    def delete(self):
+        gl.glDeleteTextures([self.texture])
+
+
+class TextureAtlas:
+    """
+    Packs many small images (icons, thumbnails...) into a few large textures so ImGui can batch
+
+    them into a single draw command instead of binding one texture per image.
+
+    - `add(key, image)` packs incrementally into the first page with room and opens a new page when
+
+        all of them are full. `image` can be a file path or an RGBA `uint8` array.
+
+    - `remove(key)` drops an image. Its space is reclaimed on the next `repack()`, which rebuilds all
+
+        pages from the CPU copies, tallest images first, for a tighter fit.
+
+    Must be used from the thread that owns the OpenGL context.
+    """
+
+    def __init__(self, page_size=1024, padding=1):
+        self.page_size = page_size
+        self.padding = padding
+        self._pages: list[_AtlasPage] = []
+        self._regions: dict[str, AtlasRegion] = {}
+
+    def __contains__(self, key):
+        return key in self._regions
+
+    def __len__(self):
+        return len(self._regions)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    @property
+    def occupancy(self) -> float:
+        if not self._pages:
+            return 0.0
+        used = sum(page.packer.used_area for page in self._pages)
+        return used / (len(self._pages) * self.page_size**2)
+
+    def get(self, key) -> AtlasRegion | None:
+        return self._regions.get(key)
+
+    def _place(self, region: AtlasRegion):
+        for page in self._pages:
+            if page.place(region, self.padding):
+                return True
+
+        page = _AtlasPage(self.page_size)
+        self._pages.append(page)
+        return page.place(region, self.padding)
+
+    def add(self, key, image) -> AtlasRegion | None:
+        if key in self._regions:
+            return self._regions[key]
+
+        img = decode_image(image) if isinstance(image, str) else image
+        if img is None:
+            print(f"Error loading image: {image}")
+            return None
+
+        if max(img.shape[:2]) + self.padding * 2 > self.page_size:
+            print(f"Image is too large for a {self.page_size}px atlas page: {key}")
+            return None
+
+        region = AtlasRegion(key, np.ascontiguousarray(img, dtype=np.uint8))
+        self._place(region)
+        self._regions[key] = region
+        return region
+
+    def remove(self, key):
+        region = self._regions.pop(key, None)
+        if region is not None:
+            region.texture_id = 0
+
+    def repack(self):
+        regions = sorted(
+            self._regions.values(), key=lambda r: (r.height, r.width), reverse=True
+        )
+        for page in self._pages:
+            page.clear()
+
+        for region in regions:
+            self._place(region)
+
+        while self._pages and self._pages[-1].packer.used_area == 0:
+            self._pages.pop().delete()
+
+    def clear(self):
+        for page in self._pages:
+            page.delete()
+        self._pages.clear()
+        self._regions.clear()
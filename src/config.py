@@ -0,0 +1,133 @@
+import threading
+
+from src.logger import get_logger
+from src.utils import read_cfg, save_cfg
+
+
+def _check_type(key, value, expected):
+    # `bool` is a subclass of `int`, but a checkbox value in an integer setting is a mistake.
+    if isinstance(value, bool) and not isinstance(expected, bool):
+        valid = False
+    elif isinstance(expected, float) and isinstance(value, int):
+        return float(value)
+    else:
+        valid = isinstance(value, type(expected))
+    if not valid:
+        raise TypeError(f'Config key "{key}" expects {type(expected).__name__}, got {type(value).__name__}.')
+    return value
+
+
+class ConfigStore:
+    """
+    Settings loaded once into memory with write-behind persistence.
+
+    - `get()` / `set()` never touch the disk. `set()` only marks the store dirty; a background thread
+
+        writes it `debounce` seconds after the last change (atomically, through a temp file and a rename),
+
+        so dragging a slider bound to a setting results in a single write.
+
+    - Values of keys present in `defaults` must keep the default's type, otherwise `set()` raises `TypeError`.
+
+        An `int` is accepted (and stored as a `float`) for a `float` default, a `bool` only for a `bool` default.
+
+    - A failed write (disk full, permissions, a file locked by an antivirus...) is logged and retried with backoff
+
+        (up to `max_retry_delay` seconds apart); the store stays dirty until a write succeeds.
+
+    - Call `close()` on exit to flush pending changes.
+    """
+
+    def __init__(self, path: str, defaults: dict = None, debounce=1.0, max_retry_delay=60.0):
+        self.path = path
+        self.defaults = dict(defaults or {})
+        self.debounce = debounce
+        self.max_retry_delay = max_retry_delay
+        self._data: dict = read_cfg(path) or {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._closed = False
+        self._version = 0
+        self._saved_version = 0
+        self._thread = threading.Thread(target=self._writer, name="ConfigWriter", daemon=True)
+        self._thread.start()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        if key in self._data:
+            return self._data[key]
+        if default is not None:
+            return default
+        return self.defaults.get(key)
+
+    def set(self, key, value):
+        expected = self.defaults.get(key)
+        if expected is not None:
+            value = _check_type(key, value, expected)
+
+        with self._lock:
+            if key in self._data and self._data[key] == value:
+                return
+            self._data[key] = value
+            self._version += 1
+        self._dirty.set()
+
+    def apply_defaults(self, prune=True):
+        """
+        Adds missing default keys and, if `prune` is set, removes keys that aren't in `defaults`.
+
+        Returns `(added, removed)` key lists.
+        """
+
+        with self._lock:
+            added = [key for key in self.defaults if key not in self._data]
+            removed = [key for key in self._data if key not in self.defaults] if prune else []
+            for key in added:
+                self._data[key] = self.defaults[key]
+            for key in removed:
+                del self._data[key]
+            if added or removed:
+                self._version += 1
+                self._dirty.set()
+        return added, removed
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                if self._version == self._saved_version:
+                    return
+                snapshot = dict(self._data)
+                version = self._version
+            save_cfg(self.path, snapshot)
+            self._saved_version = version
+
+    def _try_flush(self) -> bool:
+        try:
+            self.flush()
+            return True
+        except Exception as e:
+            get_logger().error(f"Failed to save {self.path}: {e}")
+            return False
+
+    def _writer(self):
+        retry_delay = 0.0
+        while not self._closed:
+            # After a failed write, try again once the delay is up even if nothing changed since.
+            self._dirty.wait(retry_delay or None)
+            self._dirty.clear()
+            # Keep waiting while changes are still coming in.
+            while not self._closed and self._dirty.wait(self.debounce):
+                self._dirty.clear()
+            if self._try_flush():
+                retry_delay = 0.0
+            else:
+                retry_delay = min(max(retry_delay * 2, self.debounce, 1.0), self.max_retry_delay)
+
+    def close(self):
+        self._closed = True
+        self._dirty.set()
+        self._thread.join(timeout=self.debounce + 1)
+        self._try_flush()
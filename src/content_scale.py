@@ -0,0 +1,192 @@
+import glfw
+import imgui
+import numpy as np
+import OpenGL.GL as gl
+
+from collections import OrderedDict
+from src.fonts import FontAtlas
+from src.textures import upload_texture
+from src.theme import ThemeManager
+
+
+def _round_scale(scale: float) -> float:
+    # Content scales are fractions like 1.25 or 1.5; rounding keeps float noise from creating new cache entries.
+    return round(scale * 4) / 4 or 1.0
+
+
+class ContentScaleManager:
+    """
+    Keeps the font atlas and the style sizes in step with the window's DPI when it moves between monitors.
+
+    - GLFW's content scale and framebuffer size callbacks only record the new scale. The atlas is rebuilt in `update()`,
+
+        between frames, once the scale has been stable for `debounce` seconds, so dragging a window across monitors
+
+        rebuilds once instead of on every callback.
+
+    - The uploaded atlas texture of the last `cache_size` scales is kept, so moving back to a monitor only re-runs the
+
+        atlas build (~5 ms, ImGui has no way to restore glyph metrics) and skips the texture upload.
+
+    - `raster_scale` is the framebuffer to window factor (fonts are rasterized at that many pixels per unit and drawn
+
+        at `1 / raster_scale`). `ui_scale` is the monitor's content scale divided by `raster_scale`, so it's the
+
+        content scale where the framebuffer matches the window (Windows, X11) and 1 where the platform already scales
+
+        the window (macOS, Wayland). Fonts are enlarged by `ui_scale`, and so are the style sizes when a `theme` is
+
+        given. `follow_content_scale=False` keeps `ui_scale` at 1.
+
+    Build the fonts and scale the theme at the measured scales before creating the renderer, then call `update()`
+
+    before `imgui.new_frame()`:
+
+    - Example:
+        ```
+        SCALE = ContentScaleManager(window, FONTS, theme=THEME, on_change=render_loop.wake)
+        FONTS.build(imgui.get_io(), SCALE.raster_scale, SCALE.ui_scale)
+        THEME.set_scale(SCALE.ui_scale)
+        impl = GlfwRenderer(window)
+        render_loop.add_deadline_source(SCALE.next_deadline)
+        ...
+        if SCALE.update():
+            title_font = FONTS["title"]
+        ```
+    """
+
+    def __init__(
+        self,
+        window,
+        fonts: FontAtlas,
+        theme: ThemeManager = None,
+        debounce=0.2,
+        cache_size=3,
+        follow_content_scale=True,
+        on_change=None,
+    ):
+        self.window = window
+        self.fonts = fonts
+        self.theme = theme
+        self.debounce = debounce
+        self.cache_size = cache_size
+        self.follow_content_scale = follow_content_scale
+        self.on_change = on_change
+        self.rebuilds = 0
+        self._textures = OrderedDict()
+        self._renderer_texture = None
+        self._pending = None
+        self._changed_at = 0.0
+        self._callbacks = []
+        self.raster_scale = self.ui_scale = 1.0
+        self.raster_scale, self.ui_scale = self._measure()
+
+        self._chain_callback(glfw.set_window_content_scale_callback)
+        self._chain_callback(glfw.set_framebuffer_size_callback)
+
+    def _chain_callback(self, setter):
+        previous = setter(self.window, None)
+
+        def callback(*args):
+            self._on_scale_event()
+            if previous:
+                previous(*args)
+
+        self._callbacks.append(callback)
+        setter(self.window, callback)
+
+    def _measure(self) -> tuple:
+        win_w, win_h = glfw.get_window_size(self.window)
+        fb_w, fb_h = glfw.get_framebuffer_size(self.window)
+        if not win_w or not win_h or not fb_w or not fb_h:
+            # Minimized windows report a 0x0 framebuffer; keep what we have.
+            return self.raster_scale, self.ui_scale
+
+        raster_scale = _round_scale(max(fb_w / win_w, fb_h / win_h))
+        ui_scale = 1.0
+        if self.follow_content_scale:
+            scale_x, scale_y = glfw.get_window_content_scale(self.window)
+            ui_scale = _round_scale(max(scale_x, scale_y) / raster_scale)
+        return raster_scale, ui_scale
+
+    def _on_scale_event(self):
+        scales = self._measure()
+        if scales == (self.raster_scale, self.ui_scale) and self._pending is None:
+            return
+        self._pending = scales
+        self._changed_at = glfw.get_time()
+        if self.on_change:
+            self.on_change()
+
+    def next_deadline(self):
+        """
+        When the pending rebuild is due, for `RenderLoop.add_deadline_source()`.
+        """
+
+        if self._pending is None:
+            return None
+        return self._changed_at + self.debounce
+
+    def update(self, now=None) -> bool:
+        """
+        Applies a pending scale change. Returns `True` if the fonts were rebuilt (font objects must be fetched again).
+        """
+
+        if self._pending is None:
+            return False
+        if now is None:
+            now = glfw.get_time()
+        if now - self._changed_at < self.debounce:
+            return False
+
+        scales, self._pending = self._pending, None
+        if scales == (self.raster_scale, self.ui_scale):
+            return False
+        self.apply(*scales)
+        return True
+
+    def apply(self, raster_scale: float, ui_scale: float = 1.0):
+        """
+        Rebuilds the fonts for the given scales, swaps in the matching atlas texture and rescales the theme.
+
+        Call it between frames.
+        """
+
+        io = imgui.get_io()
+        if self._renderer_texture is None:
+            # The renderer owns (and deletes) the texture it uploaded at startup.
+            self._renderer_texture = io.fonts.texture_id
+        self._textures.setdefault((self.raster_scale, self.ui_scale), io.fonts.texture_id)
+
+        self.fonts.build(io, raster_scale, ui_scale)
+        self.raster_scale, self.ui_scale = raster_scale, ui_scale
+        self.rebuilds += 1
+
+        key = (raster_scale, ui_scale)
+        texture = self._textures.pop(key, None)
+        if texture is None:
+            width, height, pixels = io.fonts.get_tex_data_as_rgba32()
+            texture, _, _ = upload_texture(np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4))
+        self._textures[key] = texture
+        io.fonts.texture_id = texture
+        io.fonts.clear_tex_data()
+        self._trim()
+        if self.theme:
+            self.theme.set_scale(ui_scale)
+
+    def _trim(self):
+        while len(self._textures) > self.cache_size:
+            _, texture = self._textures.popitem(last=False)
+            if texture and texture != self._renderer_texture:
+                gl.glDeleteTextures([texture])
+
+    def clear(self):
+        """
+        Deletes the cached atlas textures except the one in use.
+        """
+
+        current = (self.raster_scale, self.ui_scale)
+        for key in [key for key in self._textures if key != current]:
+            texture = self._textures.pop(key)
+            if texture and texture != self._renderer_texture:
+                gl.glDeleteTextures([texture])
@@ -0,0 +1,171 @@
+import imgui
+
+from collections import deque
+from typing import NamedTuple
+
+
+class DrawStats(NamedTuple):
+    cmd_lists: int = 0
+    commands: int = 0
+    vertices: int = 0
+    indices: int = 0
+    texture_switches: int = 0
+
+    def __add__(self, other):
+        return DrawStats(*(a + b for a, b in zip(self, other)))
+
+
+def _measure_lists(draw_lists) -> DrawStats:
+    lists = commands = vertices = indices = switches = 0
+    texture = None
+    for draw_list in draw_lists:
+        lists += 1
+        vertices += draw_list.vtx_buffer_size
+        indices += draw_list.idx_buffer_size
+        for cmd in draw_list.commands:
+            if not cmd.elem_count:
+                continue
+            commands += 1
+            if cmd.texture_id != texture:
+                if texture is not None:
+                    switches += 1
+                texture = cmd.texture_id
+    return DrawStats(lists, commands, vertices, indices, switches)
+
+
+def measure(draw_data=None) -> DrawStats:
+    """
+    Counts what `draw_data` (by default `imgui.get_draw_data()`, so call it after `imgui.render()`) will cost the renderer.
+
+    A texture switch is a command whose texture differs from the previous command's, across command lists.
+    """
+
+    if draw_data is None:
+        draw_data = imgui.get_draw_data()
+    if draw_data is None or not draw_data.valid:
+        return DrawStats()
+    return _measure_lists(draw_data.commands_lists)
+
+
+def measure_draw_list(draw_list=None) -> DrawStats:
+    """
+    Same as `measure()` for a single draw list, by default the current window's.
+    """
+
+    return _measure_lists([draw_list if draw_list is not None else imgui.get_window_draw_list()])
+
+
+class DrawBudget:
+    """
+    Upper limits for a frame's (or a window's) `DrawStats`. `None` means no limit.
+
+    - Example:
+        ```
+        DrawBudget(commands=20, vertices=5000).assert_within(DRAW_STATS.window("Main Window"), "Main Window")
+        ```
+    """
+
+    def __init__(self, cmd_lists=None, commands=None, vertices=None, indices=None, texture_switches=None):
+        self.limits = {
+            field: limit
+            for field, limit in zip(DrawStats._fields, (cmd_lists, commands, vertices, indices, texture_switches))
+            if limit is not None
+        }
+
+    def violations(self, stats: DrawStats) -> list:
+        """
+        Returns `(field, value, limit)` for every limit `stats` exceeds.
+        """
+
+        return [
+            (field, getattr(stats, field), limit)
+            for field, limit in self.limits.items()
+            if getattr(stats, field) > limit
+        ]
+
+    def assert_within(self, stats: DrawStats, label="frame"):
+        violations = self.violations(stats)
+        if violations:
+            details = ", ".join(f"{field} {value} > {limit}" for field, value, limit in violations)
+            raise AssertionError(f"Draw budget exceeded for {label}: {details}")
+
+
+class DrawStatsCollector:
+    """
+    Keeps the `DrawStats` of the last `capacity` frames.
+
+    - Call `collect()` once per frame after `imgui.render()`.
+
+    - Call `mark_window(name)` right before `imgui.end()` to also record the stats of that window's own draw list
+
+        (child windows have their own lists and need their own mark).
+
+    - Budgets set with `set_budget()` are checked in `collect()`; violations of the last frame are in `violations`.
+
+        With `strict=True` they raise `AssertionError` instead, which is what tests want.
+    """
+
+    def __init__(self, capacity=600, strict=False):
+        self.frames = deque(maxlen=capacity)
+        self.strict = strict
+        self.last = DrawStats()
+        self.violations = []
+        self._windows = {}
+        self._pending_windows = {}
+        self._budgets = {}
+
+    def mark_window(self, name: str):
+        self._pending_windows[name] = measure_draw_list()
+
+    def window(self, name: str) -> DrawStats:
+        """
+        Returns the stats of the window marked as `name` during the last collected frame.
+        """
+
+        return self._windows.get(name, DrawStats())
+
+    def set_budget(self, budget: DrawBudget | None, window: str = None):
+        """
+        Sets the budget for the whole frame or, with `window`, for a marked window. `None` removes it.
+        """
+
+        if budget is None:
+            self._budgets.pop(window, None)
+        else:
+            self._budgets[window] = budget
+
+    def collect(self, draw_data=None) -> DrawStats:
+        self.last = measure(draw_data)
+        self.frames.append(self.last)
+        self._windows, self._pending_windows = self._pending_windows, {}
+
+        self.violations = []
+        for window, budget in self._budgets.items():
+            stats = self.last if window is None else self.window(window)
+            for field, value, limit in budget.violations(stats):
+                self.violations.append((window or "frame", field, value, limit))
+        if self.strict and self.violations:
+            details = ", ".join(f"{label}: {field} {value} > {limit}" for label, field, value, limit in self.violations)
+            raise AssertionError(f"Draw budget exceeded: {details}")
+        return self.last
+
+    def peak(self) -> DrawStats:
+        if not self.frames:
+            return DrawStats()
+        return DrawStats(*(max(values) for values in zip(*self.frames)))
+
+    def draw_overlay_section(self):
+        """
+        Draws the last frame's numbers. Register it with `PROFILER.add_overlay_section()`.
+        """
+
+        last = self.last
+        peak = self.peak()
+        imgui.text(f"lists {last.cmd_lists}  cmds {last.commands} (peak {peak.commands})")
+        imgui.text(f"vtx {last.vertices} (peak {peak.vertices})  idx {last.indices}")
+        imgui.text(f"texture switches {last.texture_switches}")
+        for label, field, value, limit in self.violations:
+            imgui.text_colored(f"{label}: {field} {value} > {limit}", 1.0, 0.3, 0.3, 1.0)
+
+
+DRAW_STATS = DrawStatsCollector()
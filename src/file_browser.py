@@ -0,0 +1,323 @@
+import imgui
+import os
+import threading
+
+from collections import OrderedDict
+from itertools import compress
+from time import localtime, perf_counter, strftime
+from typing import NamedTuple
+from src.gui import begin_disabled
+from src.tasks import TaskManager
+from src.virtual_list import Column, VirtualTable
+
+
+class FileEntry(NamedTuple):
+    name: str
+    path: str
+    is_dir: bool
+    size: int
+    mtime: float
+    lower: str
+    ext: str
+
+
+class _Listing:
+    """
+    Entries of one directory. `entries` only ever grows while the scan runs, so the UI can read it without locking.
+
+    `names` (the lowercase names, for filtering) is set together with the final sorted `entries` once `complete`.
+    """
+
+    def __init__(self, path, mtime_ns):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.entries = []
+        self.names = None
+        self.complete = False
+        self.error = None
+        self.scan_time = 0.0
+
+
+def _format_size(size: int) -> str:
+    if size < 0:
+        return ""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def _format_mtime(mtime: float) -> str:
+    return strftime("%Y-%m-%d %H:%M", localtime(mtime)) if mtime else ""
+
+
+def _default_order(entry: FileEntry):
+    return not entry.is_dir, entry.lower
+
+
+class FileBrowser:
+    """
+    In-app file browser that works on every platform and never blocks the render loop.
+
+    - Directories are read with `os.scandir` on a worker thread and entries show up in batches while the scan runs.
+
+    - Listings are cached (up to `cache_size` directories) and reused as long as the directory's mtime doesn't change.
+
+    - The name filter and `extensions` match against lowercase keys computed once per entry.
+
+    - Only the visible rows are built (see `VirtualTable`), so directories with hundreds of thousands of files stay smooth.
+
+    - `on_open(paths)` is called when files are double-clicked or confirmed with the "Open" button.
+
+    - Example:
+        ```
+        browser = FileBrowser(extensions=(".png", ".jpg"), on_open=load_images, on_change=render_loop.wake)
+        ...
+        if imgui.begin("Open Image"):
+            browser.draw(height=300)
+        imgui.end()
+        ```
+    """
+
+    BATCH_SIZE = 2048
+
+    def __init__(
+        self,
+        path=None,
+        extensions=None,
+        multi_select=False,
+        on_open=None,
+        on_change=None,
+        cache_size=16,
+    ):
+        self.extensions = tuple(ext.lower() for ext in extensions) if extensions else None
+        self.on_open = on_open
+        self.on_change = on_change
+        self.cache_size = cache_size
+        self.filter = ""
+        self.listing: _Listing | None = None
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._tasks = TaskManager(max_workers=1, on_error=lambda task, e: print(f"File browser scan failed: {e}"))
+        self._shown = -1
+        self._shown_complete = False
+        self._path_input = ""
+        self._last_refresh = 0.0
+        self._candidates_source = None
+        self._candidates_count = 0
+        self._candidates_rows = []
+        self._candidates_keys = None
+        self._matched_needle = ""
+        self._matched = []
+        self.table = VirtualTable(
+            [
+                Column("Name", self._entry_label, key=lambda e: ("0" if e.is_dir else "1") + e.lower,
+                       flags=imgui.TABLE_COLUMN_DEFAULT_SORT | imgui.TABLE_COLUMN_WIDTH_STRETCH),
+                Column("Size", lambda e: -1 if e.is_dir else e.size, format=_format_size,
+                       flags=imgui.TABLE_COLUMN_WIDTH_FIXED, width=70),
+                Column("Modified", lambda e: e.mtime, format=_format_mtime,
+                       flags=imgui.TABLE_COLUMN_WIDTH_FIXED, width=110),
+            ],
+            [],
+            on_double_click=self._activate,
+            multi_select=multi_select,
+        )
+        self.open(path or os.getcwd())
+
+    @staticmethod
+    def _entry_label(entry: FileEntry) -> str:
+        return f"[{entry.name}]" if entry.is_dir else entry.name
+
+    @property
+    def path(self) -> str:
+        return self.listing.path if self.listing else ""
+
+    @property
+    def selected_paths(self) -> list:
+        rows = self.table.rows
+        return [rows[i].path for i in sorted(self.table.selected) if not rows[i].is_dir]
+
+    def open(self, path: str, refresh=False):
+        """
+        Shows `path`. Uses the cached listing unless the directory changed since it was scanned (or `refresh` is set).
+        """
+
+        path = os.path.abspath(path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError as e:
+            print(f"Can't open {path}: {e}")
+            return
+
+        with self._cache_lock:
+            listing = self._cache.get(path)
+            if listing is not None and (refresh or listing.mtime_ns != mtime_ns or listing.error):
+                listing = None
+            if listing is None:
+                listing = _Listing(path, mtime_ns)
+                self._cache[path] = listing
+                self._tasks.submit("scan", self._scan, listing, replace=True)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        self.listing = listing
+        self._path_input = path
+        self._shown = -1
+        self.table.scroll_to(0)
+
+    def up(self):
+        parent = os.path.dirname(self.path)
+        if parent and parent != self.path:
+            self.open(parent)
+
+    def refresh(self):
+        self.open(self.path, refresh=True)
+
+    def _forget(self, listing: _Listing):
+        # A partial listing must not be reused, the next `open()` scans the directory again.
+        with self._cache_lock:
+            if self._cache.get(listing.path) is listing:
+                del self._cache[listing.path]
+
+    def _scan(self, task, listing: _Listing):
+        start = perf_counter()
+        batch = []
+        try:
+            with os.scandir(listing.path) as it:
+                for entry in it:
+                    if task.cancelled:
+                        self._forget(listing)
+                        return
+                    try:
+                        is_dir = entry.is_dir()
+                        stat = entry.stat()
+                        size, mtime = stat.st_size, stat.st_mtime
+                    except OSError:
+                        is_dir, size, mtime = False, 0, 0.0
+                    lower = entry.name.lower()
+                    batch.append(
+                        FileEntry(entry.name, entry.path, is_dir, size, mtime, lower, os.path.splitext(lower)[1])
+                    )
+                    if len(batch) >= self.BATCH_SIZE:
+                        listing.entries.extend(batch)
+                        batch = []
+                        if self.on_change:
+                            self.on_change()
+        except OSError as e:
+            listing.error = str(e)
+        listing.entries.extend(batch)
+        # Sorting here keeps the default (directories first, then by name) order off the UI thread. The list is replaced,
+        # not sorted in place, because the UI may be reading it.
+        entries = sorted(listing.entries, key=_default_order)
+        listing.names = [e.lower for e in entries]
+        listing.entries = entries
+        listing.scan_time = perf_counter() - start
+        listing.complete = True
+        if self.on_change:
+            self.on_change()
+
+    def _candidates(self) -> tuple:
+        """
+        Returns the listing's entries that pass the extension filter and their lowercase names, reused until the
+        listing changes.
+        """
+
+        entries = self.listing.entries
+        count = len(entries)
+        if entries is not self._candidates_source or count != self._candidates_count:
+            rows = entries[:count]
+            if self.extensions:
+                extensions = self.extensions
+                rows = [e for e in rows if e.is_dir or e.ext in extensions]
+            self._candidates_source, self._candidates_count = entries, count
+            self._candidates_rows, self._candidates_keys = rows, None
+            self._matched_needle, self._matched = "", rows
+        if self._candidates_keys is None:
+            listing = self.listing
+            if listing.complete and not self.extensions:
+                self._candidates_keys = listing.names
+            else:
+                self._candidates_keys = [e.lower for e in self._candidates_rows]
+        return self._candidates_rows, self._candidates_keys
+
+    def _matches(self) -> list:
+        needle = self.filter.lower()
+        rows, keys = self._candidates()
+        if not needle:
+            return rows
+        if self._matched_needle and self._matched_needle in needle:
+            # Typing narrows the previous result, no need to go through the whole directory again.
+            matched = [e for e in self._matched if needle in e.lower]
+        else:
+            matched = list(compress(rows, [needle in key for key in keys]))
+        self._matched_needle, self._matched = needle, matched
+        return matched
+
+    def _update_rows(self, force=False):
+        listing = self.listing
+        count = len(listing.entries)
+        complete = listing.complete
+        if not force and count == self._shown and complete == self._shown_complete:
+            return
+        # While the scan is running, refresh at most every 100 ms and skip sorting until it's done.
+        now = perf_counter()
+        if not force and not complete and self._shown >= 0 and now - self._last_refresh < 0.1:
+            return
+        self._last_refresh = now
+        self._shown = count
+        self._shown_complete = complete
+        # Complete listings are already in the default order, only other sorts have to be applied here.
+        presorted = self.table.sort_specs in ((), ((0, False),))
+        self.table.set_rows(self._matches(), keep_sort=complete and not presorted, keep_selection=True)
+
+    def _activate(self, index, entry: FileEntry):
+        if entry.is_dir:
+            self.open(entry.path)
+        elif self.on_open:
+            self.on_open([entry.path])
+
+    def draw(self, width=0, height=0):
+        if self.listing is None:
+            return
+
+        if imgui.arrow_button("##up", imgui.DIRECTION_UP):
+            self.up()
+        imgui.same_line()
+        imgui.push_item_width(-60)
+        entered, self._path_input = imgui.input_text(
+            "##path", self._path_input, flags=imgui.INPUT_TEXT_ENTER_RETURNS_TRUE
+        )
+        imgui.pop_item_width()
+        if entered:
+            self.open(self._path_input)
+        imgui.same_line()
+        if imgui.button("Refresh"):
+            self.refresh()
+
+        imgui.push_item_width(-160)
+        filter_changed, self.filter = imgui.input_text_with_hint("##filter", "Filter", self.filter)
+        imgui.pop_item_width()
+        imgui.same_line()
+        listing = self.listing
+        if listing.error:
+            imgui.text_colored(listing.error[:40], 1.0, 0.3, 0.3, 1.0)
+        else:
+            state = "" if listing.complete else " (scanning...)"
+            imgui.text(f"{len(listing.entries):,} items{state}")
+
+        self._update_rows(force=filter_changed)
+        # The path and filter rows are already drawn, leave room for the "Open" button (negative heights fill the window).
+        footer = imgui.get_frame_height_with_spacing()
+        table_height = height - footer * 3 if height > 0 else -footer
+        self.table.draw("##file_browser", width, table_height)
+
+        selected = self.selected_paths
+        with_selection = bool(selected) and self.on_open is not None
+        with begin_disabled(not with_selection):
+            if imgui.button("Open") and with_selection:
+                self.on_open(selected)
+
+    def close(self):
+        self._tasks.shutdown(wait=False)
@@ -0,0 +1,115 @@
+import imgui
+
+from time import perf_counter
+from typing import NamedTuple
+
+
+class FontSpec(NamedTuple):
+    """
+    One font file at one size. `glyph_ranges` is a flat list of `(first, last)` pairs, `merge=True` merges it into the
+
+    previous font of the same entry (e.g. icons into a text font).
+    """
+
+    path: str
+    size: float
+    glyph_ranges: tuple | None = None
+    merge: bool = False
+
+
+class FontAtlasReport(NamedTuple):
+    build_ms: float
+    width: int
+    height: int
+    glyph_sources: int
+    scale: float
+
+    def __str__(self):
+        return (
+            f"Font atlas built in {self.build_ms:.1f} ms "
+            f"({self.width}x{self.height}, {self.glyph_sources} sources, scale {self.scale:g})"
+        )
+
+
+class FontAtlas:
+    """
+    Declares the app's fonts once and builds them into ImGui's atlas in a single pass.
+
+    - Build **before** creating the renderer: `GlfwRenderer` uploads whatever atlas exists when it's created,
+
+        so this avoids rasterizing and uploading ImGui's default font only to throw it away.
+
+    - Glyphs use ImGui's default oversampling. `oversample_h=1, pixel_snap=True` rasterizes them without horizontal
+
+        oversampling and snaps them to whole pixels, which roughly halves the build time and the atlas texture but
+
+        makes small text visibly blurrier and unevenly spaced, so it's only worth it for very large atlases.
+
+    - `generation` is bumped on every build so caches that depend on glyph metrics can tell they're stale.
+
+    - Example:
+        ```
+        FONTS = FontAtlas({
+            "title": FontSpec("Rokkitt-Regular.ttf", 25),
+            "main": [FontSpec("Rokkitt-Regular.ttf", 20), FontSpec("fontawesome-webfont.ttf", 16, ICONS, merge=True)],
+        })
+        report = FONTS.build(imgui.get_io(), scale=gui.fb_to_window_factor(window))
+        impl = GlfwRenderer(window)
+        ...
+        with imgui.font(FONTS["title"]):
+        ```
+    """
+
+    def __init__(self, specs: dict, oversample_h=None, pixel_snap=None):
+        self.specs = {name: spec if isinstance(spec, list) else [spec] for name, spec in specs.items()}
+        self.oversample_h = oversample_h
+        self.pixel_snap = pixel_snap
+        self.fonts = {}
+        self.generation = 0
+        self.scale = 1.0
+        self.ui_scale = 1.0
+        self.last_report: FontAtlasReport | None = None
+        self._glyph_ranges = []
+
+    def __getitem__(self, name):
+        return self.fonts[name]
+
+    def build(self, io, scale=1.0, ui_scale=1.0) -> FontAtlasReport:
+        """
+        Clears `io.fonts`, adds every font at `size * scale * ui_scale` and rasterizes the atlas.
+
+        Fonts are drawn at `1 / scale`, so `scale` only affects sharpness and `ui_scale` the visible size.
+
+        If a renderer already exists, call its `refresh_font_texture()` afterwards to upload the new atlas.
+        """
+
+        start = perf_counter()
+        atlas = io.fonts
+        atlas.clear()
+        io.font_global_scale = 1.0 / scale
+        self.fonts = {}
+        # ImGui keeps pointers to the glyph ranges until the atlas is rebuilt, so they must outlive this call.
+        self._glyph_ranges = []
+        sources = 0
+
+        for name, specs in self.specs.items():
+            for spec in specs:
+                # `None` keeps ImGui's default for that setting.
+                config = imgui.core.FontConfig(
+                    merge_mode=spec.merge, oversample_h=self.oversample_h, pixel_snap_h=self.pixel_snap
+                )
+                ranges = None
+                if spec.glyph_ranges:
+                    ranges = imgui.core.GlyphRanges([*spec.glyph_ranges, 0])
+                    self._glyph_ranges.append(ranges)
+                font = atlas.add_font_from_file_ttf(str(spec.path), spec.size * scale * ui_scale, config, ranges)
+                if not spec.merge:
+                    self.fonts[name] = font
+                sources += 1
+
+        width, height, _ = atlas.get_tex_data_as_rgba32()
+        self.scale = scale
+        self.ui_scale = ui_scale
+        self.generation += 1
+        self.last_report = FontAtlasReport((perf_counter() - start) * 1000, width, height, sources, scale)
+        return self.last_report
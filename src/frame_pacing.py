@@ -0,0 +1,256 @@
+import glfw
+import imgui
+
+from collections import deque
+
+
+def sleep_until(target: float, spin=0.002):
+    """
+    Waits until `glfw.get_time()` reaches `target`.
+
+    Sleeps in `glfw.wait_events_timeout` (which also delivers input as it arrives) until `spin` seconds are left,
+
+    then busy-waits the rest, because OS sleeps can overshoot by a millisecond or more.
+    """
+
+    while True:
+        remaining = target - glfw.get_time()
+        if remaining <= spin:
+            break
+        glfw.wait_events_timeout(remaining - spin)
+    while glfw.get_time() < target:
+        pass
+
+
+def refresh_rate(window=None) -> float:
+    """
+    Refresh rate of the window's monitor (the primary monitor for windowed mode), `60.0` if unknown.
+    """
+
+    monitor = (glfw.get_window_monitor(window) if window else None) or glfw.get_primary_monitor()
+    mode = glfw.get_video_mode(monitor) if monitor else None
+    return float(mode.refresh_rate) if mode and mode.refresh_rate else 60.0
+
+
+class FramePacer:
+    """
+    Controls when frames are presented.
+
+    - `VSYNC`: swap interval 1. Swapping blocks until the next refresh. No tearing and no wasted frames, but up to
+
+        a refresh of extra latency.
+
+    - `FIXED`: swap interval 0, frames are capped at `fps` with `sleep_until()` (sleep, then spin for the last
+
+        `spin` seconds). The wait happens in `begin_frame()`, before input is read, and the frame is swapped as soon
+
+        as it's rendered, so input only waits for one frame's build and render time. Lowest latency at a cap near the
+
+        refresh rate, at the cost of tearing and some CPU for the spin.
+
+    - `ADAPTIVE`: vsync while frames keep up with the refresh rate, tearing instead of dropping to half rate when they
+
+        don't. Uses the driver's adaptive vsync (swap interval -1) when `EXT_swap_control_tear` is available, otherwise
+
+        switches the swap interval itself based on how long frames take to build.
+
+    Create the window's `RenderLoop` with `active_fps=0` so only the pacer limits the frame rate, then call
+
+    `begin_frame()` after `RenderLoop.wait()` and before processing input, and `before_swap()` right before
+
+    `glfw.swap_buffers()`.
+    """
+
+    VSYNC = "vsync"
+    FIXED = "fixed"
+    ADAPTIVE = "adaptive"
+    MODES = (VSYNC, FIXED, ADAPTIVE)
+
+    def __init__(self, window, mode=VSYNC, fps=None, spin=0.002):
+        self.window = window
+        self.refresh_rate = refresh_rate(window)
+        self.spin = spin
+        self.mode = None
+        self.fps = fps or self.refresh_rate
+        self.swap_interval = None
+        self.tear_control = bool(
+            glfw.extension_supported("WGL_EXT_swap_control_tear")
+            or glfw.extension_supported("GLX_EXT_swap_control_tear")
+        )
+        self._frame_start = 0.0
+        self._next_frame = 0.0
+        self._slow_frames = 0
+        self._fast_frames = 0
+        self.set_mode(mode, fps)
+
+    def set_mode(self, mode: str, fps=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown frame pacing mode: {mode}")
+
+        self.mode = mode
+        if fps:
+            self.fps = fps
+        self._next_frame = 0.0
+        self._slow_frames = self._fast_frames = 0
+        if mode == self.VSYNC:
+            self._set_swap_interval(1)
+        elif mode == self.FIXED:
+            self._set_swap_interval(0)
+        else:
+            self._set_swap_interval(-1 if self.tear_control else 1)
+
+    def _set_swap_interval(self, interval: int):
+        if interval != self.swap_interval:
+            glfw.swap_interval(interval)
+            self.swap_interval = interval
+
+    def begin_frame(self, now=None):
+        if now is None:
+            now = glfw.get_time()
+        if self.mode == self.FIXED and self.fps:
+            # Wait before the frame reads input rather than before the swap, so fresh input goes straight to the screen.
+            period = 1 / self.fps
+            if self._next_frame > now:
+                sleep_until(self._next_frame, self.spin)
+                now = glfw.get_time()
+            # Keep a steady cadence, but don't try to catch up after idle time or a long frame.
+            if now - self._next_frame < period:
+                self._next_frame += period
+            else:
+                self._next_frame = now + period
+        self._frame_start = now
+
+    @property
+    def target_fps(self) -> float:
+        """
+        The frame rate the pacer aims for while the app is active.
+        """
+
+        return self.fps if self.mode == self.FIXED else self.refresh_rate
+
+    def before_swap(self):
+        now = glfw.get_time()
+        if self.mode == self.ADAPTIVE and not self.tear_control:
+            period = 1 / self.refresh_rate
+            work = now - self._frame_start
+            if self.swap_interval == 1:
+                # A few frames close to the refresh period in a row and vsync would start halving the frame rate.
+                self._slow_frames = self._slow_frames + 1 if work > period * 0.9 else 0
+                if self._slow_frames >= 3:
+                    self._set_swap_interval(0)
+                    self._fast_frames = 0
+            else:
+                self._fast_frames = self._fast_frames + 1 if work < period * 0.7 else 0
+                if self._fast_frames >= 30:
+                    self._set_swap_interval(1)
+                    self._slow_frames = 0
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "fps": self.fps,
+            "refresh_rate": self.refresh_rate,
+            "swap_interval": self.swap_interval,
+            "tear_control": self.tear_control,
+        }
+
+
+_LATENCY_CALLBACK_SETTERS = {
+    "key": glfw.set_key_callback,
+    "char": glfw.set_char_callback,
+    "mouse_button": glfw.set_mouse_button_callback,
+    "cursor_pos": glfw.set_cursor_pos_callback,
+    "scroll": glfw.set_scroll_callback,
+}
+
+
+class LatencyMonitor:
+    """
+    Measures input-to-swap latency: the time from a GLFW input callback to the `swap_buffers()` of the first frame
+
+    that processed it, per kind of input ("key", "char", "mouse_button", "cursor_pos", "scroll").
+
+    - Call `begin_frame()` right before the frame reads input (before `impl.process_inputs()`) and `frame_presented()`
+
+        right after `swap_buffers()`. Events that arrive in between count towards the next frame.
+
+    - Timestamps are taken when GLFW delivers an event, so time spent in the OS queue while the app was busy (for example
+
+        blocked in a vsync'd swap) isn't included; the numbers are a lower bound and best for comparing pacing modes.
+
+    Create it after `GlfwRenderer` and `RenderLoop` so the callbacks get chained.
+    """
+
+    def __init__(self, window, capacity=600, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.samples = {kind: deque(maxlen=capacity) for kind in _LATENCY_CALLBACK_SETTERS}
+        self._pending = {}
+        self._in_frame = {}
+        self._callbacks = []
+
+        for kind, setter in _LATENCY_CALLBACK_SETTERS.items():
+            self._chain_callback(kind, setter)
+
+    def _chain_callback(self, kind, setter):
+        previous = setter(self.window, None)
+        pending = self._pending
+
+        def callback(*args):
+            if self.enabled and kind not in pending:
+                pending[kind] = glfw.get_time()
+            if previous:
+                previous(*args)
+
+        self._callbacks.append(callback)
+        setter(self.window, callback)
+
+    def begin_frame(self):
+        self._in_frame.update((kind, t) for kind, t in self._pending.items() if kind not in self._in_frame)
+        self._pending.clear()
+
+    def frame_presented(self, now=None):
+        if not self._in_frame:
+            return
+        if now is None:
+            now = glfw.get_time()
+        for kind, t in self._in_frame.items():
+            self.samples[kind].append(now - t)
+        self._in_frame.clear()
+
+    def clear(self):
+        for samples in self.samples.values():
+            samples.clear()
+
+    def percentiles(self, kind=None, values=(50, 95, 99)) -> dict:
+        """
+        Latency percentiles in milliseconds for one kind of input, or all of them combined.
+        """
+
+        if kind is None:
+            latencies = sorted(t for samples in self.samples.values() for t in samples)
+        else:
+            latencies = sorted(self.samples[kind])
+        if not latencies:
+            return {f"p{p}": 0.0 for p in values}
+        last = len(latencies) - 1
+        return {f"p{p}": latencies[min(last, round(last * p / 100))] * 1000 for p in values}
+
+    def report(self) -> str:
+        lines = ["Input-to-swap latency (ms):"]
+        for kind, samples in self.samples.items():
+            if samples:
+                stats = self.percentiles(kind)
+                lines.append(
+                    f"{kind:>14}: p50 {stats['p50']:6.2f}  p95 {stats['p95']:6.2f}  p99 {stats['p99']:6.2f}"
+                    f"  ({len(samples)} samples)"
+                )
+        return "\n".join(lines)
+
+    def draw_overlay_section(self):
+        """
+        Draws the combined latency percentiles. Register it with `PROFILER.add_overlay_section()`.
+        """
+
+        stats = self.percentiles()
+        imgui.text(f"input latency p50 {stats['p50']:.1f}  p95 {stats['p95']:.1f}  p99 {stats['p99']:.1f} ms")
@@ -1,21 +1,37 @@
 from pathlib import Path
-from PIL import Image
-from pywintypes import error as pywinErr
-from win32gui import GetOpenFileNameW
 import glfw
 import imgui
-import numpy as np
-import OpenGL.GL as gl
 import os
-import win32con
 
 from contextlib import contextmanager
-from cv2 import cvtColor, imread, COLOR_BGR2RGBA, IMREAD_UNCHANGED
-from win11toast import notify
+from src.animation import Spinner
+from src.notifications import NOTIFICATIONS
+from src.text_metrics import TEXT_METRICS
+from src.theme import THEME, StyleOverride
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.textures import AsyncTexture
 
 
 PARENT_PATH = Path(__file__).parent
 ASSETS_PATH = PARENT_PATH / Path(r"assets")
+_TEXTURE_NAMES = ("TEXTURE_CACHE", "IMAGE_LOADER", "THUMBNAILS", "AsyncTexture", "load_texture")
+
+
+def __getattr__(name):
+    # PyOpenGL and `src.textures` (numpy) are only imported when something first asks for them, not with `src.gui`.
+    # The result is stored as a module global, so later lookups (several per frame) don't come back here.
+    if name == "gl":
+        import OpenGL.GL as value
+    elif name in _TEXTURE_NAMES:
+        from src import textures
+
+        value = getattr(textures, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 
 class Icons:
@@ -56,6 +72,11 @@ def start_file_dialog(extension: str, multiselect: bool) -> list | str:
         -> Returns a list of file paths.
     """
 
+    # pywin32 is only imported when a dialog is actually opened.
+    from pywintypes import error as pywinErr
+    from win32gui import GetOpenFileNameW
+    import win32con
+
     try:
         fnames = []
         customfilter = "All Files\0*.*\0"
@@ -95,51 +116,44 @@ def start_file_dialog(extension: str, multiselect: bool) -> list | str:
         return None
 
 
-def draw_image(path: str):
+def draw_image(path: str, cached: bool = True, max_size: int | None = None, mipmaps: bool = False):
     """
     Returns a texture bound to GLFW that can be drawn in ImGui.
+
+    By default the texture comes from `TEXTURE_CACHE` so calling this every frame is cheap and
+
+    old textures get deleted once the cache's memory budget is exceeded. Pass `cached=False` to get
+
+    a texture you own (and have to delete yourself with `gl.glDeleteTextures`).
+
+    For thumbnails, `max_size` decodes the image at a reduced size (and caches it on disk when `THUMBNAILS.directory`
+
+    is set) and `mipmaps=True` keeps it from aliasing when drawn smaller.
     """
-    try:
-        img = imread(path, IMREAD_UNCHANGED)
-        if img is None:
-            print("Error loading image.")
-            return 0, 0, 0
-
-        img = cvtColor(img, COLOR_BGR2RGBA)
-        h, w = img.shape[:2]
-
-        img_data = np.ascontiguousarray(img, dtype=np.uint8)
-
-        texture = gl.glGenTextures(1)
-        if texture == 0:
-            return 0, 0, 0
-
-        gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
-        gl.glTexImage2D(
-            gl.GL_TEXTURE_2D,
-            0,
-            gl.GL_RGBA,
-            w,
-            h,
-            0,
-            gl.GL_RGBA,
-            gl.GL_UNSIGNED_BYTE,
-            img_data,
-        )
 
-        error = gl.glGetError()
-        if error != gl.GL_NO_ERROR:
-            print(f"OpenGL error: {error}")
-            return 0, 0, 0
+    from src.textures import TEXTURE_CACHE, load_texture
 
-        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
-        return texture, w, h
-    except Exception as e:
-        print(f"Unhandled exception: {e}")
-        return 0, 0, 0
+    if cached:
+        return TEXTURE_CACHE.get(path, max_size, mipmaps)
+    return load_texture(path, max_size, mipmaps)
+
+
+def draw_image_async(path: str, max_size: int | None = None, mipmaps: bool = False) -> "AsyncTexture":
+    """
+    Non-blocking version of `draw_image()`. Returns an `AsyncTexture` whose `texture` is a placeholder
+
+    until the image is decoded on a worker thread and uploaded by `IMAGE_LOADER.pump()`.
+
+    - Example:
+        ```
+        img = draw_image_async("cover.png", max_size=128, mipmaps=True)
+        imgui.image(img.texture, 64, 64)
+        ```
+    """
+
+    from src.textures import IMAGE_LOADER
+
+    return IMAGE_LOADER.load(path, max_size, mipmaps)
 
 
 def fb_to_window_factor(window):
@@ -154,10 +168,12 @@ def fb_to_window_factor(window):
 
 
 def new_window(
-    title: str, width: int, height: int, resizable: bool):
+    title: str, width: int, height: int, resizable: bool, vsync: bool = True):
     """
     Draws a window and binds and icon to it using GLFW.
 
+    `vsync` sets the swap interval so frame pacing doesn't depend on driver defaults.
+
     You can modify it to also create custom cursors and return them as objects callable in `glfw.set_cursor()`
     """
 
@@ -166,9 +182,12 @@ def new_window(
 
     glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
     glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
-    glfw.window_hint(glfw.RESIZABLE, gl.GL_TRUE if resizable else gl.GL_FALSE)
+    glfw.window_hint(glfw.RESIZABLE, glfw.TRUE if resizable else glfw.FALSE)
     glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
-    glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, gl.GL_TRUE)
+    glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, glfw.TRUE)
+    # Where the framebuffer matches the window size (Windows, X11) the window grows with the monitor's content scale,
+    # like the fonts and style sizes do (see `ContentScaleManager`).
+    glfw.window_hint(glfw.SCALE_TO_MONITOR, glfw.TRUE)
 
     monitor = glfw.get_primary_monitor()
     vidMode = glfw.get_video_mode(monitor)
@@ -181,6 +200,9 @@ def new_window(
     # Example iBeam cursor '|'
     # ibeam_cursor : object = glfw.create_standard_cursor(glfw.IBEAM_CURSOR)
 
+    from PIL import Image
+    import numpy as np
+
     window = glfw.create_window(int(width), int(height), title, None, None)
     icon = Image.open(res_path("img/icon.ico"))
     icon = icon.convert("RGBA")
@@ -190,6 +212,7 @@ def new_window(
     glfw.set_window_pos(window, int(pos_x / 2 - width / 2), int(pos_y / 2 - height / 2))
     glfw.set_window_icon(window, 1, icon_struct)
     glfw.make_context_current(window)
+    glfw.swap_interval(1 if vsync else 0)
 
     if not window:
         glfw.terminate()
@@ -212,42 +235,48 @@ def reset_cursor(window: object):
         glfw.set_cursor(window, None)
 
 
+_busy_style = StyleOverride(
+    colors={
+        imgui.COLOR_BUTTON: (0.501, 0.501, 0.501),
+        imgui.COLOR_BUTTON_ACTIVE: (0.501, 0.501, 0.501),
+        imgui.COLOR_BUTTON_HOVERED: (0.501, 0.501, 0.501),
+    }
+)
+_disabled_style = StyleOverride(style_vars={imgui.STYLE_ALPHA: 0.5})
+_tooltip_style = StyleOverride(style_vars={imgui.STYLE_WINDOW_ROUNDING: 10})
+
+
 def colored_button(
     label: str, color: list, hovered_color: list, active_color: list
 ) -> bool:
     """
     Creates an ImGui colored button
     """
+
+    # Colors come in per call, so there's nothing to precompile: push them straight away.
     imgui.push_style_color(imgui.COLOR_BUTTON, color[0], color[1], color[2])
-    imgui.push_style_color(
-        imgui.COLOR_BUTTON_ACTIVE, hovered_color[0], hovered_color[1], hovered_color[2]
-    )
-    imgui.push_style_color(
-        imgui.COLOR_BUTTON_HOVERED, active_color[0], active_color[1], active_color[2]
-    )
-    retbool = imgui.button(label)
+    imgui.push_style_color(imgui.COLOR_BUTTON_ACTIVE, hovered_color[0], hovered_color[1], hovered_color[2])
+    imgui.push_style_color(imgui.COLOR_BUTTON_HOVERED, active_color[0], active_color[1], active_color[2])
+    clicked = imgui.button(label)
     imgui.pop_style_color(3)
-    return retbool
+    return clicked
 
 
 def busy_button(icon, label=None):
     """
     Creates a busy button that can be used to replace a functional button when its callback is ongoing.
 
-    You can animate this button's icon by creating a thread that changes the icon to a
+    You can animate this button's icon by passing the current frame of an `IconCycle` (see `src/animation.py`)
 
-    *similar-but-slightly* different one. See `hourglass_1` to `hourglass_5` in the `Icons` class above
-    
-    for a simple example. A dummy thread is also available in `example_main.py`
+    that cycles through *similar-but-slightly* different icons. See `hourglass_1` to `hourglass_5` in the `Icons` class above
+
+    and `BUSY_ICON` in `example_main.py` for a simple example.
     """
 
     button_label = f"{icon}  {label}" if label else f" {icon} "
-    colored_button(
-        button_label,
-        [0.501, 0.501, 0.501],
-        [0.501, 0.501, 0.501],
-        [0.501, 0.501, 0.501],
-    )
+    THEME.push(_busy_style)
+    imgui.button(button_label)
+    THEME.pop()
 
 
 @contextmanager
@@ -259,14 +288,14 @@ def begin_disabled(cond: bool):
     """
 
     if cond:
-        imgui.push_style_var(imgui.STYLE_ALPHA, 0.5)
+        THEME.push(_disabled_style)
         imgui.begin_group()
     try:
         yield
     finally:
         if cond:
             imgui.end_group()
-            imgui.pop_style_var()
+            THEME.pop()
 
 
 def disabled_widget(cond: bool, callback, *args):
@@ -283,7 +312,15 @@ def disabled_widget(cond: bool, callback, *args):
         return result
 
 
-def status_text(text="", color=None):
+def status_text(text="", color=None, wrap_width=0.0, font=None):
+    """
+    Draws `text`, optionally colored. With `wrap_width` the text is wrapped once and cached (see `TEXT_METRICS`).
+
+    Pass the pushed `font` if it isn't the default one: the cache can't tell fonts of the same size apart otherwise.
+    """
+
+    if wrap_width > 0:
+        text = TEXT_METRICS.wrap(text, wrap_width, font)
     if color:
         imgui.text_colored(text, color[0], color[1], color[2], 1)
     else:
@@ -301,17 +338,16 @@ def tooltip(text="", font=None, alpha=0.75):
         ```
     """
     if imgui.is_item_hovered():
-        imgui.push_style_var(imgui.STYLE_WINDOW_ROUNDING, 10)
+        THEME.push(_tooltip_style)
         imgui.set_next_window_bg_alpha(alpha)
         with imgui.begin_tooltip():
-            imgui.push_text_wrap_pos(imgui.get_font_size() * 15)
+            wrap_width = imgui.get_font_size() * 15 - imgui.get_cursor_pos_x()
             if font:
                 with imgui.font(font):
-                    imgui.text(text)
+                    imgui.text(TEXT_METRICS.wrap(text, wrap_width, font))
             else:
-                imgui.text(text)
-            imgui.pop_text_wrap_pos()
-        imgui.pop_style_var()
+                imgui.text(TEXT_METRICS.wrap(text, wrap_width))
+        THEME.pop()
 
 
 def help_marker(text="", font=None, padding=10, alpha=0.75):
@@ -328,15 +364,12 @@ def help_marker(text="", font=None, padding=10, alpha=0.75):
 
 def toast(message="", callback=None):
     """
-    Triggers a Windows 10/11-style toast notification.
+    Shows a notification in the in-app overlay and, if `NOTIFICATIONS.os_backend` is set (see `OSNotifier`),
+
+    as a Windows 10/11-style toast. Returns immediately; safe to call from worker threads.
     """
 
-    return notify(
-        "ExampleApp",
-        message,
-        icon=str(res_path("img/icon.ico")),
-        on_click=callback,
-    )
+    NOTIFICATIONS.notify(message, os_notify=True, on_click=callback)
 
 
 def message_box(title, text="", font=None, context=0, on_true=None, *args):
@@ -359,13 +392,12 @@ def message_box(title, text="", font=None, context=0, on_true=None, *args):
     ) as msgbox:
         if msgbox.opened:
             imgui.dummy(1, 5)
-            imgui.push_text_wrap_pos(235)
+            wrap_width = 235 - imgui.get_cursor_pos_x()
             if font:
                 with imgui.font(font):
-                    imgui.text(text)
+                    imgui.text(TEXT_METRICS.wrap(text, wrap_width, font))
             else:
-                imgui.text(text)
-            imgui.pop_text_wrap_pos()
+                imgui.text(TEXT_METRICS.wrap(text, wrap_width))
             imgui.dummy(1, 10)
             if context == 0:
                 imgui.dummy(75, 1)
@@ -381,40 +413,29 @@ def message_box(title, text="", font=None, context=0, on_true=None, *args):
                     imgui.close_current_popup()
 
 
-def separator_text(text, padding=10):
+def separator_text(text, padding=10, font=None):
     """
     PyImGui is missing a lot of useful ImGui bindings. This tries to mimic `ImGui::SeparatorText()`
+
+    Pass the pushed `font` if it isn't the default one (see `status_text()`).
     """
 
     cursor_x, cursor_y = imgui.get_cursor_screen_pos()
-    text_width, _ = imgui.calc_text_size(text)
+    text_width = TEXT_METRICS.size(text, font=font)[0]
     region_width = imgui.get_content_region_available()[0]
     line_width = (region_width - text_width) / 2 - padding
-
-    draw_list = imgui.get_window_draw_list()
-    color = 0xFFFFFFEE
+    line_height = imgui.get_text_line_height()
 
     if line_width > 0:
-        draw_list.add_line(
-            cursor_x,
-            (cursor_y + imgui.get_text_line_height() / 2),
-            (cursor_x + padding),
-            (cursor_y + imgui.get_text_line_height() / 2),
-            color,
-            1.6,
-        )
-        draw_list.add_line(
-            (cursor_x + text_width + padding * 2.5),
-            (cursor_y + imgui.get_text_line_height() / 2),
-            (cursor_x + region_width),
-            (cursor_y + imgui.get_text_line_height() / 2),
-            color,
-            1.6,
-        )
+        draw_list = imgui.get_window_draw_list()
+        color = 0xFFFFFFEE
+        line_y = cursor_y + line_height / 2
+        draw_list.add_line(cursor_x, line_y, cursor_x + padding, line_y, color, 1.6)
+        draw_list.add_line(cursor_x + text_width + padding * 2.5, line_y, cursor_x + region_width, line_y, color, 1.6)
 
     imgui.set_cursor_pos_x(cursor_x + padding)
     imgui.text(text)
-    imgui.set_cursor_pos_y(cursor_y - (imgui.get_text_line_height() / 3))
+    imgui.set_cursor_pos_y(cursor_y - (line_height / 3))
 
 
 def image_rounded(texture_id, diameter, uv_a=(0, 0), uv_b=(1, 1)):
@@ -431,6 +452,23 @@ def image_rounded(texture_id, diameter, uv_a=(0, 0), uv_b=(1, 1)):
     imgui.dummy(diameter, diameter)
 
 
+_spinner = Spinner(speed=1.2)
+
+
+def spinner(radius=8, thickness=2.5, color=0xFFFFFFEE):
+    """
+    Draws a rotating arc. Keeps the render loop active through `ANIMATOR` only while it's visible.
+    """
+
+    cursor_x, cursor_y = imgui.get_cursor_screen_pos()
+    angle = _spinner.angle
+    draw_list = imgui.get_window_draw_list()
+    draw_list.path_clear()
+    draw_list.path_arc_to(cursor_x + radius, cursor_y + radius, radius, angle, angle + 4.5, 24)
+    draw_list.path_stroke(color, 0, thickness)
+    imgui.dummy(radius * 2, radius * 2)
+
+
 def clickable_icon(icon, font, tooltip_text, callback, *args):
     """
     Draws a clickable widget.
@@ -3,15 +3,25 @@ If you don't need a console, remove the show_console() and hide_console() functi
 and the console handler in the logger class then you can remove the ctypes dependency.
 """
 
-import inspect
+import atexit
+import gzip
 import logging
 import logging.handlers
 import os
+import queue
+import shutil
 import sys
 
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import windll
 from datetime import datetime
 from platform import system, architecture, release, version
+from time import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 WORK_PATH = os.path.join(os.getcwd(), "ExampleApp") # Change this to where you want to store your logs
 LOG_FILE = os.path.join(WORK_PATH, "example_app.log")
@@ -40,7 +50,20 @@ def log_init_str(app_name: str, app_version: str):
 """
 
 
+_archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LogArchiver")
+
+
 class CustomLogHandler(logging.FileHandler):
+    """
+    File handler that archives the log once it grows past `max_bytes`, at startup, at runtime
+
+    (checked on every record) and on close. `rotate_interval` (seconds) also rotates by age.
+
+    Archived logs are compressed (zstd if `zstandard` is installed, gzip otherwise) and pruned to
+
+    `max_backups` files / `max_backup_bytes` total on a background thread, so logging never waits on them.
+    """
+
     def __init__(
         self,
         filename,
@@ -48,22 +71,108 @@ class CustomLogHandler(logging.FileHandler):
         archive_name="backup_%Y%m%d_%H%M%S.log",
         max_bytes=524288, # 512KB max file size before it gets archived
         encoding="utf-8",
+        buffered=False, # don't flush after every record; whoever drives the handler calls flush()
+        rotate_interval=None,
+        compress=True,
+        max_backups=20,
+        max_backup_bytes=None,
         **kwargs,
     ):
         self.archive_path = archive_path
         self.archive_name = archive_name
         self.max_bytes = max_bytes
         self.encoding = encoding
+        self.buffered = buffered
+        self.rotate_interval = rotate_interval
+        self.compress = compress
+        self.max_backups = max_backups
+        self.max_backup_bytes = max_backup_bytes
 
         self._archive_log(filename)
         super().__init__(filename, **kwargs)
+        self._bytes = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        self._opened_at = time()
+
+    def _archive_log(self, filepath, force=False):
+        if not os.path.exists(filepath):
+            return
+        if not force and os.path.getsize(filepath) <= self.max_bytes:
+            return
+
+        os.makedirs(self.archive_path, exist_ok=True)
+        timestamped_name = datetime.now().strftime(self.archive_name)
+        archive_file = os.path.join(self.archive_path, timestamped_name)
+        base, ext = os.path.splitext(archive_file)
+        n = 1
+        while any(os.path.exists(archive_file + suffix) for suffix in ("", ".gz", ".zst")):
+            archive_file = f"{base}_{n}{ext}"
+            n += 1
+
+        os.rename(filepath, archive_file)
+        try:
+            _archiver.submit(self._compress_and_prune, archive_file)
+        except RuntimeError:  # interpreter shutdown
+            self._compress_and_prune(archive_file)
+
+    def _compress_and_prune(self, archive_file):
+        try:
+            if self.compress:
+                if zstandard:
+                    with open(archive_file, "rb") as src, open(archive_file + ".zst", "wb") as dst:
+                        zstandard.ZstdCompressor().copy_stream(src, dst)
+                else:
+                    with open(archive_file, "rb") as src, gzip.open(archive_file + ".gz", "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                os.remove(archive_file)
+            self._prune()
+        except OSError:
+            pass
 
-    def _archive_log(self, filepath):
-        if os.path.exists(filepath) and os.path.getsize(filepath) > self.max_bytes:
-            os.makedirs(self.archive_path, exist_ok=True)
-            timestamped_name = datetime.now().strftime(self.archive_name)
-            archive_file = os.path.join(self.archive_path, timestamped_name)
-            os.rename(filepath, archive_file)
+    def _prune(self):
+        prefix = self.archive_name.split("%")[0]
+        backups = [
+            (entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+            for entry in os.scandir(self.archive_path)
+            if entry.is_file() and entry.name.startswith(prefix)
+        ]
+        backups.sort()
+        total = sum(size for _, size, _ in backups)
+        while backups and (
+            (self.max_backups and len(backups) > self.max_backups)
+            or (self.max_backup_bytes and total > self.max_backup_bytes)
+        ):
+            _, size, path = backups.pop(0)
+            os.remove(path)
+            total -= size
+
+    def _should_rotate(self, pending):
+        if self._bytes + pending > self.max_bytes and self._bytes > 0:
+            return True
+        return bool(self.rotate_interval and time() - self._opened_at >= self.rotate_interval)
+
+    def rotate(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self._archive_log(self.baseFilename, force=True)
+        self._bytes = 0
+        self._opened_at = time()
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self._should_rotate(len(msg)):
+                self.rotate()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self._bytes += len(msg)
+            if not self.buffered:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
     def close(self):
         super().close()
@@ -71,31 +180,162 @@ class CustomLogHandler(logging.FileHandler):
 
 
 class CustomLogFilter(logging.Filter):
+    """
+    Adds the name of the function that called the logger as `caller_name`.
+
+    `depth` is the number of frames between this filter and that function (6 when logging through `LOGGER`).
+
+    Set it to `None` to skip the lookup entirely.
+    """
+
+    def __init__(self, depth=6):
+        super().__init__()
+        self.depth = depth
+
     def filter(self, record):
-        record.caller_name = inspect.stack()[6].function
+        if self.depth is None:
+            record.caller_name = "-"
+            return True
+        try:
+            record.caller_name = sys._getframe(self.depth).f_code.co_name
+        except ValueError:
+            record.caller_name = "?"
         return True
 
 
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    `QueueListener` that drains up to `batch_size` records at a time and flushes its handlers once per batch.
+    """
+
+    def __init__(self, queue, *handlers, batch_size=256):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                    continue
+                self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            if has_task_done:
+                for _ in batch:
+                    q.task_done()
+            if stop:
+                break
+
+
+class _LogQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records over as-is. The queue never leaves the process so there's no need to pre-format
+
+    (and copy) every record on the calling thread like `QueueHandler.prepare()` does.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listener: BatchingQueueListener | None = None
+_instance = None
+
+
+def get_logger():
+    """
+    Returns the app's `LOGGER`, creating a default one only if the app hasn't created its own yet.
+
+    Use this in library modules instead of building a `LOGGER()` at import time.
+    """
+
+    return _instance or LOGGER()
+
+
 class LOGGER:
-    def __init__(self, app_name="", app_version=""):
+    """
+    - `async_mode`: The calling thread only resolves the caller name and puts the record in a queue.
+
+        A background thread formats the records and writes them to disk in batches.
+
+    - `caller_depth`: See `CustomLogFilter`. `None` disables the caller lookup.
+    """
+
+    def __init__(self, app_name="", app_version="", async_mode=True, caller_depth=6):
+        global _listener, _instance
+
         self.app_name = app_name
         self.app_version = app_version
+        self.async_mode = async_mode
         self.logger = logging.getLogger("MAIN")
-        self.logger.addFilter(CustomLogFilter())
+        for f in self.logger.filters[:]:
+            self.logger.removeFilter(f)
+        self.logger.addFilter(CustomLogFilter(caller_depth))
         self.logger.setLevel(logging.DEBUG)
         self.formatter = logging.Formatter(
             fmt="[%(asctime)s] [%(levelname)s] (%(caller_name)s): %(message)s",
             datefmt="%H:%M:%S",
         )
 
+        if _listener:
+            _listener.stop()
+            _listener = None
+
         if self.logger.hasHandlers():
             self.logger.handlers.clear()
 
-        self.file_handler = CustomLogHandler(LOG_FILE)
+        self.file_handler = CustomLogHandler(LOG_FILE, buffered=async_mode)
         self.file_handler.setLevel(logging.DEBUG)
         self.file_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.file_handler)
         self.console_handler = None
+        self.listener = None
+
+        if async_mode:
+            log_queue = queue.SimpleQueue()
+            self.listener = BatchingQueueListener(log_queue, self.file_handler)
+            self.listener.start()
+            self.logger.addHandler(_LogQueueHandler(log_queue))
+            _listener = self.listener
+            atexit.register(self.stop)
+        else:
+            self.logger.addHandler(self.file_handler)
+        _instance = self
+
+    def _add_handler(self, handler):
+        if self.listener:
+            self.listener.handlers = (*self.listener.handlers, handler)
+        else:
+            self.logger.addHandler(handler)
+
+    def _remove_handler(self, handler):
+        if self.listener:
+            self.listener.handlers = tuple(h for h in self.listener.handlers if h is not handler)
+        else:
+            self.logger.removeHandler(handler)
+
+    def stop(self):
+        """
+        Writes out queued records and stops the background writer.
+        """
+
+        global _listener
+
+        if self.listener and self.listener._thread:
+            self.listener.stop()
+            self.file_handler.flush()
+        if _listener is self.listener:
+            _listener = None
 
     # this is for packed executables with GUIs to enable/disable a debug console.
     def show_console(self):
@@ -108,7 +348,7 @@ class LOGGER:
             self.console_handler = logging.StreamHandler(sys.stdout)
             self.console_handler.setLevel(logging.DEBUG)
             self.console_handler.setFormatter(self.formatter)
-            self.logger.addHandler(self.console_handler)
+            self._add_handler(self.console_handler)
             print(log_init_str(self.app_version))
 
     def hide_console(self):
@@ -118,7 +358,7 @@ class LOGGER:
             sys.stderr = sys.__stderr__
 
         if self.console_handler:
-            self.logger.removeHandler(self.console_handler)
+            self._remove_handler(self.console_handler)
             self.console_handler = None
 
     def debug(self, msg: str):
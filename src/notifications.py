@@ -0,0 +1,304 @@
+import imgui
+import queue
+import threading
+
+from collections import OrderedDict
+from time import monotonic
+from src.animation import ANIMATOR, Fade
+
+
+INFO = 0
+SUCCESS = 1
+WARNING = 2
+ERROR = 3
+
+LEVEL_COLORS = {
+    INFO: (1.0, 1.0, 1.0),
+    SUCCESS: (0.4, 0.9, 0.5),
+    WARNING: (1.0, 0.75, 0.3),
+    ERROR: (1.0, 0.4, 0.4),
+}
+
+
+class Notification:
+    __slots__ = ("key", "message", "level", "timeout", "count", "expires", "fade", "height", "on_click")
+
+    def __init__(self, key, message, level, timeout, count, on_click, animator):
+        self.key = key
+        self.message = message
+        self.level = level
+        self.timeout = timeout
+        self.count = count
+        self.on_click = on_click
+        self.expires = 0.0
+        self.fade = Fade(0.2, animator=animator)
+        self.height = 0.0
+
+    @property
+    def text(self) -> str:
+        return f"{self.message} (x{self.count})" if self.count > 1 else self.message
+
+
+class OSNotifier:
+    """
+    Sends OS notifications from a background thread so a slow toast API never stalls a frame.
+
+    - Messages queued while a notification is being sent are merged ("x3") and at most one is sent every `min_interval` seconds.
+
+    - `send(title, message, on_click)` defaults to Windows toasts through `win11toast` (imported on the worker thread).
+
+        If it raises, the error is printed once and the notifier stops sending.
+    """
+
+    def __init__(self, title="ExampleApp", icon=None, send=None, min_interval=3.0):
+        self.title = title
+        self.icon = icon
+        self.min_interval = min_interval
+        self._send = send
+        self._queue = queue.Queue()
+        self._disabled = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="os-notifier", daemon=True)
+        self._thread.start()
+
+    def notify(self, message: str, on_click=None):
+        if not self._disabled:
+            self._queue.put((message, on_click))
+
+    def _default_send(self, title, message, on_click):
+        from win11toast import notify
+
+        notify(title, message, icon=str(self.icon) if self.icon else None, on_click=on_click)
+
+    def _drain(self, first) -> list:
+        merged = OrderedDict({first[0]: [1, first[1]]})
+        while True:
+            try:
+                message, on_click = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                self._stop.set()
+                break
+            entry = merged.setdefault(message, [0, on_click])
+            entry[0] += 1
+        return [(f"{m} (x{n})" if n > 1 else m, on_click) for m, (n, on_click) in merged.items()]
+
+    def _run(self):
+        send = self._send or self._default_send
+        last_sent = -self.min_interval
+        while not self._stop.is_set():
+            first = self._queue.get()
+            if first[0] is None:
+                break
+            # Wait out the rate limit first, so everything queued in the meantime gets merged.
+            if self._stop.wait(max(0.0, last_sent + self.min_interval - monotonic())):
+                break
+            messages = self._drain(first)
+            message = "\n".join(m for m, _ in messages[:3])
+            if len(messages) > 3:
+                message += f"\n... and {len(messages) - 3} more"
+            try:
+                send(self.title, message, messages[0][1])
+            except Exception as e:
+                print(f"OS notifications disabled: {e}")
+                self._disabled = True
+                break
+            last_sent = monotonic()
+
+    def close(self):
+        self._stop.set()
+        self._queue.put((None, None))
+
+
+class NotificationCenter:
+    """
+    In-app notifications drawn as a stack of fading overlays in the bottom-right corner.
+
+    - `notify()` is thread-safe and only touches a small pending dict, so workers can call it freely.
+
+        Duplicate messages (same `key`, by default the message and level) are merged into one notification with a
+
+        count, both while pending and while on screen.
+
+    - New notifications are rate limited to `burst` at once and `rate` per second after that; the excess is summed
+
+        up in a single "N more notifications" entry. At most `max_visible` are shown, the oldest is dismissed first.
+
+    - Notifications expire after `timeout` seconds (paused while hovered) and are dismissed when clicked.
+
+    - With an `os_backend` (e.g. `OSNotifier`), `notify(..., os_notify=True)` also sends an OS notification.
+
+    - Call `draw()` once per frame after `ANIMATOR.tick()`. It schedules frames for its own expiry and fades,
+
+        so nothing has to be registered with the render loop besides `on_change` (called when something is queued).
+
+    - Example:
+        ```
+        NOTIFICATIONS.on_change = render_loop.wake
+        NOTIFICATIONS.os_backend = OSNotifier("ExampleApp", icon=res_path("img/icon.ico"))
+        ...
+        NOTIFICATIONS.notify("Download finished", SUCCESS, os_notify=True)  # from any thread
+        ...
+        NOTIFICATIONS.draw(small_font)
+        ```
+    """
+
+    SUPPRESSED_KEY = "__suppressed__"
+
+    def __init__(
+        self,
+        timeout=4.0,
+        max_visible=5,
+        burst=3,
+        rate=1.0,
+        max_pending=100,
+        os_backend=None,
+        on_change=None,
+        animator=ANIMATOR,
+    ):
+        self.timeout = timeout
+        self.max_visible = max_visible
+        self.burst = burst
+        self.rate = rate
+        self.max_pending = max_pending
+        self.os_backend = os_backend
+        self.on_change = on_change
+        self.animator = animator
+        self.active: list[Notification] = []
+        self.suppressed = 0
+        self._pending = OrderedDict()
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = None
+
+    def notify(self, message: str, level=INFO, timeout=None, key=None, os_notify=False, on_click=None):
+        """
+        Queues a notification. Safe to call from any thread, never blocks on the UI or the OS.
+        """
+
+        if key is None:
+            key = (message, level)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending[3] += 1
+            elif len(self._pending) < self.max_pending:
+                self._pending[key] = [message, level, timeout, 1, on_click]
+            else:
+                self._dropped += 1
+        if os_notify and self.os_backend is not None:
+            self.os_backend.notify(message, on_click)
+        if self.on_change:
+            self.on_change()
+
+    def _take_token(self, now) -> bool:
+        if self._last_refill is not None:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def _show(self, key, message, level, timeout, count, on_click, now):
+        for notification in self.active:
+            if notification.key == key:
+                notification.count += count
+                notification.expires = now + notification.timeout
+                notification.fade.fade_in()
+                return
+        if key != self.SUPPRESSED_KEY and not self._take_token(now):
+            self.suppressed += count
+            self._show(self.SUPPRESSED_KEY, "", WARNING, None, count, None, now)
+            return
+
+        notification = Notification(
+            key, message, level, self.timeout if timeout is None else timeout, count, on_click, self.animator
+        )
+        notification.expires = now + notification.timeout
+        notification.fade.fade_in()
+        self.active.append(notification)
+        visible = [n for n in self.active if n.fade.end > 0.0]
+        for old in visible[: max(0, len(visible) - self.max_visible)]:
+            old.fade.fade_out()
+
+    def update(self, now=None):
+        """
+        Moves queued notifications on screen and retires expired ones. `draw()` calls it.
+        """
+
+        if now is None:
+            now = self.animator.now
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+            dropped, self._dropped = self._dropped, 0
+
+        for key, (message, level, timeout, count, on_click) in pending.items():
+            self._show(key, message, level, timeout, count, on_click, now)
+        if dropped:
+            self.suppressed += dropped
+            self._show(self.SUPPRESSED_KEY, "", WARNING, None, dropped, None, now)
+
+        for notification in self.active:
+            if notification.fade.end > 0.0 and now >= notification.expires:
+                notification.fade.fade_out()
+        self.active = [n for n in self.active if n.fade.end > 0.0 or n.fade.running]
+
+    def dismiss_all(self):
+        for notification in self.active:
+            notification.fade.fade_out()
+
+    def draw(self, font=None, width=300, margin=10):
+        self.update()
+        if not self.active:
+            return
+
+        now = self.animator.now
+        display_w, display_h = imgui.get_io().display_size
+        y = display_h - margin
+        # Windows are named after their slot in the stack: ImGui never frees a window, so naming them per notification
+        # would leak one for every notification shown. Older ones still fading out past the last slot aren't drawn.
+        for slot, notification in enumerate(reversed(self.active[-(self.max_visible + 1):])):
+            alpha = notification.fade.alpha
+            imgui.set_next_window_position(display_w - margin, y, pivot_x=1.0, pivot_y=1.0)
+            imgui.set_next_window_size(width, 0)
+            imgui.set_next_window_bg_alpha(0.85 * alpha)
+            imgui.push_style_var(imgui.STYLE_ALPHA, max(alpha, 0.01))
+            imgui.begin(
+                f"##notification_{slot}",
+                flags=imgui.WINDOW_NO_DECORATION
+                | imgui.WINDOW_NO_SAVED_SETTINGS
+                | imgui.WINDOW_NO_FOCUS_ON_APPEARING
+                | imgui.WINDOW_NO_NAV
+                | imgui.WINDOW_NO_MOVE,
+            )
+            if font:
+                imgui.push_font(font)
+            r, g, b = LEVEL_COLORS.get(notification.level, LEVEL_COLORS[INFO])
+            imgui.push_text_wrap_pos(0)
+            if notification.key == self.SUPPRESSED_KEY:
+                imgui.text_colored(f"{notification.count} more notifications", r, g, b, 1.0)
+            else:
+                imgui.text_colored(notification.text, r, g, b, 1.0)
+            imgui.pop_text_wrap_pos()
+            if font:
+                imgui.pop_font()
+
+            if imgui.is_window_hovered():
+                notification.expires = max(notification.expires, now + 1.0)
+                if imgui.is_mouse_clicked(0):
+                    if notification.on_click:
+                        notification.on_click()
+                    notification.fade.fade_out()
+            notification.height = imgui.get_window_height()
+            imgui.end()
+            imgui.pop_style_var()
+            y -= (notification.height + margin) * alpha
+
+            if notification.fade.end > 0.0:
+                self.animator.request_at(notification.expires)
+
+
+NOTIFICATIONS = NotificationCenter()
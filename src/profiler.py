@@ -0,0 +1,237 @@
+import imgui
+import json
+import os
+import threading
+
+from array import array
+from collections import deque
+from functools import wraps
+from time import perf_counter
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        end = perf_counter()
+        self.profiler._scopes.append(
+            (self.name, self.start, end - self.start, threading.get_ident())
+        )
+        return False
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class Profiler:
+    """
+    Per-frame profiler. Frames and their scopes are kept in a ring buffer of the last `capacity` frames.
+
+    - Example:
+        ```
+        PROFILER.begin_frame()
+        with PROFILER.scope("widgets"):
+            ...
+        PROFILER.end_frame()
+        ```
+
+    - `@PROFILER.profile()` does the same for a whole function.
+
+    - `draw_overlay()` draws a frame time graph with p50/p95/p99 stats and per-scope averages when `show_overlay` is set.
+
+        Other modules can append their own lines with `add_overlay_section()`.
+
+    - `export_chrome_trace(path)` writes the buffered frames as Chrome trace-event JSON (open it in `chrome://tracing` or Perfetto).
+    """
+
+    def __init__(self, capacity=600, enabled=True):
+        self.enabled = enabled
+        self.show_overlay = False
+        self.frames = deque(maxlen=capacity)
+        self.overlay_sections = []
+        self._scopes = []
+        self._open_scopes = []
+        self._frame_start = None
+        self._frame_tid = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._scopes = []
+        self._frame_tid = threading.get_ident()
+        self._frame_start = perf_counter()
+
+    def discard_frame(self):
+        self._open_scopes.clear()
+        self._frame_start = None
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        end = perf_counter()
+        self.frames.append((self._frame_start, end - self._frame_start, tuple(self._scopes)))
+        self._frame_start = None
+
+    def scope(self, name: str):
+        if self._frame_start is None:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def begin_scope(self, name: str):
+        """
+        Same as `scope()` for code that can't be wrapped in a `with` block. Must be paired with `end_scope()`.
+        """
+
+        scope = self.scope(name)
+        scope.__enter__()
+        self._open_scopes.append(scope)
+
+    def end_scope(self):
+        if self._open_scopes:
+            self._open_scopes.pop().__exit__()
+
+    def profile(self, name=None):
+        def decorator(func):
+            scope_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.scope(scope_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def add_overlay_section(self, draw_fn):
+        """
+        Registers a callable that draws extra lines at the bottom of the overlay.
+        """
+
+        self.overlay_sections.append(draw_fn)
+
+    def frame_times(self) -> list:
+        """
+        Returns the buffered frame times in milliseconds, oldest first.
+        """
+
+        return [frame[1] * 1000 for frame in self.frames]
+
+    def percentiles(self, values=(50, 95, 99)) -> dict:
+        times = sorted(self.frame_times())
+        if not times:
+            return {f"p{p}": 0.0 for p in values}
+        last = len(times) - 1
+        return {f"p{p}": times[min(last, round(last * p / 100))] for p in values}
+
+    def scope_averages(self) -> dict:
+        """
+        Returns the average time per frame of each scope in milliseconds.
+        """
+
+        totals = {}
+        for _, _, scopes in self.frames:
+            for name, _, duration, _ in scopes:
+                totals[name] = totals.get(name, 0.0) + duration
+        count = len(self.frames) or 1
+        return {name: total * 1000 / count for name, total in totals.items()}
+
+    def draw_overlay(self, font=None, alpha=0.75):
+        if not self.show_overlay or not self.frames:
+            return
+
+        times = self.frame_times()
+        stats = self.percentiles()
+        display_w, _ = imgui.get_io().display_size
+        imgui.set_next_window_position(display_w - 10, 10, pivot_x=1.0)
+        imgui.set_next_window_bg_alpha(alpha)
+        imgui.begin(
+            "##profiler_overlay",
+            flags=imgui.WINDOW_NO_DECORATION
+            | imgui.WINDOW_ALWAYS_AUTO_RESIZE
+            | imgui.WINDOW_NO_SAVED_SETTINGS
+            | imgui.WINDOW_NO_FOCUS_ON_APPEARING
+            | imgui.WINDOW_NO_NAV
+            | imgui.WINDOW_NO_MOVE,
+        )
+        if font:
+            imgui.push_font(font)
+        imgui.plot_lines(
+            "##frame_times",
+            array("f", times),
+            overlay_text=f"{times[-1]:.2f} ms",
+            scale_min=0.0,
+            graph_size=(220, 50),
+        )
+        imgui.text(
+            f"p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f} ms"
+        )
+        imgui.separator()
+        for name, avg in self.scope_averages().items():
+            imgui.text(f"{name}: {avg:.3f} ms")
+        for draw_section in self.overlay_sections:
+            imgui.separator()
+            draw_section()
+        if font:
+            imgui.pop_font()
+        imgui.end()
+
+    def export_chrome_trace(self, path: str):
+        """
+        Writes the buffered frames to `path` in the Chrome trace-event format.
+        """
+
+        if not self.frames:
+            return
+
+        origin = self.frames[0][0]
+        pid = os.getpid()
+        main_tid = self._frame_tid
+        events = []
+        for index, (start, duration, scopes) in enumerate(self.frames):
+            events.append(
+                {
+                    "name": "frame",
+                    "ph": "X",
+                    "ts": (start - origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": pid,
+                    "tid": main_tid,
+                    "args": {"index": index},
+                }
+            )
+            for name, scope_start, scope_duration, tid in scopes:
+                events.append(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": (scope_start - origin) * 1e6,
+                        "dur": scope_duration * 1e6,
+                        "pid": pid,
+                        "tid": tid,
+                    }
+                )
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+PROFILER = Profiler()
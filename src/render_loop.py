@@ -0,0 +1,206 @@
+import glfw
+
+
+_INPUT_CALLBACK_SETTERS = (
+    glfw.set_key_callback,
+    glfw.set_char_callback,
+    glfw.set_mouse_button_callback,
+    glfw.set_cursor_pos_callback,
+    glfw.set_cursor_enter_callback,
+    glfw.set_scroll_callback,
+    glfw.set_window_size_callback,
+    glfw.set_framebuffer_size_callback,
+    glfw.set_window_focus_callback,
+    glfw.set_window_iconify_callback,
+    glfw.set_window_refresh_callback,
+    glfw.set_window_close_callback,
+)
+
+
+class RenderLoop:
+    """
+    Decides when the next frame should be rendered so an idle app doesn't spin a full core.
+
+    - While there's activity (input within the last `idle_delay` seconds, a `wake()` call or an activity
+
+        source returning `True`) frames are rendered at up to `active_fps`.
+
+    - Otherwise the loop sleeps in `glfw.wait_events_timeout` and renders at most `idle_fps` frames per second
+
+        (`0` means only when something happens) plus one frame whenever a deadline source's deadline is reached.
+
+    - `watch(store)` renders a frame whenever a `StateStore`'s version changes, so workers that publish state don't
+
+        need to call `wake()` themselves, and frames aren't rendered for updates that didn't change anything.
+
+    Create it **after** `GlfwRenderer` so the input callbacks get chained instead of replaced.
+
+    - Example:
+        ```
+        loop = RenderLoop(window)
+        loop.add_activity_source(lambda: progress_value > 0)
+        while not glfw.window_should_close(window):
+            if not loop.wait():
+                continue
+            impl.process_inputs()
+            ...
+        ```
+    """
+
+    def __init__(self, window, active_fps=60, idle_fps=0, idle_delay=0.5, max_idle_wait=0.25, reference_fps=None):
+        self.window = window
+        self.active_fps = active_fps
+        # Frame rate `frames_skipped` is counted against when `active_fps` is 0 (something else, like a `FramePacer`,
+        # limits the frame rate).
+        self.reference_fps = reference_fps
+        self.idle_fps = idle_fps
+        self.idle_delay = idle_delay
+        self.max_idle_wait = max_idle_wait
+        self.frames_rendered = 0
+        self.idle_time = 0.0
+        self._idle_frames = 0
+        self._activity_sources = []
+        self._deadline_sources = []
+        self._watched = {}
+        self._callbacks = []
+        self._wake_requested = True
+        self._last_event = glfw.get_time()
+        self._last_frame = 0.0
+
+        for setter in _INPUT_CALLBACK_SETTERS:
+            self._chain_callback(setter)
+
+    def _chain_callback(self, setter):
+        previous = setter(self.window, None)
+
+        def callback(*args):
+            self._last_event = glfw.get_time()
+            if previous:
+                previous(*args)
+
+        self._callbacks.append(callback)
+        setter(self.window, callback)
+
+    @property
+    def frames_skipped(self) -> int:
+        """
+        Frames that would have been rendered at `active_fps` (or `reference_fps`) while the loop was idle.
+        """
+
+        fps = self.active_fps or self.reference_fps
+        if not fps:
+            return 0
+        return max(0, int(self.idle_time * fps) - self._idle_frames)
+
+    def add_activity_source(self, source):
+        """
+        Registers a callable that returns `True` while something (an animation, a progress bar...) needs frames.
+        """
+
+        self._activity_sources.append(source)
+
+    def remove_activity_source(self, source):
+        if source in self._activity_sources:
+            self._activity_sources.remove(source)
+
+    def add_deadline_source(self, source):
+        """
+        Registers a callable that returns the `glfw.get_time()` at which the next frame is needed, or `None`.
+
+        Unlike activity sources these don't keep the loop at `active_fps`, it just wakes up in time.
+        """
+
+        self._deadline_sources.append(source)
+
+    def next_deadline(self):
+        deadlines = [d for d in (source() for source in self._deadline_sources) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def watch(self, store):
+        """
+        Renders a frame whenever `store` (a `StateStore`) publishes a new snapshot.
+        """
+
+        if store not in self._watched:
+            self._watched[store] = store.version
+            store.subscribe(glfw.post_empty_event)
+
+    def unwatch(self, store):
+        if self._watched.pop(store, None) is not None:
+            store.unsubscribe(glfw.post_empty_event)
+
+    def wake(self):
+        """
+        Requests a frame. Safe to call from any thread.
+        """
+
+        self._wake_requested = True
+        glfw.post_empty_event()
+
+    def is_active(self, now=None) -> bool:
+        if self._wake_requested:
+            return True
+        if now is None:
+            now = glfw.get_time()
+        if now - self._last_event < self.idle_delay:
+            return True
+        if any(store.version != seen for store, seen in self._watched.items()):
+            return True
+        return any(source() for source in self._activity_sources)
+
+    def wait(self, poll_events=True) -> bool:
+        """
+        Processes pending events and blocks until the next frame is due.
+
+        Returns `True` if a frame should be rendered, `False` if the loop should just check its exit conditions
+
+        and call `wait()` again.
+
+        With `poll_events=False` the caller runs `glfw.poll_events()` itself once `wait()` returns `True`, so a frame
+
+        profiler can start the frame after the blocking part.
+        """
+
+        now = glfw.get_time()
+        idle_frame = False
+        if not self.is_active(now):
+            if self.idle_fps:
+                timeout = max(0.0, self._last_frame + 1 / self.idle_fps - now)
+            else:
+                timeout = self.max_idle_wait
+            deadline = self.next_deadline()
+            if deadline is not None:
+                timeout = min(timeout, max(0.0, deadline - now))
+            glfw.wait_events_timeout(min(timeout, self.max_idle_wait))
+            waited = glfw.get_time()
+            self.idle_time += waited - now
+            now = waited
+            active = self.is_active(now)
+            if not active and (deadline is None or now < deadline):
+                if not self.idle_fps or now - self._last_frame < 1 / self.idle_fps:
+                    return False
+            idle_frame = not active
+
+        if self.active_fps and not idle_frame:
+            remaining = self._last_frame + 1 / self.active_fps - now
+            while remaining > 0:
+                glfw.wait_events_timeout(remaining)
+                now = glfw.get_time()
+                remaining = self._last_frame + 1 / self.active_fps - now
+
+        if poll_events:
+            glfw.poll_events()
+        self._wake_requested = False
+        for store in self._watched:
+            self._watched[store] = store.version
+        self._last_frame = now
+        self.frames_rendered += 1
+        self._idle_frames += idle_frame
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "frames_rendered": self.frames_rendered,
+            "frames_skipped": self.frames_skipped,
+            "idle_time": self.idle_time,
+        }
@@ -0,0 +1,158 @@
+"""
+Startup profiler. Import this module first in the entry point so its clock starts before anything heavy is imported.
+
+Profiling is enabled with the `--startup-profile` command line flag or the `STARTUP_PROFILE=1` environment variable.
+"""
+
+import builtins
+import os
+import sys
+
+from time import perf_counter, time
+
+
+def _process_age() -> float:
+    """
+    Seconds since the process was created, or `0.0` if the platform doesn't tell.
+    """
+
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            creation, exit_, kernel, user = (ctypes.c_ulonglong() for _ in range(4))
+            ctypes.windll.kernel32.GetProcessTimes(
+                ctypes.windll.kernel32.GetCurrentProcess(),
+                ctypes.byref(creation),
+                ctypes.byref(exit_),
+                ctypes.byref(kernel),
+                ctypes.byref(user),
+            )
+            # FILETIME counts 100 ns intervals since 1601-01-01.
+            return max(0.0, time() - (creation.value / 1e7 - 11644473600))
+        if os.path.exists("/proc/self/stat"):
+            with open("/proc/self/stat") as f:
+                start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+            with open("/proc/uptime") as f:
+                uptime = float(f.read().split()[0])
+            return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except Exception:
+        pass
+    return 0.0
+
+
+class _ImportNode:
+    __slots__ = ("name", "duration", "children")
+
+    def __init__(self, name):
+        self.name = name
+        self.duration = 0.0
+        self.children = []
+
+
+class StartupProfiler:
+    """
+    Records phase timings from process start to the first presented frame and, when enabled, an import-time tree.
+
+    - `mark(name)` ends the current phase. The first phase ("interpreter") covers the time before this module was imported.
+
+    - `finish()` (call it after the first `swap_buffers`) stops the import hook and returns the report, or `None` if disabled.
+    """
+
+    def __init__(self, enabled=None):
+        self.origin = perf_counter() - _process_age()
+        if enabled is None:
+            enabled = "--startup-profile" in sys.argv or os.environ.get("STARTUP_PROFILE", "") not in ("", "0")
+        self.enabled = enabled
+        self.phases = [("interpreter", perf_counter())]
+        self.finished = False
+        self.imports = _ImportNode("<root>")
+        self._stack = [self.imports]
+        self._original_import = None
+        if enabled:
+            self._install_import_hook()
+
+    def _install_import_hook(self):
+        original = self._original_import = builtins.__import__
+        stack = self._stack
+        modules = sys.modules
+
+        def timed(name, globals, locals):
+            node = _ImportNode(name)
+            stack[-1].children.append(node)
+            stack.append(node)
+            start = perf_counter()
+            try:
+                original(name, globals, locals, (), 0)
+            finally:
+                node.duration = perf_counter() - start
+                stack.pop()
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Relative imports are left alone, they're counted in their parent's time.
+            if not level:
+                if name not in modules:
+                    timed(name, globals, locals)
+                module = modules.get(name)
+                # `from package import submodule` imports the submodule without going through `__import__`.
+                for item in fromlist or ():
+                    submodule = f"{name}.{item}"
+                    if item != "*" and module is not None and not hasattr(module, item) and submodule not in modules:
+                        try:
+                            timed(submodule, globals, locals)
+                        except ImportError:
+                            pass
+            return original(name, globals, locals, fromlist, level)
+
+        builtins.__import__ = timed_import
+
+    def _remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def mark(self, name: str):
+        if not self.finished:
+            self.phases.append((name, perf_counter()))
+
+    def phase_times(self) -> list:
+        """
+        Returns `(name, ms)` for every phase, the phase name being the `mark()` that ended it.
+        """
+
+        times = []
+        previous = self.origin
+        for name, timestamp in self.phases:
+            times.append((name, (timestamp - previous) * 1000))
+            previous = timestamp
+        return times
+
+    def _import_lines(self, node, depth, threshold, max_depth, lines):
+        for child in sorted(node.children, key=lambda n: n.duration, reverse=True):
+            ms = child.duration * 1000
+            if ms < threshold:
+                break
+            lines.append(f"{'  ' * depth}{ms:8.1f} ms  {child.name}")
+            if depth + 1 < max_depth:
+                self._import_lines(child, depth + 1, threshold, max_depth, lines)
+
+    def report(self, import_threshold_ms=2.0, max_depth=3) -> str:
+        lines = ["Startup phases:"]
+        for name, ms in self.phase_times():
+            lines.append(f"{ms:10.1f} ms  {name}")
+        lines.append(f"{(self.phases[-1][1] - self.origin) * 1000:10.1f} ms  total")
+        if self.imports.children:
+            lines.append(f"Imports (>= {import_threshold_ms:g} ms, cumulative):")
+            self._import_lines(self.imports, 0, import_threshold_ms, max_depth, lines)
+        return "\n".join(lines)
+
+    def finish(self, name="first_frame") -> str | None:
+        if self.finished:
+            return None
+        self.mark(name)
+        self.finished = True
+        self._remove_import_hook()
+        return self.report() if self.enabled else None
+
+
+STARTUP = StartupProfiler()
@@ -0,0 +1,86 @@
+import threading
+
+
+class StateStore:
+    """
+    Thread-safe holder of an immutable snapshot (usually a `NamedTuple`) shared between workers and the render loop.
+
+    - Writers never modify a snapshot: `update(**changes)` / `update_with(fn)` build a new one under a lock
+
+        (copy-on-write) and publish it with a single attribute assignment.
+
+    - The render thread reads `snapshot` (or `read()` for a matching `(version, snapshot)` pair) without locking and
+
+        gets a consistent view for the whole frame.
+
+    - `version` only increases when the published snapshot differs from the previous one, so `changed_since(version)`
+
+        tells the render loop whether anything has to be rebuilt (see `RenderLoop.watch()`).
+
+    - Subscribers (`subscribe(fn)`) are called from the writer's thread after every change, outside the lock.
+
+    - Example:
+        ```
+        class AppState(NamedTuple):
+            should_exit: bool = False
+
+        APP_STATE = StateStore(AppState())
+        APP_STATE.update(should_exit=True)  # any thread
+        ...
+        if APP_STATE.snapshot.should_exit:  # render thread
+        ```
+    """
+
+    def __init__(self, initial, on_change=None):
+        self._published = (0, initial)
+        self._lock = threading.Lock()
+        self._subscribers = [on_change] if on_change else []
+
+    @property
+    def snapshot(self):
+        return self._published[1]
+
+    @property
+    def version(self) -> int:
+        return self._published[0]
+
+    def read(self) -> tuple:
+        """
+        Returns `(version, snapshot)` from the same publish.
+        """
+
+        return self._published
+
+    def changed_since(self, version: int) -> bool:
+        return self._published[0] != version
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def update_with(self, fn) -> bool:
+        """
+        Publishes `fn(snapshot)`. `fn` runs under the store's lock, so concurrent writers never lose each other's changes.
+
+        Returns `True` if the new snapshot differs from the old one.
+        """
+
+        with self._lock:
+            version, current = self._published
+            new = fn(current)
+            if new == current:
+                return False
+            self._published = (version + 1, new)
+
+        for callback in tuple(self._subscribers):
+            callback()
+        return True
+
+    def update(self, **changes) -> bool:
+        return self.update_with(lambda current: current._replace(**changes))
+
+    def set(self, snapshot) -> bool:
+        return self.update_with(lambda _: snapshot)
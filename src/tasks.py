@@ -0,0 +1,407 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import NamedTuple
+from src.state import StateStore
+
+
+# How often the manager copies a process task's progress into its `Task` (and its cancellation into the worker).
+PROCESS_POLL_INTERVAL = 0.02
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag handed to every task.
+
+    Use `token.wait(seconds)` instead of `sleep()` so a cancelled task wakes up immediately.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def wait(self, timeout=None) -> bool:
+        """
+        Sleeps for `timeout` seconds. Returns `True` if the task was cancelled in the meantime.
+        """
+
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled
+
+
+class SharedArray:
+    """
+    A numpy array in `multiprocessing.shared_memory`. Pickling one only sends the block's name, shape and dtype,
+
+    so passing it to a process task (see `TaskManager.submit(..., process=True)`) doesn't copy the data.
+
+    - The process that creates it owns the block: call `close()` (or use it as a context manager) when done, which
+
+        frees it. Copies unpickled in workers just attach to it and detach when they are garbage collected.
+
+    - Create output buffers in the app's process and pass them in rather than returning new ones from a worker.
+
+    - Example:
+        ```
+        with SharedArray.from_array(img) as src, SharedArray(img.shape, img.dtype) as dst:
+            TASKS.submit("blur", blur_image, src, dst, process=True).wait()
+            texture = upload_texture(dst.array)
+        ```
+    """
+
+    def __init__(self, shape, dtype="uint8", name=None):
+        # numpy is only needed by process tasks, it isn't imported with `TaskManager`.
+        import numpy as np
+
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._owner = name is None
+        nbytes = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=nbytes if self._owner else 0)
+        self.array = np.ndarray(self.shape, self.dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_array(cls, array):
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __reduce__(self):
+        return SharedArray, (self.shape, self.dtype.str, self.name)
+
+    def close(self):
+        if self.array is None:
+            return
+        # The view has to go before the block can be unmapped.
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, "array", None) is not None:
+            self.array = None
+            try:
+                self._shm.close()
+            except BufferError:
+                pass
+
+
+class ProcessTask:
+    """
+    What a process task's function gets instead of a `Task`.
+
+    Progress and cancellation live in a small `SharedArray` that the app's process polls, so `set_progress()` is just a
+
+    memory write. `token` returns the task itself, so functions written for threads (`task.token.wait(...)`) work as is.
+
+    There's no `set_status()`: status is set from the app's process.
+    """
+
+    def __init__(self, name: str, control: SharedArray):
+        self.name = name
+        self.control = control
+
+    @property
+    def token(self):
+        return self
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self.control.array[1])
+
+    def set_progress(self, value: float):
+        self.control.array[0] = value
+
+    def wait(self, timeout=None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.cancelled:
+            remaining = PROCESS_POLL_INTERVAL if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(PROCESS_POLL_INTERVAL, remaining))
+        return True
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelled
+
+
+def _run_process_task(fn, name, control, args, kwargs):
+    try:
+        return fn(ProcessTask(name, control), *args, **kwargs)
+    finally:
+        control.close()
+
+
+class TaskInfo(NamedTuple):
+    name: str
+    state: int
+    progress: float
+    status: str
+
+
+class TaskSnapshot(NamedTuple):
+    """
+    Immutable view of the task manager. A new one is published on every change,
+
+    so the UI can read `TaskManager.snapshot` once per frame without locking.
+    """
+
+    tasks: tuple = ()
+    progress: float = 0.0
+    status: str = ""
+    status_color: tuple | None = None
+
+    @property
+    def busy(self) -> bool:
+        return bool(self.tasks)
+
+    def is_active(self, name: str) -> bool:
+        return any(task.name == name for task in self.tasks)
+
+
+class Task:
+    PENDING = 0
+    RUNNING = 1
+    DONE = 2
+    FAILED = 3
+    CANCELLED = 4
+
+    def __init__(self, manager, name, priority, fn, args, kwargs, process=False):
+        self.manager = manager
+        self.name = name
+        self.priority = priority
+        self.process = process
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.token = CancelToken()
+        self.state = Task.PENDING
+        self.progress = 0.0
+        self.status = ""
+        self.result = None
+        self.error = None
+        self._finished = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self):
+        self.token.cancel()
+
+    def done(self) -> bool:
+        return self.state >= Task.DONE
+
+    def wait(self, timeout=None) -> bool:
+        return self._finished.wait(timeout)
+
+    def set_progress(self, value: float):
+        self.progress = value
+        self.manager._publish()
+
+    def set_status(self, msg="", color=None):
+        """
+        Sets this task's status and the manager-wide status line.
+        """
+
+        self.status = msg
+        self.manager.set_status(msg, color)
+
+
+class TaskManager:
+    """
+    Runs named tasks on a thread pool.
+
+    - `submit(name, fn, *args)` calls `fn(task, *args)` on a worker. While a task with the same name is pending or running,
+
+        submitting it again returns the existing task (or cancels it and starts over with `replace=True`).
+
+    - Pending tasks start in `priority` order (higher first), then in submission order.
+
+    - Tasks report through `task.set_progress()` / `task.set_status()` and stop early when `task.token` is cancelled.
+
+    - `submit(..., process=True)` runs `fn` in a worker process instead, for CPU-bound work that would otherwise hold
+
+        the GIL and make the render thread stutter. `fn` and its arguments are pickled, so `fn` has to be a module-level
+
+        function and large buffers should be passed as `SharedArray`s. `fn` gets a `ProcessTask`: progress and
+
+        cancellation are shared with the `Task` through shared memory. Workers are spawned on first use (up to
+
+        `process_workers`, by default one per core minus one for the render thread) and import the app's main module,
+
+        so keep its side effects under `if __name__ == "__main__":`.
+
+    - The UI reads `snapshot` (a `TaskSnapshot`) once per frame. Snapshots are published through `store`
+
+        (a `StateStore`), so `TaskManager.version` only changes when something visible did. `on_change` is called from
+
+        the writer's thread after every change; pass `store` to `RenderLoop.watch()` instead to wake an idle render loop.
+    """
+
+    def __init__(self, max_workers=3, on_change=None, on_error=None, process_workers=None):
+        self.on_change = on_change
+        self.on_error = on_error
+        self.process_workers = process_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.store = StateStore(TaskSnapshot())
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Task")
+        self._process_pool = None
+        self._lock = threading.Lock()
+        self._pending = []
+        self._active: dict[str, Task] = {}
+        self._seq = itertools.count()
+        self._status = ""
+        self._status_color = None
+
+    @property
+    def snapshot(self) -> TaskSnapshot:
+        return self.store.snapshot
+
+    @property
+    def version(self) -> int:
+        return self.store.version
+
+    def _build_snapshot(self, _previous) -> TaskSnapshot:
+        with self._lock:
+            active = tuple(self._active.values())
+            return TaskSnapshot(
+                tuple(TaskInfo(t.name, t.state, t.progress, t.status) for t in active),
+                max((t.progress for t in active), default=0.0),
+                self._status,
+                self._status_color,
+            )
+
+    def _publish(self):
+        if self.store.update_with(self._build_snapshot) and self.on_change:
+            self.on_change()
+
+    def submit(self, name: str, fn, *args, priority=0, replace=False, process=False, **kwargs) -> Task:
+        with self._lock:
+            existing = self._active.get(name)
+            if existing is not None:
+                if not replace:
+                    return existing
+                existing.cancel()
+
+            task = Task(self, name, priority, fn, args, kwargs, process)
+            heapq.heappush(self._pending, (-priority, next(self._seq), task))
+            self._active[name] = task
+
+        self._executor.submit(self._run_next)
+        self._publish()
+        return task
+
+    def _run_next(self):
+        with self._lock:
+            _, _, task = heapq.heappop(self._pending)
+
+        if not task.cancelled:
+            task.state = Task.RUNNING
+            self._publish()
+            try:
+                if task.process:
+                    task.result = self._run_in_process(task)
+                else:
+                    task.result = task.fn(task, *task.args, **task.kwargs)
+                task.state = Task.CANCELLED if task.cancelled else Task.DONE
+            except TaskCancelled:
+                task.state = Task.CANCELLED
+            except Exception as e:
+                task.error = e
+                task.state = Task.FAILED
+                if self.on_error:
+                    self.on_error(task, e)
+        else:
+            task.state = Task.CANCELLED
+
+        with self._lock:
+            if self._active.get(task.name) is task:
+                del self._active[task.name]
+        task._finished.set()
+        self._publish()
+
+    def _run_in_process(self, task: Task):
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    self.process_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            pool = self._process_pool
+
+        with SharedArray((2,), "float64") as control:
+            control.array[0] = task.progress
+            try:
+                future = pool.submit(_run_process_task, task.fn, task.name, control, task.args, task.kwargs)
+                while not future.done():
+                    wait((future,), PROCESS_POLL_INTERVAL)
+                    if task.cancelled:
+                        control.array[1] = 1.0
+                        future.cancel()
+                    progress = float(control.array[0])
+                    if progress != task.progress:
+                        task.set_progress(progress)
+                if future.cancelled():
+                    raise TaskCancelled
+                return future.result()
+            except BrokenProcessPool:
+                # A worker died (or failed to start). Start a new pool for the next process task.
+                with self._lock:
+                    if self._process_pool is pool:
+                        self._process_pool = None
+                raise
+
+    def get(self, name: str) -> Task | None:
+        return self._active.get(name)
+
+    def cancel(self, name: str):
+        task = self._active.get(name)
+        if task is not None:
+            task.cancel()
+
+    def set_status(self, msg="", color=None):
+        with self._lock:
+            self._status = msg
+            self._status_color = color
+        self._publish()
+
+    def shutdown(self, wait=True, cancel=True):
+        if cancel:
+            with self._lock:
+                tasks = list(self._active.values())
+            for task in tasks:
+                task.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=False)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,126 @@
+import imgui
+
+
+class TextMetricsCache:
+    """
+    Caches text sizes and word-wrapped layouts, keyed by font, text and wrap width.
+
+    - `size(text)` replaces `imgui.calc_text_size(text)` for labels that are drawn every frame.
+
+    - `wrap(text, width)` returns the text with line breaks where ImGui would wrap it. Drawing the result with
+
+        `imgui.text()` (without `push_text_wrap_pos`) skips ImGui's per-frame word wrapping, which is about 3x
+
+        the cost of drawing the text itself.
+
+    - Measurements use the current font, but pyimgui has no `get_font()` to put it in the key: pass the `font` object
+
+        that is pushed (`None` means the default font). The font size is part of the key too, so differently sized
+
+        fonts never share entries even when the font isn't passed.
+
+    - `bind(FONTS)` ties the cache to a `FontAtlas`: every entry is dropped when its `generation` changes, so DPI
+
+        changes and font reloads never serve stale sizes. At most `capacity` sizes and `capacity` layouts are kept,
+
+        the oldest are evicted first.
+    """
+
+    def __init__(self, capacity=4096, fonts=None):
+        self.capacity = capacity
+        self.fonts = fonts
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sizes = {}
+        self._wraps = {}
+        self._generation = None
+
+    def bind(self, fonts):
+        self.fonts = fonts
+        self.clear()
+
+    def clear(self):
+        self._sizes.clear()
+        self._wraps.clear()
+        self._generation = self.fonts.generation if self.fonts else None
+
+    def _put(self, entries: dict, key, value):
+        self.misses += 1
+        if len(entries) >= self.capacity:
+            # Dicts keep insertion order, so this drops the oldest entry. Cheaper than LRU bookkeeping on every hit.
+            del entries[next(iter(entries))]
+            self.evictions += 1
+        entries[key] = value
+        return value
+
+    def size(self, text: str, wrap_width=-1.0, font=None) -> tuple:
+        """
+        Same as `imgui.calc_text_size(text, wrap_width=wrap_width)`.
+        """
+
+        if self.fonts is not None and self.fonts.generation != self._generation:
+            self.clear()
+        key = (id(font), imgui.get_font_size(), text, wrap_width)
+        value = self._sizes.get(key)
+        if value is None:
+            return self._put(self._sizes, key, tuple(imgui.calc_text_size(text, wrap_width=wrap_width)))
+        self.hits += 1
+        return value
+
+    def wrap(self, text: str, wrap_width: float, font=None) -> str:
+        """
+        Inserts line breaks so no line is wider than `wrap_width`. Words longer than a line are cut between characters.
+        """
+
+        if self.fonts is not None and self.fonts.generation != self._generation:
+            self.clear()
+        key = (id(font), imgui.get_font_size(), text, wrap_width)
+        value = self._wraps.get(key)
+        if value is None:
+            return self._put(self._wraps, key, self._wrap(text, wrap_width))
+        self.hits += 1
+        return value
+
+    @staticmethod
+    def _wrap(text: str, wrap_width: float) -> str:
+        space = imgui.calc_text_size(" ")[0]
+        lines = []
+        for paragraph in text.split("\n"):
+            line, line_width = [], 0.0
+            for word in paragraph.split(" "):
+                word_width = imgui.calc_text_size(word)[0]
+                if word_width > wrap_width:
+                    # Like ImGui, a word wider than a whole line (a path, a URL...) starts on the current line and is
+                    # cut at whichever character reaches the wrap width.
+                    head = " ".join(line) + " " if line else ""
+                    head_width = line_width + space if line else 0.0
+                    for char in word:
+                        char_width = imgui.calc_text_size(char)[0]
+                        if head and head_width + char_width > wrap_width:
+                            lines.append(head.rstrip(" "))
+                            head, head_width = "", 0.0
+                        head += char
+                        head_width += char_width
+                    line, line_width = [head], head_width
+                elif line and line_width + space + word_width > wrap_width:
+                    lines.append(" ".join(line))
+                    line, line_width = [word], word_width
+                else:
+                    line_width += (space if line else 0.0) + word_width
+                    line.append(word)
+            lines.append(" ".join(line))
+        return "\n".join(lines)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._sizes) + len(self._wraps),
+        }
+
+
+TEXT_METRICS = TextMetricsCache()
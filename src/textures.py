@@ -0,0 +1,678 @@
+import hashlib
+import numpy as np
+import OpenGL.GL as gl
+import os
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from time import perf_counter
+
+
+_JPEG_EXTENSIONS = (".jpg", ".jpeg", ".jpe", ".jfif")
+# Start-of-frame markers, the only JPEG segments that hold the image size.
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _jpeg_size(path: str):
+    """
+    Reads `(width, height)` from a JPEG header without decoding anything. Returns `None` if it can't.
+    """
+
+    try:
+        with open(path, "rb") as f:
+            if f.read(2) != b"\xff\xd8":
+                return None
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                if marker[1] == 0xFF:
+                    f.seek(-1, os.SEEK_CUR)
+                    continue
+                if marker[1] == 0x01 or 0xD0 <= marker[1] <= 0xD8:
+                    continue
+                length = int.from_bytes(f.read(2), "big")
+                if marker[1] in _JPEG_SOF_MARKERS:
+                    data = f.read(5)
+                    return int.from_bytes(data[3:5], "big"), int.from_bytes(data[1:3], "big")
+                f.seek(length - 2, os.SEEK_CUR)
+    except OSError:
+        return None
+
+
+def _imread(path: str, max_size: int | None):
+    import cv2
+
+    if max_size and path.lower().endswith(_JPEG_EXTENSIONS):
+        size = _jpeg_size(path)
+        if size is not None:
+            # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale directly (scaled IDCT), without ever holding the full image.
+            factor = 8
+            while factor > 1 and max(size) / factor < max_size:
+                factor //= 2
+            if factor > 1:
+                flag = getattr(cv2, f"IMREAD_REDUCED_COLOR_{factor}") | cv2.IMREAD_IGNORE_ORIENTATION
+                return cv2.imread(path, flag)
+
+    return cv2.imread(path, cv2.IMREAD_UNCHANGED)
+
+
+def decode_image(path: str, max_size: int | None = None, bgra=False):
+    """
+    Reads an image from disk and returns it as a contiguous 4-channel `uint8` array or `None` on failure.
+
+    - `max_size` downscales the image so its longest side fits. JPEGs are decoded at reduced resolution,
+
+        other formats are resized after decoding.
+
+    - `bgra=True` returns OpenCV's native channel order, which `upload_texture(..., bgra=True)` uploads as-is
+
+        and saves a channel swap. Otherwise the pixels are RGBA.
+
+    Grayscale, BGR, BGRA and 16-bit images are all converted.
+    """
+
+    # OpenCV takes a while to import, only load it once an image is actually needed.
+    import cv2
+
+    img = _imread(path, max_size)
+    if img is None:
+        return None
+
+    if img.dtype != np.uint8:
+        img = (img >> 8).astype(np.uint8) if img.dtype == np.uint16 else cv2.convertScaleAbs(img)
+
+    h, w = img.shape[:2]
+    if max_size and max(w, h) > max_size:
+        scale = max_size / max(w, h)
+        img = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+    channels = 1 if img.ndim == 2 else img.shape[2]
+    if channels == 4:
+        if not bgra:
+            # Same channel count, so the swap can happen in place.
+            cv2.cvtColor(img, cv2.COLOR_BGRA2RGBA, dst=img)
+    elif channels == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA if bgra else cv2.COLOR_BGR2RGBA)
+    else:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA if bgra else cv2.COLOR_GRAY2RGBA)
+    # OpenCV only returns contiguous arrays, this doesn't copy.
+    return np.ascontiguousarray(img)
+
+
+def texture_bytes(width: int, height: int, mipmaps=False) -> int:
+    nbytes = width * height * 4
+    # A full mip chain adds a third on top of the base level.
+    return nbytes * 4 // 3 if mipmaps else nbytes
+
+
+def _set_filters(mipmaps: bool):
+    gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+    gl.glTexParameteri(
+        gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR_MIPMAP_LINEAR if mipmaps else gl.GL_LINEAR
+    )
+
+
+def upload_texture(img_data, bgra=False, mipmaps=False):
+    """
+    Uploads a 4-channel pixel array (RGBA, or BGRA with `bgra=True`) to a new OpenGL texture.
+
+    `mipmaps=True` generates the mip chain so the image doesn't alias when drawn smaller than its size.
+
+    Returns `(texture, width, height)` or `(0, 0, 0)` on failure.
+    """
+
+    h, w = img_data.shape[:2]
+    texture = gl.glGenTextures(1)
+    if texture == 0:
+        return 0, 0, 0
+
+    gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
+    _set_filters(mipmaps)
+    gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+    gl.glTexImage2D(
+        gl.GL_TEXTURE_2D,
+        0,
+        gl.GL_RGBA8,
+        w,
+        h,
+        0,
+        gl.GL_BGRA if bgra else gl.GL_RGBA,
+        gl.GL_UNSIGNED_BYTE,
+        img_data,
+    )
+    if mipmaps:
+        gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+
+    error = gl.glGetError()
+    gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+    if error != gl.GL_NO_ERROR:
+        print(f"OpenGL error: {error}")
+        gl.glDeleteTextures([texture])
+        return 0, 0, 0
+
+    return texture, w, h
+
+
+class ThumbnailCache:
+    """
+    Persists downscaled, decoded images on disk so thumbnails skip decoding on the next run.
+
+    - Entries are raw BGRA `.npy` files keyed by path, modification time, file size and `max_size`, so an edited
+
+        image is never served stale. Loading one is a plain read, several times faster than decoding a JPEG.
+
+    - When the directory grows past `budget_bytes`, the least recently used files are deleted.
+
+    - Disabled while `directory` is `None`. Safe to use from several decode threads.
+    """
+
+    def __init__(self, directory=None, budget_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self._written = 0
+
+    def _file(self, key: tuple, max_size: int) -> str:
+        digest = hashlib.sha1(repr((*key, max_size)).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.npy")
+
+    def get(self, key: tuple, max_size: int):
+        if not self.directory:
+            return None
+        file = self._file(key, max_size)
+        try:
+            img = np.load(file)
+            os.utime(file)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return img
+
+    def put(self, key: tuple, max_size: int, img):
+        if not self.directory:
+            return
+        file = self._file(key, max_size)
+        tmp = f"{file}.{os.getpid()}.{id(img)}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.save(f, img)
+            os.replace(tmp, file)
+        except OSError as e:
+            print(f"Failed to write thumbnail: {e}")
+            return
+        self._written += img.nbytes
+        if self._written > self.budget_bytes // 8:
+            self._written = 0
+            self.trim()
+
+    def trim(self):
+        try:
+            files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".npy")]
+            stats = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in files]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total <= self.budget_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        if self.directory and os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".npy"):
+                    os.remove(entry.path)
+
+
+THUMBNAILS = ThumbnailCache()
+
+
+def decode_thumbnail(path: str, max_size: int, key=None, cache: ThumbnailCache = THUMBNAILS):
+    """
+    Returns `path` as a BGRA array no larger than `max_size`, from `cache` if it was decoded before.
+    """
+
+    key = key or TextureCache.make_key(path)
+    if key is None:
+        return None
+    # Only the file identity, the texture options don't change the pixels.
+    key = key[:3]
+    img = cache.get(key, max_size)
+    if img is None:
+        img = decode_image(path, max_size, bgra=True)
+        if img is not None:
+            cache.put(key, max_size, img)
+    return img
+
+
+def load_texture(path: str, max_size: int | None = None, mipmaps=False):
+    """
+    Decodes an image and uploads it without going through the cache.
+
+    `max_size` loads a downscaled version (see `decode_image`), through `THUMBNAILS` if it's enabled.
+
+    The caller owns the returned texture and is responsible for deleting it.
+    """
+
+    try:
+        img_data = decode_thumbnail(path, max_size) if max_size else decode_image(path, bgra=True)
+        if img_data is None:
+            print("Error loading image.")
+            return 0, 0, 0
+        return upload_texture(img_data, bgra=True, mipmaps=mipmaps)
+    except Exception as e:
+        print(f"Unhandled exception: {e}")
+        return 0, 0, 0
+
+
+class _TextureEntry:
+    __slots__ = ("key", "texture", "width", "height", "nbytes", "refcount", "last_frame")
+
+    def __init__(self, key, texture, width, height, nbytes):
+        self.key = key
+        self.texture = texture
+        self.width = width
+        self.height = height
+        self.nbytes = nbytes
+        self.refcount = 0
+        self.last_frame = -1
+
+
+class TextureCache:
+    """
+    Keeps decoded textures resident on the GPU, keyed by path, modification time and file size.
+
+    - `get(path)` returns a cached `(texture, width, height)` and loads it on a miss. The texture is
+
+        guaranteed to stay alive for the current frame only.
+
+    - `max_size` / `mipmaps` select a variant of the image (see `load_texture`). Each variant is cached separately.
+
+    - `acquire(path)` / `release(path)` pin a texture so it is never evicted while referenced. Pins are tracked per key:
+
+        if the file changes while pinned, `release(path)` still unpins the texture that was acquired (oldest first).
+
+    - Call `next_frame()` once per frame (after rendering). Least-recently-used textures that are
+
+        neither pinned nor used in the current frame get deleted when `budget_bytes` is exceeded.
+
+    All methods must be called from the thread that owns the OpenGL context.
+    """
+
+    def __init__(self, budget_bytes=256 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.frame = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+        self._entries: OrderedDict[tuple, _TextureEntry] = OrderedDict()
+        self._keys_by_path: dict[tuple, tuple] = {}
+        self._pinned: dict[tuple, list] = {}
+
+    @staticmethod
+    def make_key(path: str, max_size: int | None = None, mipmaps=False):
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return path, stat.st_mtime_ns, stat.st_size, max_size, mipmaps
+
+    @staticmethod
+    def _variant(key: tuple) -> tuple:
+        # Everything but the file's modification time and size: a new key for the same variant means the file changed.
+        return key[0], *key[3:]
+
+    def lookup(self, path: str, max_size: int | None = None, mipmaps=False):
+        """
+        Returns `(key, entry)` without loading anything. `entry` is `None` on a miss and `key` is `None`
+
+        if the file can't be accessed.
+        """
+
+        key = self.make_key(path, max_size, mipmaps)
+        if key is None:
+            return None, None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            entry.last_frame = self.frame
+            return key, entry
+
+        self.misses += 1
+        stale_key = self._keys_by_path.get(self._variant(key))
+        if stale_key is not None:
+            stale = self._entries.get(stale_key)
+            if stale is not None and stale.refcount == 0:
+                self._remove(stale)
+        return key, None
+
+    def insert(self, key: tuple, texture: int, width: int, height: int, nbytes=None):
+        """
+        Registers an already uploaded texture under `key` and returns its cache entry.
+        """
+
+        entry = _TextureEntry(key, texture, width, height, nbytes or texture_bytes(width, height, key[4]))
+        entry.last_frame = self.frame
+        self._entries[key] = entry
+        self._keys_by_path[self._variant(key)] = key
+        self.resident_bytes += entry.nbytes
+        self.trim()
+        return entry
+
+    def _load(self, path: str, max_size: int | None, mipmaps: bool):
+        key, entry = self.lookup(path, max_size, mipmaps)
+        if key is None:
+            print(f"Error loading image: {path}")
+            return None
+        if entry is None:
+            texture, w, h = load_texture(key[0], max_size, mipmaps)
+            if texture == 0:
+                return None
+            entry = self.insert(key, texture, w, h)
+        return entry
+
+    def get(self, path: str, max_size: int | None = None, mipmaps=False):
+        entry = self._load(path, max_size, mipmaps)
+        if entry is None:
+            return 0, 0, 0
+        return entry.texture, entry.width, entry.height
+
+    def acquire(self, path: str, max_size: int | None = None, mipmaps=False):
+        entry = self._load(path, max_size, mipmaps)
+        if entry is None:
+            return 0, 0, 0
+        entry.refcount += 1
+        self._pinned.setdefault(self._variant(entry.key), []).append(entry.key)
+        return entry.texture, entry.width, entry.height
+
+    def release(self, path: str, max_size: int | None = None, mipmaps=False):
+        variant = (os.path.abspath(path), max_size, mipmaps)
+        pinned = self._pinned.get(variant)
+        if not pinned:
+            return
+        key = pinned.pop(0)
+        if not pinned:
+            del self._pinned[variant]
+        entry = self._entries.get(key)
+        if entry is None or entry.refcount == 0:
+            return
+        entry.refcount -= 1
+        if entry.refcount == 0 and self._keys_by_path.get(variant) != key:
+            # Outdated version of a file that changed while it was pinned, nothing can look it up anymore.
+            self._remove(entry)
+
+    def next_frame(self):
+        self.frame += 1
+        self.trim()
+
+    def trim(self):
+        if self.resident_bytes <= self.budget_bytes:
+            return
+
+        for entry in list(self._entries.values()):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if entry.refcount == 0 and entry.last_frame != self.frame:
+                self._remove(entry)
+                self.evictions += 1
+
+    def _remove(self, entry: _TextureEntry):
+        del self._entries[entry.key]
+        variant = self._variant(entry.key)
+        if self._keys_by_path.get(variant) == entry.key:
+            del self._keys_by_path[variant]
+        self.resident_bytes -= entry.nbytes
+        gl.glDeleteTextures([entry.texture])
+
+    def clear(self):
+        for entry in list(self._entries.values()):
+            self._remove(entry)
+        self._pinned.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "resident_bytes": self.resident_bytes,
+            "budget_bytes": self.budget_bytes,
+        }
+
+
+TEXTURE_CACHE = TextureCache()
+
+
+class AsyncTexture:
+    """
+    Handle returned by `AsyncImageLoader.load()`.
+
+    `texture` is a placeholder until the image is decoded and uploaded, so it can be drawn right away.
+    """
+
+    __slots__ = ("path", "key", "texture", "width", "height", "state")
+
+    PENDING = 0
+    UPLOADING = 1
+    READY = 2
+    FAILED = 3
+
+    def __init__(self, path, key, texture, width=0, height=0, state=PENDING):
+        self.path = path
+        self.key = key
+        self.texture = texture
+        self.width = width
+        self.height = height
+        self.state = state
+
+    @property
+    def ready(self) -> bool:
+        return self.state == AsyncTexture.READY
+
+    @property
+    def failed(self) -> bool:
+        return self.state == AsyncTexture.FAILED
+
+
+class _Upload:
+    __slots__ = ("handle", "img", "texture", "row")
+
+    def __init__(self, handle, img, texture):
+        self.handle = handle
+        self.img = img
+        self.texture = texture
+        self.row = 0
+
+
+class AsyncImageLoader:
+    """
+    Decodes images on a worker pool and streams them to the GPU under a per-frame budget.
+
+    - `load(path)` never blocks: it returns an `AsyncTexture` whose `texture` is a placeholder until ready.
+
+        Finished textures are stored in `cache`, so calling `load()` every frame is as cheap as `draw_image()`.
+
+    - `load(path, max_size=...)` decodes a downscaled version (cached on disk by `THUMBNAILS` if it's enabled),
+
+        `mipmaps=True` generates mipmaps once the last band is uploaded.
+
+    - `pump()` must be called once per frame on the GL thread. It uploads finished images in row bands
+
+        until `upload_budget_ms` or `upload_budget_bytes` is spent, so large images are spread over several
+
+        frames instead of stalling one. Each band is a synchronous `glTexSubImage2D`, the budget is what keeps
+
+        frames short.
+
+    - `on_decoded` is called from the worker thread when an image is ready for upload. Use it to wake up
+
+        an idle render loop.
+    """
+
+    def __init__(
+        self,
+        cache: TextureCache = TEXTURE_CACHE,
+        max_workers=2,
+        upload_budget_ms=2.0,
+        upload_budget_bytes=8 * 1024 * 1024,
+        on_decoded=None,
+    ):
+        self.cache = cache
+        self.upload_budget_ms = upload_budget_ms
+        self.upload_budget_bytes = upload_budget_bytes
+        self.on_decoded = on_decoded
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="ImageDecode")
+        self._decoded = SimpleQueue()
+        self._uploads: deque[_Upload] = deque()
+        self._in_flight: dict[tuple, AsyncTexture] = {}
+        self._failed: set[tuple] = set()
+        self._placeholder = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._in_flight)
+
+    @property
+    def placeholder(self) -> int:
+        if self._placeholder == 0:
+            self._placeholder, _, _ = upload_texture(np.full((1, 1, 4), 128, dtype=np.uint8))
+        return self._placeholder
+
+    def load(self, path: str, max_size: int | None = None, mipmaps=False) -> AsyncTexture:
+        key = self.cache.make_key(path, max_size, mipmaps)
+        if key is None:
+            return AsyncTexture(path, None, self.placeholder, state=AsyncTexture.FAILED)
+
+        handle = self._in_flight.get(key)
+        if handle is not None:
+            return handle
+
+        if key in self._failed:
+            return AsyncTexture(path, key, self.placeholder, state=AsyncTexture.FAILED)
+
+        _, entry = self.cache.lookup(path, max_size, mipmaps)
+        if entry is not None:
+            return AsyncTexture(
+                path, key, entry.texture, entry.width, entry.height, AsyncTexture.READY
+            )
+
+        handle = AsyncTexture(path, key, self.placeholder)
+        self._in_flight[key] = handle
+        self._executor.submit(self._decode, handle)
+        return handle
+
+    def _decode(self, handle: AsyncTexture):
+        path, max_size = handle.key[0], handle.key[3]
+        try:
+            img = decode_thumbnail(path, max_size, handle.key) if max_size else decode_image(path, bgra=True)
+        except Exception as e:
+            print(f"Unhandled exception: {e}")
+            img = None
+
+        self._decoded.put((handle, img))
+        if self.on_decoded:
+            self.on_decoded()
+
+    def _fail(self, handle: AsyncTexture):
+        handle.state = AsyncTexture.FAILED
+        self._failed.add(handle.key)
+        self._in_flight.pop(handle.key, None)
+
+    def _begin_upload(self, handle: AsyncTexture, img):
+        if img is None:
+            print(f"Error loading image: {handle.path}")
+            self._fail(handle)
+            return
+
+        h, w = img.shape[:2]
+        texture = gl.glGenTextures(1)
+        if texture == 0:
+            print(f"Error creating texture: {handle.path}")
+            self._fail(handle)
+            return
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
+        _set_filters(handle.key[4])
+        gl.glTexImage2D(
+            gl.GL_TEXTURE_2D, 0, gl.GL_RGBA8, w, h, 0, gl.GL_BGRA, gl.GL_UNSIGNED_BYTE, None
+        )
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        handle.width, handle.height = w, h
+        handle.state = AsyncTexture.UPLOADING
+        self._uploads.append(_Upload(handle, img, texture))
+
+    def _upload_rows(self, upload: _Upload, max_bytes: int) -> int:
+        img = upload.img
+        h, w = img.shape[:2]
+        row_bytes = w * 4
+        rows = min(h - upload.row, max(1, max_bytes // row_bytes))
+        band = img[upload.row : upload.row + rows]
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, upload.texture)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        gl.glTexSubImage2D(
+            gl.GL_TEXTURE_2D, 0, 0, upload.row, w, rows, gl.GL_BGRA, gl.GL_UNSIGNED_BYTE, band
+        )
+        upload.row += rows
+        if upload.row >= h and upload.handle.key[4]:
+            gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+
+        return rows * row_bytes
+
+    def _finish_upload(self, upload: _Upload):
+        handle = upload.handle
+        entry = self.cache.insert(handle.key, upload.texture, handle.width, handle.height)
+        handle.texture = entry.texture
+        handle.state = AsyncTexture.READY
+        self._in_flight.pop(handle.key, None)
+
+    def pump(self):
+        """
+        Uploads finished images within this frame's budget. Call once per frame on the GL thread.
+        """
+
+        deadline = perf_counter() + self.upload_budget_ms / 1000
+        bytes_left = self.upload_budget_bytes
+
+        while bytes_left > 0 and perf_counter() < deadline:
+            if not self._uploads:
+                try:
+                    handle, img = self._decoded.get_nowait()
+                except Empty:
+                    break
+                self._begin_upload(handle, img)
+                continue
+
+            upload = self._uploads[0]
+            bytes_left -= self._upload_rows(upload, bytes_left)
+            if upload.row >= upload.img.shape[0]:
+                self._uploads.popleft()
+                self._finish_upload(upload)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for upload in self._uploads:
+            gl.glDeleteTextures([upload.texture])
+        self._uploads.clear()
+        if self._placeholder:
+            gl.glDeleteTextures([self._placeholder])
+            self._placeholder = 0
+
+
+IMAGE_LOADER = AsyncImageLoader()
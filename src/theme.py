@@ -0,0 +1,259 @@
+import imgui
+import math
+
+
+_STYLE_VAR_ATTRS = {
+    imgui.STYLE_ALPHA: "alpha",
+    imgui.STYLE_WINDOW_PADDING: "window_padding",
+    imgui.STYLE_WINDOW_ROUNDING: "window_rounding",
+    imgui.STYLE_WINDOW_BORDERSIZE: "window_border_size",
+    imgui.STYLE_WINDOW_MIN_SIZE: "window_min_size",
+    imgui.STYLE_WINDOW_TITLE_ALIGN: "window_title_align",
+    imgui.STYLE_CHILD_ROUNDING: "child_rounding",
+    imgui.STYLE_CHILD_BORDERSIZE: "child_border_size",
+    imgui.STYLE_POPUP_ROUNDING: "popup_rounding",
+    imgui.STYLE_POPUP_BORDERSIZE: "popup_border_size",
+    imgui.STYLE_FRAME_PADDING: "frame_padding",
+    imgui.STYLE_FRAME_ROUNDING: "frame_rounding",
+    imgui.STYLE_FRAME_BORDERSIZE: "frame_border_size",
+    imgui.STYLE_ITEM_SPACING: "item_spacing",
+    imgui.STYLE_ITEM_INNER_SPACING: "item_inner_spacing",
+    imgui.STYLE_CELL_PADDING: "cell_padding",
+    imgui.STYLE_INDENT_SPACING: "indent_spacing",
+    imgui.STYLE_SCROLLBAR_SIZE: "scrollbar_size",
+    imgui.STYLE_SCROLLBAR_ROUNDING: "scrollbar_rounding",
+    imgui.STYLE_GRAB_MIN_SIZE: "grab_min_size",
+    imgui.STYLE_GRAB_ROUNDING: "grab_rounding",
+    imgui.STYLE_TAB_ROUNDING: "tab_rounding",
+    imgui.STYLE_BUTTON_TEXT_ALIGN: "button_text_align",
+    imgui.STYLE_SELECTABLE_TEXT_ALIGN: "selectable_text_align",
+}
+
+
+# What `ImGuiStyle::ScaleAllSizes()` scales (pyimgui doesn't expose it).
+_SIZE_ATTRS = frozenset(
+    (
+        "window_padding",
+        "window_rounding",
+        "window_min_size",
+        "child_rounding",
+        "popup_rounding",
+        "frame_padding",
+        "frame_rounding",
+        "item_spacing",
+        "item_inner_spacing",
+        "cell_padding",
+        "touch_extra_padding",
+        "indent_spacing",
+        "columns_min_spacing",
+        "scrollbar_size",
+        "scrollbar_rounding",
+        "grab_min_size",
+        "grab_rounding",
+        "log_slider_deadzone",
+        "tab_rounding",
+        "tab_min_width_for_close_button",
+        "display_window_padding",
+        "display_safe_area_padding",
+        "mouse_cursor_scale",
+    )
+)
+
+
+def _scale_size(value, scale: float):
+    # Floored like `ScaleAllSizes()` so padding and spacing stay on whole pixels.
+    if isinstance(value, tuple):
+        return tuple(math.floor(v * scale) for v in value)
+    if value >= 3.0e38:
+        # `FLT_MAX` means "never" (e.g. `tab_min_width_for_close_button`).
+        return value
+    return math.floor(value * scale)
+
+
+def _compile(colors: dict | None, style_vars: dict | None) -> dict:
+    """
+    Turns `{imgui.COLOR_*: (r, g, b[, a])}` and `{imgui.STYLE_*: value}` into a flat `{key: value}` dict
+
+    where color keys are ints and style var keys are `GuiStyle` attribute names.
+    """
+
+    compiled = {}
+    for idx, color in (colors or {}).items():
+        compiled[idx] = tuple(color) if len(color) == 4 else (*color, 1.0)
+    for var, value in (style_vars or {}).items():
+        compiled[_STYLE_VAR_ATTRS[var]] = tuple(value) if isinstance(value, (tuple, list)) else value
+    return compiled
+
+
+def _write(style, values):
+    for key, value in values:
+        if isinstance(key, int):
+            style.colors[key] = value
+        else:
+            setattr(style, key, value)
+
+
+def _read(style, key):
+    if isinstance(key, int):
+        color = style.colors[key]
+        return color.x, color.y, color.z, color.w
+    value = getattr(style, key)
+    return (value.x, value.y) if hasattr(value, "x") else value
+
+
+class Theme:
+    """
+    A set of style colors and style vars that's written to `imgui.get_style()` once instead of pushed every frame.
+
+    - Example:
+        ```
+        dark = Theme(
+            colors={imgui.COLOR_BUTTON: (0.075, 0.075, 0.075)},
+            style_vars={imgui.STYLE_FRAME_ROUNDING: 5},
+        )
+        THEME.set_theme(dark)
+        ```
+    """
+
+    def __init__(self, colors: dict = None, style_vars: dict = None, name=""):
+        self.name = name
+        self.values = _compile(colors, style_vars)
+
+
+class StyleOverride:
+    """
+    Temporary colors/style vars on top of the active theme. Create it once (e.g. at module level) and
+
+    reuse it with `THEME.scoped(override)`. The `push_style_color` / `push_style_var` arguments are built here
+
+    (and rebuilt once when the UI scale changes), so entering the scope is just the ImGui push calls and leaving it
+
+    one pop per kind.
+    """
+
+    def __init__(self, colors: dict = None, style_vars: dict = None):
+        self.colors = tuple(
+            (idx, *(tuple(color) if len(color) == 4 else (*color, 1.0))) for idx, color in (colors or {}).items()
+        )
+        self.style_vars = tuple(
+            (var, tuple(value) if isinstance(value, (tuple, list)) else value)
+            for var, value in (style_vars or {}).items()
+        )
+        self._scale = 1.0
+        self._scaled_style_vars = self.style_vars
+
+    def scaled_style_vars(self, scale: float) -> tuple:
+        if scale != self._scale:
+            self._scaled_style_vars = tuple(
+                (var, _scale_size(value, scale) if _STYLE_VAR_ATTRS[var] in _SIZE_ATTRS else value)
+                for var, value in self.style_vars
+            )
+            self._scale = scale
+        return self._scaled_style_vars
+
+
+class ThemeManager:
+    """
+    Keeps track of the active `Theme` and a stack of `StyleOverride`s.
+
+    The theme is written to the style once, overrides go through ImGui's own style stacks.
+
+    `set_scale()` scales every size in the style (padding, spacing, rounding, scrollbars...) for high DPI monitors.
+
+    Themes and overrides are declared at scale 1 and scaled when they're applied.
+    """
+
+    def __init__(self):
+        self.active: Theme | None = None
+        self.scale = 1.0
+        self._defaults = {}
+        self._effective = {}
+        self._base_sizes = None
+        self._stack = []
+
+    def _capture_sizes(self, style):
+        # ImGui's own sizes, read before any theme or scale touched them.
+        if self._base_sizes is None:
+            self._base_sizes = {attr: _read(style, attr) for attr in _SIZE_ATTRS}
+
+    def _scaled(self, values):
+        if self.scale == 1.0:
+            return values
+        return [(key, _scale_size(value, self.scale) if key in _SIZE_ATTRS else value) for key, value in values]
+
+    def set_theme(self, theme: Theme):
+        """
+        Switches to `theme` in one go. Keys the previous theme set but `theme` doesn't are reset to ImGui's defaults.
+
+        Call it between frames, not inside a `scoped()` block.
+        """
+
+        if theme is self.active:
+            return
+
+        style = imgui.get_style()
+        self._capture_sizes(style)
+        for key in theme.values:
+            if key not in self._defaults:
+                self._defaults[key] = self._base_sizes[key] if key in _SIZE_ATTRS else _read(style, key)
+
+        reset = [
+            (key, self._defaults[key])
+            for key in self._effective
+            if key not in theme.values and key in self._defaults
+        ]
+        _write(style, self._scaled(reset))
+        _write(style, self._scaled(theme.values.items()))
+        self.active = theme
+        self._effective = dict(theme.values)
+
+    def set_scale(self, scale: float):
+        """
+        Scales the style's sizes to `scale` times their unscaled (theme or ImGui default) values.
+
+        Call it between frames, not inside a `scoped()` block.
+        """
+
+        if scale == self.scale:
+            return
+
+        style = imgui.get_style()
+        self._capture_sizes(style)
+        self.scale = scale
+        _write(style, self._scaled([(attr, self._effective.get(attr, base)) for attr, base in self._base_sizes.items()]))
+
+    def push(self, override: StyleOverride):
+        for args in override.colors:
+            imgui.push_style_color(*args)
+        for args in override.style_vars if self.scale == 1.0 else override.scaled_style_vars(self.scale):
+            imgui.push_style_var(*args)
+        self._stack.append(override)
+
+    def pop(self):
+        override = self._stack.pop()
+        if override.colors:
+            imgui.pop_style_color(len(override.colors))
+        if override.style_vars:
+            imgui.pop_style_var(len(override.style_vars))
+
+    def scoped(self, override: StyleOverride):
+        return _ScopedOverride(self, override)
+
+
+class _ScopedOverride:
+    __slots__ = ("manager", "override")
+
+    def __init__(self, manager, override):
+        self.manager = manager
+        self.override = override
+
+    def __enter__(self):
+        self.manager.push(self.override)
+        return self
+
+    def __exit__(self, *_):
+        self.manager.pop()
+        return False
+
+
+THEME = ThemeManager()
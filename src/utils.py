@@ -3,17 +3,23 @@ import os
 import shutil
 import subprocess
 import sys
-import webbrowser
+import tempfile
 
 from pathlib import Path
-from src.logger import LOGGER
+from src.logger import get_logger
 
 
 WORK_PATH = os.path.join(os.getcwd(), "ExampleApp")
 PARENT_PATH = Path(__file__).parent
 ASSETS_PATH = PARENT_PATH / Path(r"assets")
 CONFIG_PATH = os.path.join(WORK_PATH, "settings.json")
-LOG = LOGGER()
+
+
+def __getattr__(name):
+    # `utils.LOG` used to be a LOGGER built at import time; it's now resolved on first use.
+    if name == "LOG":
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def res_path(path: str):
@@ -50,23 +56,36 @@ def read_cfg_item(file, item_name):
 
 
 def save_cfg(file, list):
-    open_mode = os.path.exists(file) and "w" or "x"
-    with open(file, open_mode) as f:
-        json.dump(list, f, indent=4)
-        f.close()
+    """
+    Writes the config to a temp file next to `file` then renames it over `file`
+
+    so a crash mid-write can never leave a truncated config behind.
+    """
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(file)), prefix=".tmp_", suffix=".json"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(list, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def save_cfg_item(file, item_name, value):
-    config = read_cfg(file)
-    with open(file, "w") as f:
-        config[item_name] = value
-        json.dump(config, f, indent=4)
-        f.close()
+    config = read_cfg(file) or {}
+    config[item_name] = value
+    save_cfg(file, config)
 
 
 def delete_folder(folder_path, on_fail=None, *args):
     if not os.path.exists(folder_path):
-        LOG.error(f"Folder path does not exist. {folder_path}")
+        get_logger().error(f"Folder path does not exist. {folder_path}")
         if on_fail:
             on_fail("Folder path does not exist.", [1.0, 0.0, 0.0])
         return
@@ -78,14 +97,14 @@ def delete_folder(folder_path, on_fail=None, *args):
             os.chmod(folder_path, 0o777)
             shutil.rmtree(folder_path)
         except Exception:
-            LOG.error(f"Failed to delete {folder_path}")
+            get_logger().error(f"Failed to delete {folder_path}")
             if on_fail:
                 on_fail(*args)
 
 
 def delete_file(file_path, on_fail=None, *args):
     if not os.path.exists(file_path) or not os.path.isfile(file_path):
-        LOG.error(f"Path either does not exist or is not a file: {file_path}")
+        get_logger().error(f"Path either does not exist or is not a file: {file_path}")
         if on_fail:
             on_fail("Path either does not exist or is not a file.", [1.0, 0.0, 0.0])
         return
@@ -97,7 +116,7 @@ def delete_file(file_path, on_fail=None, *args):
             os.chmod(file_path, 0o777)
             os.remove(file_path)
         except Exception:
-            LOG.error(f"Failed to delete {file_path}")
+            get_logger().error(f"Failed to delete {file_path}")
             if on_fail:
                 on_fail(*args)
 
@@ -125,6 +144,8 @@ def open_folder(path: str):
 
 
 def visit_url(url: str):
+    import webbrowser
+
     webbrowser.open_new_tab(url)
 
 
@@ -0,0 +1,412 @@
+import imgui
+import numpy as np
+
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class HeightIndex:
+    """
+    Maps row indices to y offsets and back for `count` rows.
+
+    - Fixed heights (`height`) are plain arithmetic.
+
+    - Variable heights (`heights`) are stored as a prefix sum, so finding the row at a given y offset is a binary search.
+    """
+
+    def __init__(self, count=0, height=20.0, heights=None):
+        self.height = height
+        self._prefix = None
+        if heights is not None:
+            self.set_heights(heights)
+        else:
+            self.count = count
+
+    def set_heights(self, heights):
+        self._prefix = [0.0, *accumulate(heights)]
+        self.count = len(self._prefix) - 1
+
+    def set_height(self, index: int, height: float):
+        """
+        Changes a single row's height. Converts a fixed-height index to a variable one.
+        """
+
+        if self._prefix is None:
+            self.set_heights([self.height] * self.count)
+        prefix = self._prefix
+        delta = height - (prefix[index + 1] - prefix[index])
+        if delta:
+            for i in range(index + 1, len(prefix)):
+                prefix[i] += delta
+
+    @property
+    def total(self) -> float:
+        if self._prefix is None:
+            return self.count * self.height
+        return self._prefix[-1]
+
+    def offset(self, index: int) -> float:
+        if self._prefix is None:
+            return index * self.height
+        return self._prefix[index]
+
+    def row_height(self, index: int) -> float:
+        if self._prefix is None:
+            return self.height
+        return self._prefix[index + 1] - self._prefix[index]
+
+    def row_at(self, y: float) -> int:
+        """
+        Returns the row that contains the y offset `y`, clamped to `[0, count - 1]`.
+        """
+
+        if self.count == 0:
+            return 0
+        if self._prefix is None:
+            row = int(y // self.height) if self.height > 0 else 0
+        else:
+            row = bisect_right(self._prefix, y) - 1
+        return min(max(row, 0), self.count - 1)
+
+    def visible_range(self, top: float, bottom: float) -> tuple:
+        """
+        Returns `(first, last)` (last excluded) of the rows overlapping `[top, bottom)`.
+        """
+
+        if self.count == 0 or bottom <= 0 or top >= self.total:
+            return 0, 0
+        return self.row_at(top), self.row_at(bottom) + 1
+
+
+class _Selection:
+    """
+    Selected row indices (into the source data, so they survive sorting) with click/ctrl/shift handling.
+    """
+
+    def __init__(self, multi_select=True):
+        self.multi_select = multi_select
+        self.selected = set()
+        self._anchor = None
+
+    def click(self, index, position, order):
+        io = imgui.get_io()
+        if self.multi_select and io.key_shift and self._anchor is not None:
+            first, last = sorted((self._anchor, position))
+            rows = order[first:last + 1] if order is not None else range(first, last + 1)
+            if not io.key_ctrl:
+                self.selected.clear()
+            self.selected.update(int(row) for row in rows)
+            return
+        if self.multi_select and io.key_ctrl:
+            self.selected.symmetric_difference_update((index,))
+        else:
+            self.selected.clear()
+            self.selected.add(index)
+        self._anchor = position
+
+
+class VirtualList:
+    """
+    Scrolling list that only builds the rows that are visible, so its cost depends on the height of the list
+
+    and not on `len(items)`.
+
+    - `row_height` for fixed rows or `heights` (one per item) for variable rows.
+
+    - `draw_row(index, item, selected)` replaces the default selectable row. It must not take more than the row's height.
+
+    - `on_click(index, item)` / `on_double_click(index, item)` are called when a row is clicked.
+
+    - Example:
+        ```
+        files = VirtualList(paths, on_double_click=lambda i, path: os.startfile(path))
+        ...
+        files.draw("##files", height=300)
+        ```
+    """
+
+    def __init__(
+        self,
+        items,
+        row_height=None,
+        heights=None,
+        label=str,
+        draw_row=None,
+        on_click=None,
+        on_double_click=None,
+        multi_select=True,
+    ):
+        self.label = label
+        self.draw_row = draw_row
+        self.on_click = on_click
+        self.on_double_click = on_double_click
+        self.selection = _Selection(multi_select)
+        self.visible = (0, 0)
+        self._row_height = row_height
+        self._scroll_to = None
+        self.set_items(items, heights)
+
+    @property
+    def selected(self) -> set:
+        return self.selection.selected
+
+    def set_items(self, items, heights=None):
+        self.items = items
+        self.index = HeightIndex(len(items), self._row_height or 0.0, heights)
+        self.selection.selected.clear()
+
+    def scroll_to(self, index: int):
+        self._scroll_to = index
+
+    def draw(self, str_id: str, width=0, height=0, border=True):
+        with imgui.begin_child(str_id, width, height, border):
+            index = self.index
+            if not self._row_height and index._prefix is None:
+                index.height = imgui.get_text_line_height_with_spacing()
+
+            origin = imgui.get_cursor_pos_y()
+            if self._scroll_to is not None:
+                imgui.set_scroll_y(index.offset(self._scroll_to))
+                self._scroll_to = None
+
+            top = imgui.get_scroll_y() - origin
+            first, last = index.visible_range(top, top + imgui.get_window_height())
+            self.visible = (first, last)
+
+            for i in range(first, last):
+                imgui.set_cursor_pos_y(origin + index.offset(i))
+                self._draw_row(i, index.row_height(i))
+
+            imgui.set_cursor_pos_y(origin + index.total)
+            imgui.dummy(0, 0)
+
+    def _draw_row(self, i, row_height):
+        item = self.items[i]
+        selected = i in self.selection.selected
+        if self.draw_row:
+            self.draw_row(i, item, selected)
+            return
+
+        clicked, _ = imgui.selectable(
+            f"{self.label(item)}##{i}",
+            selected,
+            imgui.SELECTABLE_ALLOW_DOUBLE_CLICK,
+            0,
+            row_height,
+        )
+        if clicked:
+            self.selection.click(i, i, None)
+            if self.on_click:
+                self.on_click(i, item)
+            if self.on_double_click and imgui.is_mouse_double_clicked(0):
+                self.on_double_click(i, item)
+
+
+class Column:
+    """
+    A `VirtualTable` column.
+
+    - `value(row)` returns what the cell shows (formatted with `format`).
+
+    - `key(row)` returns the sort key, by default the value. Keys are computed once per data set, not per sort.
+    """
+
+    def __init__(self, name, value, key=None, format=str, width=0.0, flags=0):
+        self.name = name
+        self.value = value
+        self.key = key or value
+        self.format = format
+        self.width = width
+        self.flags = flags
+
+
+class VirtualTable:
+    """
+    Sortable table that only builds the visible rows. Same row height, selection and callback options as `VirtualList`,
+
+    with `draw_cell(index, row, column_index)` instead of `draw_row`.
+
+    - Sorting uses ranks precomputed per column with numpy, so re-sorting 1M rows is a single `np.lexsort`.
+
+    - Example:
+        ```
+        table = VirtualTable(
+            [Column("Name", lambda f: f.name), Column("Size", lambda f: f.size, format=format_size)],
+            files,
+        )
+        ...
+        table.draw("##files", height=300)
+        ```
+    """
+
+    def __init__(
+        self,
+        columns,
+        rows,
+        row_height=None,
+        heights=None,
+        draw_cell=None,
+        on_click=None,
+        on_double_click=None,
+        multi_select=True,
+        flags=imgui.TABLE_BORDERS_INNER_VERTICAL | imgui.TABLE_RESIZABLE | imgui.TABLE_ROW_BACKGROUND,
+    ):
+        self.columns = columns
+        self.draw_cell = draw_cell
+        self.on_click = on_click
+        self.on_double_click = on_double_click
+        self.flags = flags | imgui.TABLE_SCROLL_Y | imgui.TABLE_SORTABLE
+        self.selection = _Selection(multi_select)
+        self.visible = (0, 0)
+        self._row_height = row_height
+        self._scroll_to = None
+        self._sort_specs = ()
+        self.set_rows(rows, heights)
+
+    @property
+    def selected(self) -> set:
+        return self.selection.selected
+
+    def set_rows(self, rows, heights=None, keep_sort=True, keep_selection=False):
+        """
+        Replaces the rows. With `keep_sort` the current sort is applied to the new rows right away, otherwise they're
+
+        shown unsorted until `sort()` is called again (cheaper while rows are still streaming in).
+
+        With `keep_selection` selected rows that are still in `rows` (the same objects) stay selected.
+        """
+
+        if keep_selection and self.selection.selected:
+            self._remap_selection(self.rows, rows)
+        else:
+            self.selection.selected.clear()
+        self.rows = rows
+        self.order = None
+        self.index = HeightIndex(len(rows), self._row_height or 0.0, heights)
+        self._heights = heights
+        self._ranks = {}
+        if keep_sort and self._sort_specs:
+            self.sort(self._sort_specs)
+
+    def _remap_selection(self, old_rows, rows):
+        selected = self.selection.selected
+        if all(i < len(rows) and rows[i] is old_rows[i] for i in selected):
+            # Rows were only appended (the usual case while streaming), the indices are still right.
+            return
+        positions = {id(row): i for i, row in enumerate(rows)}
+        self.selection.selected = {
+            positions[id(old_rows[i])] for i in selected if i < len(old_rows) and id(old_rows[i]) in positions
+        }
+        self.selection._anchor = None
+
+    @property
+    def sort_specs(self) -> tuple:
+        return self._sort_specs
+
+    def scroll_to(self, position: int):
+        self._scroll_to = position
+
+    def _rank(self, column_index):
+        """
+        Dense ranks of a column's sort keys (equal keys share a rank), computed on first use.
+        """
+
+        ranks = self._ranks.get(column_index)
+        if ranks is None:
+            key = self.columns[column_index].key
+            keys = np.asarray([key(row) for row in self.rows])
+            _, ranks = np.unique(keys, return_inverse=True)
+            ranks = ranks.astype(np.int64)
+            self._ranks[column_index] = ranks
+        return ranks
+
+    def sort(self, specs):
+        """
+        Sorts by `specs`, a sequence of `(column_index, descending)` with the primary key first.
+        """
+
+        self._sort_specs = tuple(specs)
+        if not specs:
+            self.order = None
+        else:
+            keys = [-self._rank(col) if desc else self._rank(col) for col, desc in reversed(specs)]
+            self.order = np.lexsort(keys)
+
+        if self._heights is not None:
+            heights = self._heights if self.order is None else [self._heights[i] for i in self.order]
+            self.index.set_heights(heights)
+
+    def _update_sort(self):
+        sort_specs = imgui.table_get_sort_specs()
+        if sort_specs is None or not sort_specs.specs_dirty:
+            return
+        self.sort(
+            [
+                (spec.column_index, spec.sort_direction == imgui.SORT_DIRECTION_DESCENDING)
+                for spec in sort_specs.specs
+            ]
+        )
+        sort_specs.specs_dirty = False
+
+    def draw(self, str_id: str, width=0, height=0):
+        with imgui.begin_table(str_id, len(self.columns), self.flags, width, height) as table:
+            if not table.opened:
+                return
+
+            imgui.table_setup_scroll_freeze(0, 1)
+            for column in self.columns:
+                imgui.table_setup_column(column.name, column.flags, column.width)
+            imgui.table_headers_row()
+            self._update_sort()
+
+            index = self.index
+            if not self._row_height and index._prefix is None:
+                index.height = imgui.get_frame_height()
+
+            # With the header row frozen the cursor sits right below it on screen, but the rows
+            # are laid out from the header's height in content space.
+            scroll_y = imgui.get_scroll_y()
+            header_height = imgui.get_cursor_pos_y() - scroll_y
+            if self._scroll_to is not None:
+                imgui.set_scroll_y(index.offset(self._scroll_to))
+                self._scroll_to = None
+
+            first, last = index.visible_range(scroll_y, scroll_y + imgui.get_window_height() - header_height)
+            self.visible = (first, last)
+
+            if first > 0:
+                imgui.table_next_row(0, index.offset(first))
+            for position in range(first, last):
+                self._draw_row(position, index.row_height(position))
+            if last < index.count:
+                imgui.table_next_row(0, index.total - index.offset(last))
+
+    def _draw_row(self, position, row_height):
+        order = self.order
+        i = int(order[position]) if order is not None else position
+        row = self.rows[i]
+        selected = i in self.selection.selected
+        imgui.table_next_row(0, row_height)
+
+        for column_index, column in enumerate(self.columns):
+            imgui.table_next_column()
+            if column_index == 0:
+                clicked, _ = imgui.selectable(
+                    f"##row{i}",
+                    selected,
+                    imgui.SELECTABLE_SPAN_ALL_COLUMNS | imgui.SELECTABLE_ALLOW_DOUBLE_CLICK,
+                    0,
+                    row_height,
+                )
+                if clicked:
+                    self.selection.click(i, position, order)
+                    if self.on_click:
+                        self.on_click(i, row)
+                    if self.on_double_click and imgui.is_mouse_double_clicked(0):
+                        self.on_double_click(i, row)
+                imgui.same_line(0, 0)
+
+            if self.draw_cell:
+                self.draw_cell(i, row, column_index)
+            else:
+                imgui.text(column.format(column.value(row)))
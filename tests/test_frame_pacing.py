@@ -0,0 +1,133 @@
+"""
+`FramePacer` and `RenderLoop` timing against a fake GLFW clock: waits advance the clock instead of sleeping.
+"""
+
+import glfw
+import pytest
+
+from src import frame_pacing, render_loop
+from src.frame_pacing import FramePacer
+from src.render_loop import RenderLoop
+
+
+class FakeClock:
+    def __init__(self, tick=0.0001):
+        self.now = 0.0
+        # Every read moves the clock a little, so busy-waits end.
+        self.tick = tick
+        self.swap_intervals = []
+
+    def get_time(self):
+        self.now += self.tick
+        return self.now
+
+    def wait_events_timeout(self, timeout):
+        self.now += timeout
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(glfw, "get_time", clock.get_time)
+    monkeypatch.setattr(glfw, "wait_events_timeout", clock.wait_events_timeout)
+    monkeypatch.setattr(glfw, "poll_events", lambda: None)
+    monkeypatch.setattr(glfw, "post_empty_event", lambda: None)
+    monkeypatch.setattr(glfw, "swap_interval", clock.swap_intervals.append)
+    monkeypatch.setattr(glfw, "extension_supported", lambda name: False)
+    monkeypatch.setattr(frame_pacing, "refresh_rate", lambda window=None: 60.0)
+    # There's no window to chain input callbacks to.
+    monkeypatch.setattr(render_loop, "_INPUT_CALLBACK_SETTERS", ())
+    return clock
+
+
+def run_frames(clock, pacer, frames, work):
+    """
+    Runs `frames` frames of `work` seconds. Returns the frame start times and the input-to-swap times.
+    """
+
+    starts, latencies = [], []
+    for _ in range(frames):
+        pacer.begin_frame()
+        starts.append(clock.now)
+        clock.advance(work)
+        pacer.before_swap()
+        latencies.append(clock.now - starts[-1])
+    return starts, latencies
+
+
+def test_swap_interval_per_mode(clock, monkeypatch):
+    pacer = FramePacer(None, FramePacer.VSYNC)
+    assert pacer.swap_interval == 1
+    pacer.set_mode(FramePacer.FIXED, 100)
+    assert pacer.swap_interval == 0
+    pacer.set_mode(FramePacer.ADAPTIVE)
+    assert pacer.swap_interval == 1
+
+    monkeypatch.setattr(glfw, "extension_supported", lambda name: True)
+    assert FramePacer(None, FramePacer.ADAPTIVE).swap_interval == -1
+    with pytest.raises(ValueError):
+        pacer.set_mode("unknown")
+
+
+def test_target_fps(clock):
+    pacer = FramePacer(None, FramePacer.FIXED, fps=144)
+    assert pacer.target_fps == 144
+    pacer.set_mode(FramePacer.VSYNC)
+    assert pacer.target_fps == 60.0
+
+
+def test_fixed_mode_waits_before_input(clock):
+    pacer = FramePacer(None, FramePacer.FIXED, fps=100)
+    starts, latencies = run_frames(clock, pacer, 50, work=0.003)
+
+    periods = [b - a for a, b in zip(starts[1:], starts[2:])]
+    assert sum(periods) / len(periods) == pytest.approx(0.010, abs=0.0002)
+    # The wait happens before the frame reads input, so only the frame's own work is between input and swap.
+    assert max(latencies) == pytest.approx(0.003, abs=0.0005)
+
+
+def test_fixed_mode_does_not_catch_up_after_a_long_frame(clock):
+    pacer = FramePacer(None, FramePacer.FIXED, fps=100)
+    run_frames(clock, pacer, 5, work=0.003)
+    clock.advance(0.5)
+    starts, _ = run_frames(clock, pacer, 5, work=0.003)
+
+    periods = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(periods) == pytest.approx(0.010, abs=0.0005)
+
+
+def test_adaptive_fallback_switches_swap_interval(clock):
+    pacer = FramePacer(None, FramePacer.ADAPTIVE)
+    period = 1 / 60
+
+    run_frames(clock, pacer, 2, work=period * 0.95)
+    assert pacer.swap_interval == 1
+    run_frames(clock, pacer, 1, work=period * 0.95)
+    assert pacer.swap_interval == 0
+
+    run_frames(clock, pacer, 29, work=period * 0.5)
+    assert pacer.swap_interval == 0
+    run_frames(clock, pacer, 1, work=period * 0.5)
+    assert pacer.swap_interval == 1
+
+
+def test_frames_skipped_uses_reference_fps(clock):
+    loop = RenderLoop(None, active_fps=0, idle_fps=0, idle_delay=0.5, max_idle_wait=0.25)
+    assert loop.wait()
+    assert loop.frames_skipped == 0
+
+    clock.advance(1.0)
+    for _ in range(8):
+        assert not loop.wait()
+    # Nothing to count against without a frame rate.
+    assert loop.frames_skipped == 0
+
+    loop.reference_fps = 60
+    assert loop.frames_skipped == int(loop.idle_time * 60)
+    assert loop.idle_time == pytest.approx(2.0, abs=0.01)
+
+    loop.active_fps = 30
+    assert loop.frames_skipped == int(loop.idle_time * 30)
@@ -0,0 +1,82 @@
+"""
+Headless checks that `VirtualList` keeps its row offsets, ImGui's scroll range and its draw cost consistent with a large
+
+number of rows.
+"""
+
+import imgui
+import pytest
+
+from benchmarks.headless import HeadlessContext
+from src.draw_stats import DrawBudget, DrawStatsCollector
+from src.virtual_list import VirtualList
+
+ROWS = 100_000
+HEIGHT = 300
+
+
+class ScrollProbe:
+    """
+    Row drawer that records the child window's scroll state, since it runs inside `VirtualList.draw()`'s child.
+    """
+
+    def __init__(self):
+        self.scroll_y = self.scroll_max_y = self.window_height = 0.0
+
+    def __call__(self, index, item, selected):
+        self.scroll_y = imgui.get_scroll_y()
+        self.scroll_max_y = imgui.get_scroll_max_y()
+        self.window_height = imgui.get_window_height()
+        imgui.text(str(item))
+
+
+def draw_frames(ctx, virtual_list, frames=3):
+    for _ in range(frames):
+        with ctx.frame():
+            virtual_list.draw("##list", height=HEIGHT)
+
+
+@pytest.mark.parametrize("heights", [None, [18.0 + (i % 3) * 6 for i in range(ROWS)]], ids=["fixed", "variable"])
+def test_scroll_range_matches_row_offsets(heights):
+    probe = ScrollProbe()
+    virtual_list = VirtualList(range(ROWS), heights=heights, draw_row=probe)
+    with HeadlessContext() as ctx:
+        draw_frames(ctx, virtual_list)
+        index = virtual_list.index
+        padding = imgui.get_style().window_padding.y
+        # The content ends right after the last row, so the last row can be scrolled to the bottom of the view.
+        assert probe.scroll_max_y == pytest.approx(index.total + 2 * padding - probe.window_height, abs=1.0)
+
+        for row in (ROWS // 2, ROWS - HEIGHT // 30):
+            virtual_list.scroll_to(row)
+            draw_frames(ctx, virtual_list)
+            assert probe.scroll_y == pytest.approx(min(index.offset(row), probe.scroll_max_y), abs=1.0)
+            first, last = virtual_list.visible
+            assert first <= row < last
+
+        virtual_list.scroll_to(ROWS - 1)
+        draw_frames(ctx, virtual_list)
+        assert probe.scroll_y == probe.scroll_max_y
+        assert virtual_list.visible[1] == ROWS
+
+
+def test_draw_cost_does_not_grow_with_rows():
+    def scrolled_list(rows):
+        # Same label on every row, so only the number of drawn rows can change the vertex counts.
+        virtual_list = VirtualList(range(rows), label=lambda item: "row")
+        virtual_list.scroll_to(rows // 2)
+        return virtual_list
+
+    with HeadlessContext() as ctx:
+        draw_frames(ctx, scrolled_list(1_000))
+        reference = DrawStatsCollector().collect(ctx.draw_data)
+
+        collector = DrawStatsCollector(strict=True)
+        collector.set_budget(
+            DrawBudget(commands=reference.commands, vertices=reference.vertices, indices=reference.indices)
+        )
+        large = scrolled_list(ROWS)
+        for _ in range(3):
+            with ctx.frame():
+                large.draw("##list", height=HEIGHT)
+            collector.collect(ctx.draw_data)